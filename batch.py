@@ -0,0 +1,231 @@
+import concurrent.futures
+import csv
+import dataclasses
+import inspect
+import json
+import os
+import sys
+import time
+import typing
+
+import numpy as np
+
+from solvers.cache import SolveCache
+from solvers.monadic.expression import Expression
+from solvers.monadic.interval import Interval
+from solvers.registry import registry
+
+RESULT_FIELDS = ("id", "solver", "expression", "result", "has_converged", "iterations", "cached", "elapsed", "error")
+
+# open result caches of this process, by path
+_caches: typing.Dict[str, SolveCache] = {}
+
+
+@dataclasses.dataclass
+class Job:
+    id: str
+    solver: str
+    expression: str
+    kwargs: typing.Dict[str, typing.Any] = dataclasses.field(default_factory=dict)
+    options: typing.Dict[str, typing.Any] = dataclasses.field(default_factory=dict)
+
+
+@dataclasses.dataclass
+class BatchSummary:
+    total: int = 0
+    completed: int = 0
+    converged: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+
+    def __str__(self):
+        return (f"{self.completed}/{self.total} jobs done, {self.converged} converged, "
+                f"{self.completed - self.converged - self.failed} not converged, {self.failed} failed "
+                f"in {self.elapsed:.2f}s")
+
+
+def _parse_csv_value(value: str) -> typing.Any:
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return value
+
+
+def _job_from_record(record: typing.Dict[str, typing.Any], default_id: str) -> Job:
+    record = dict(record)
+    try:
+        solver, expression = record.pop("solver"), record.pop("expression")
+    except KeyError as e:
+        raise ValueError(f"Job {default_id} is missing the {e.args[0]!r} field.") from None
+    job_id = str(record.pop("id", None) or default_id)
+    kwargs = record.pop("kwargs", None) or {}
+    options = record.pop("options", None) or {}
+    # any remaining fields are treated as solve keyword arguments
+    kwargs.update(record)
+    return Job(job_id, solver, expression, kwargs, options)
+
+
+def read_jobs(path: str) -> typing.Iterator[Job]:
+    """
+    Read jobs from a JSON Lines file (one object per line) or a CSV file with a header row.
+    Every job needs ``solver`` and ``expression``; ``id``, ``kwargs`` (an object of solve
+    keyword arguments) and ``options`` (constructor keyword arguments) are optional, and
+    any other field is passed to ``solve`` as a keyword argument.
+    """
+    with open(path, newline="") as file:
+        if os.path.splitext(path)[1].lower() == ".csv":
+            for line_number, row in enumerate(csv.DictReader(file), start=2):
+                record = {key: _parse_csv_value(value) for key, value in row.items() if value not in (None, "")}
+                yield _job_from_record(record, str(line_number))
+        else:
+            for line_number, line in enumerate(file, start=1):
+                if line.strip():
+                    yield _job_from_record(json.loads(line), str(line_number))
+
+
+def _build_solve_kwargs(solver: typing.Any, job: Job, expression: Expression) -> typing.Dict[str, typing.Any]:
+    kwargs = dict(job.kwargs)
+    interval = kwargs.get("interval")
+    if isinstance(interval, (list, tuple)):
+        kwargs["interval"] = Interval(*interval)
+    elif isinstance(interval, dict):
+        kwargs["interval"] = Interval(**interval)
+    if "derivative" in inspect.signature(solver.solve).parameters:
+        kwargs["derivative"] = expression.derivative()
+    return kwargs
+
+
+def _cache_at(path: str) -> SolveCache:
+    if path not in _caches:
+        _caches[path] = SolveCache(path)
+    return _caches[path]
+
+
+def run_job(job: Job, cache_path: str | None = None) -> typing.Dict[str, typing.Any]:
+    """
+    Solve a single job and return its result record; errors are reported, not raised.
+    With ``cache_path``, results are looked up in and added to the ``SolveCache`` at that path.
+    """
+    record = dict(id=job.id, solver=job.solver, expression=job.expression, result=None, has_converged=False,
+                  iterations=0, cached=False, elapsed=0.0, error=None)
+    start = time.perf_counter()
+    try:
+        registry.load_plugins()
+        registration = registry.get(job.solver)
+        if registration.category != "monadic":
+            raise ValueError(f"{registration.name} does not solve monadic equations.")
+        expression = Expression(job.expression)
+        solver = registration.solver_class()(expression, **job.options)
+        kwargs = _build_solve_kwargs(solver, job, expression)
+        if cache_path is None:
+            solver.solve(**kwargs)
+        else:
+            cache = _cache_at(cache_path)
+            hits = cache.hits
+            cache.solve(solver, **kwargs)
+            record["cached"] = cache.hits > hits
+        record.update(result=solver.trace.final_result, has_converged=solver.trace.has_converged,
+                      iterations=len(solver.trace.steps))
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["elapsed"] = time.perf_counter() - start
+    return record
+
+
+def _group_vectorized_jobs(
+        jobs: typing.List[Job],
+        scalar_jobs: typing.List[Job]
+) -> typing.Dict[str, typing.Tuple[typing.Callable, typing.List[Job]]]:
+    groups = {}
+    for job in jobs:
+        try:
+            kind, implementation = registry.get(job.solver).fastest_implementation()
+        except ValueError:
+            kind = "scalar"
+        if kind == "vectorized":
+            groups.setdefault(job.solver, (implementation, []))[1].append(job)
+        else:
+            scalar_jobs.append(job)
+    return groups
+
+
+def _output_value(value: typing.Any) -> typing.Any:
+    # solvers may return arrays (e.g. all roots of a polynomial) and complex numbers
+    if isinstance(value, np.ndarray):
+        return [_output_value(item) for item in value.tolist()]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, complex):
+        return value.real if value.imag == 0 else str(value)
+    return value
+
+
+class _ResultWriter:
+    def __init__(self, file: typing.TextIO, is_csv: bool):
+        self.file = file
+        self.csv_writer = csv.DictWriter(file, fieldnames=RESULT_FIELDS) if is_csv else None
+        if self.csv_writer is not None:
+            self.csv_writer.writeheader()
+
+    def write(self, record: typing.Dict[str, typing.Any]):
+        record = {field: _output_value(value) for field, value in record.items()}
+        if self.csv_writer is not None:
+            self.csv_writer.writerow(record)
+        else:
+            self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
+
+
+def run_batch(
+        jobs: typing.Iterable[Job],
+        output_path: str,
+        workers: int = 1,
+        progress: typing.TextIO | None = sys.stderr,
+        cache_path: str | None = None
+) -> BatchSummary:
+    """
+    Run all jobs and stream one result record per job to ``output_path`` (CSV if the
+    path ends in ``.csv``, JSON Lines otherwise) in completion order. Jobs whose solver
+    registers a vectorized implementation are solved together in one call per solver; the
+    remaining jobs run one by one, in a process pool when ``workers > 1``, and reuse earlier
+    results from the ``SolveCache`` at ``cache_path`` if one is given.
+    """
+    registry.load_plugins()
+    jobs = list(jobs)
+    summary = BatchSummary(total=len(jobs))
+    start = time.perf_counter()
+
+    def report(record: typing.Dict[str, typing.Any]):
+        summary.completed += 1
+        summary.failed += record["error"] is not None
+        summary.converged += bool(record["has_converged"])
+        summary.elapsed = time.perf_counter() - start
+        writer.write(record)
+        if progress is not None:
+            print(f"\r{summary}", end="", file=progress, flush=True)
+
+    with open(output_path, "w", newline="") as output:
+        writer = _ResultWriter(output, os.path.splitext(output_path)[1].lower() == ".csv")
+        scalar_jobs = []
+        for implementation, group in _group_vectorized_jobs(jobs, scalar_jobs).values():
+            try:
+                records = implementation(group)
+            except Exception:
+                scalar_jobs.extend(group)
+                continue
+            for record in records:
+                report(record)
+
+        if workers <= 1:
+            for job in scalar_jobs:
+                report(run_job(job, cache_path))
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(run_job, job, cache_path) for job in scalar_jobs]
+                for future in concurrent.futures.as_completed(futures):
+                    report(future.result())
+
+    summary.elapsed = time.perf_counter() - start
+    if progress is not None:
+        print(f"\r{summary}", file=progress, flush=True)
+    return summary
@@ -0,0 +1,4 @@
+"""
+Performance benchmarks. Record a run with ``python -m benchmarks.run -o results.json`` and
+compare two runs with ``python -m benchmarks.compare baseline.json results.json``.
+"""
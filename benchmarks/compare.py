@@ -0,0 +1,90 @@
+import argparse
+import dataclasses
+import json
+import sys
+import typing
+
+DEFAULT_THRESHOLD = 0.1
+
+
+@dataclasses.dataclass
+class Comparison:
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+    def __str__(self):
+        return (f"{self.name}: {self.baseline * 1e3:.4f} ms -> {self.current * 1e3:.4f} ms "
+                f"({(self.ratio - 1) * 100:+.1f}%)")
+
+
+@dataclasses.dataclass
+class ComparisonReport:
+    regressions: typing.List[Comparison] = dataclasses.field(default_factory=list)
+    improvements: typing.List[Comparison] = dataclasses.field(default_factory=list)
+    unchanged: typing.List[Comparison] = dataclasses.field(default_factory=list)
+    # benchmarks present in only one run, or that failed in either
+    missing: typing.List[str] = dataclasses.field(default_factory=list)
+
+    def __str__(self):
+        lines = []
+        for title, comparisons in (("Regressions", self.regressions), ("Improvements", self.improvements)):
+            if comparisons:
+                lines.append(f"{title}:")
+                lines.extend(f"  {comparison}" for comparison in comparisons)
+        if self.missing:
+            lines.append("Not compared: " + ", ".join(self.missing))
+        lines.append(f"{len(self.regressions)} regressed, {len(self.improvements)} improved, "
+                     f"{len(self.unchanged)} unchanged.")
+        return "\n".join(lines)
+
+
+def compare(baseline: typing.Dict[str, typing.Any], current: typing.Dict[str, typing.Any],
+            threshold: float = DEFAULT_THRESHOLD) -> ComparisonReport:
+    """
+    Compare the median timings of two benchmark runs. A benchmark regressed when it became
+    slower by more than ``threshold`` (relative), and improved when it became faster by as much.
+    """
+    if threshold < 0:
+        raise ValueError(f"Threshold must be non-negative, got {threshold}.")
+    report = ComparisonReport()
+    before, after = baseline["benchmarks"], current["benchmarks"]
+    for name in sorted(before.keys() | after.keys()):
+        if "median" not in before.get(name, {}) or "median" not in after.get(name, {}):
+            report.missing.append(name)
+            continue
+        comparison = Comparison(name, before[name]["median"], after[name]["median"])
+        if comparison.ratio > 1 + threshold:
+            report.regressions.append(comparison)
+        elif comparison.ratio < 1 / (1 + threshold):
+            report.improvements.append(comparison)
+        else:
+            report.unchanged.append(comparison)
+    report.regressions.sort(key=lambda comparison: comparison.ratio, reverse=True)
+    report.improvements.sort(key=lambda comparison: comparison.ratio)
+    return report
+
+
+def main(arguments: typing.Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark runs and flag regressions.")
+    parser.add_argument("baseline", help="Results of the reference run.")
+    parser.add_argument("current", help="Results of the run to check.")
+    parser.add_argument("-t", "--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Relative slowdown tolerated before flagging a regression (default: {DEFAULT_THRESHOLD}).")
+    arguments = parser.parse_args(arguments)
+
+    with open(arguments.baseline) as file:
+        baseline = json.load(file)
+    with open(arguments.current) as file:
+        current = json.load(file)
+    report = compare(baseline, current, arguments.threshold)
+    print(report)
+    return 1 if report.regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,108 @@
+import argparse
+import datetime
+import fnmatch
+import json
+import platform
+import statistics
+import sys
+import time
+import typing
+
+import numpy as np
+
+from benchmarks.workloads import Benchmark, all_benchmarks
+
+DEFAULT_REPEAT = 5
+# the number of calls per repeat is raised until one repeat takes at least this long
+MIN_REPEAT_SECONDS = 0.2
+
+
+def _calibrate(function: typing.Callable[[], typing.Any]) -> int:
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        if time.perf_counter() - start >= MIN_REPEAT_SECONDS:
+            return number
+        number *= 2
+
+
+def time_benchmark(benchmark: Benchmark, repeat: int = DEFAULT_REPEAT) -> typing.Dict[str, typing.Any]:
+    """Time one benchmark; the statistics are seconds per call."""
+    function = benchmark.setup()
+    number = _calibrate(function)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((time.perf_counter() - start) / number)
+    return {
+        "group": benchmark.group,
+        "params": benchmark.params,
+        "repeat": repeat,
+        "number": number,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "stdev": statistics.stdev(timings) if repeat > 1 else 0.0,
+    }
+
+
+def select(benchmarks: typing.Iterable[Benchmark], patterns: typing.Sequence[str] = (),
+           include_slow: bool = False) -> typing.List[Benchmark]:
+    return [benchmark for benchmark in benchmarks
+            if (include_slow or not benchmark.slow)
+            and (not patterns or any(fnmatch.fnmatch(benchmark.name, pattern) for pattern in patterns))]
+
+
+def run_benchmarks(benchmarks: typing.Iterable[Benchmark], repeat: int = DEFAULT_REPEAT,
+                   progress: typing.TextIO | None = sys.stderr) -> typing.Dict[str, typing.Any]:
+    results = {}
+    for benchmark in benchmarks:
+        try:
+            results[benchmark.name] = time_benchmark(benchmark, repeat)
+        except Exception as e:
+            # a broken workload must not cost the measurements of all the others
+            results[benchmark.name] = {"group": benchmark.group, "params": benchmark.params,
+                                       "error": f"{type(e).__name__}: {e}"}
+        if progress is not None:
+            result = results[benchmark.name]
+            outcome = result["error"] if "error" in result else f"{result['median'] * 1e3:.4f} ms"
+            print(f"{benchmark.name}: {outcome}", file=progress, flush=True)
+    return {
+        "metadata": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        },
+        "benchmarks": results,
+    }
+
+
+def main(arguments: typing.Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the solver benchmarks.")
+    parser.add_argument("-o", "--output", required=True, help="JSON file to store the results in.")
+    parser.add_argument("-k", "--filter", action="append", default=[],
+                        help="Only run benchmarks whose name matches this glob pattern (repeatable).")
+    parser.add_argument("-r", "--repeat", type=int, default=DEFAULT_REPEAT,
+                        help=f"Number of timed repeats per benchmark (default: {DEFAULT_REPEAT}).")
+    parser.add_argument("--slow", action="store_true", help="Also run slow benchmarks such as large systems.")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Do not print progress.")
+    arguments = parser.parse_args(arguments)
+    if arguments.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    benchmarks = select(all_benchmarks(), arguments.filter, arguments.slow)
+    if not benchmarks:
+        parser.error("no benchmark matches the given filters")
+    results = run_benchmarks(benchmarks, arguments.repeat, None if arguments.quiet else sys.stderr)
+    with open(arguments.output, "w") as file:
+        json.dump(results, file, indent=2)
+    return 1 if any("error" in result for result in results["benchmarks"].values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
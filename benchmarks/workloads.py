@@ -0,0 +1,178 @@
+"""
+Benchmark workloads. Each ``Benchmark`` has a ``setup`` that prepares its inputs and returns
+the zero-argument callable to be timed, so that setup cost is never measured.
+"""
+
+import dataclasses
+import math
+import os
+import typing
+
+import numpy as np
+
+from solvers.linear_system.gauss import GaussSolver
+from solvers.monadic.basins import BasinMapper
+from solvers.monadic.aitken import AitkenSolver
+from solvers.monadic.bisection import BisectionSolver
+from solvers.monadic.interval import Interval
+from solvers.monadic.monadic_equation_solver import UnaryFunction
+from solvers.monadic.newton import NewtonSolver
+from solvers.monadic.newton_downhill import NewtonDownhillSolver
+from solvers.solution_trace import SolutionTrace
+
+EXPENSIVE_TERMS = 200
+GAUSS_SIZES = (10, 50, 100, 200, 500, 1000, 2000)
+SLOW_GAUSS_SIZE = 1000
+# tiled elimination is timed at every thread count up to the number of cores
+TILED_GAUSS_SIZES = (500, 2000)
+THREAD_COUNTS = (1, 2, 4, 8, 16, 32, 64)
+# basins of z^3 - 1 on square complex grids of these sizes
+BASIN_SIZES = (256, 4096)
+SLOW_BASIN_SIZE = 4096
+
+
+@dataclasses.dataclass
+class Benchmark:
+    name: str
+    group: str
+    setup: typing.Callable[[], typing.Callable[[], typing.Any]]
+    params: typing.Dict[str, typing.Any] = dataclasses.field(default_factory=dict)
+    # slow benchmarks only run when explicitly requested
+    slow: bool = False
+
+
+class _DiscardedSteps(list):
+    """Step list that drops everything, to time solvers without the cost of keeping a trace."""
+
+    def append(self, step):
+        pass
+
+
+def _expensive(function: UnaryFunction) -> UnaryFunction:
+    # same roots as function, but each evaluation costs a few hundred floating point operations
+    def expensive_function(x: float) -> float:
+        return function(x) + 0.0 * sum(math.sin(k * x) for k in range(EXPENSIVE_TERMS))
+
+    return expensive_function
+
+
+# (solver name, difficulty, function, solve kwargs, solver factory)
+_MONADIC_PROBLEMS = (
+    ("newton", "easy", lambda x: x * x - 2, dict(guess=1.0, tolerance=1e-12), NewtonSolver),
+    # flat near the starting point, so Newton overshoots for many iterations before settling
+    ("newton", "hard", lambda x: x ** 20 - 1, dict(guess=0.5, tolerance=1e-12, max_iterations=512), NewtonSolver),
+    ("bisection", "easy", lambda x: x ** 3 - x - 2, dict(interval=Interval(1.0, 2.0), tolerance=1e-6),
+     BisectionSolver),
+    ("bisection", "hard", lambda x: x ** 3 - x - 2, dict(interval=Interval(-1e6, 1e6), tolerance=1e-14),
+     BisectionSolver),
+    ("aitken", "easy", lambda x: math.cos(x) - x, dict(guess=1.0, tolerance=1e-12), AitkenSolver),
+    ("aitken", "hard", lambda x: math.exp(-x) - x, dict(guess=10.0, tolerance=1e-14, max_iterations=64),
+     AitkenSolver),
+    ("newton_downhill", "easy", lambda x: x ** 3 - x - 1, dict(guess=1.5, tolerance=1e-12),
+     NewtonDownhillSolver),
+    ("newton_downhill", "hard", lambda x: x ** 3 - x - 1, dict(guess=0.6, tolerance=1e-12),
+     NewtonDownhillSolver),
+)
+
+
+def _monadic_benchmark(solver_factory, function, kwargs) -> typing.Callable[[], typing.Callable[[], typing.Any]]:
+    def setup():
+        solver = solver_factory(function)
+        return lambda: solver.solve(**kwargs)
+
+    return setup
+
+
+def _gauss_benchmark(size: int) -> typing.Callable[[], typing.Callable[[], typing.Any]]:
+    def setup():
+        generator = np.random.default_rng(size)
+        coefficients = generator.standard_normal((size, size)) + size * np.eye(size)
+        bias = generator.standard_normal(size)
+        solver = GaussSolver()
+        # snapshots of large systems would not fit in memory; their copies are still timed
+        solver.trace = SolutionTrace(steps=_DiscardedSteps())
+        return lambda: solver.solve(coefficients, bias)
+
+    return setup
+
+
+def _tiled_gauss_benchmark(size: int, workers: int) -> typing.Callable[[], typing.Callable[[], typing.Any]]:
+    def setup():
+        generator = np.random.default_rng(size)
+        coefficients = generator.standard_normal((size, size)) + size * np.eye(size)
+        bias = generator.standard_normal(size)
+        solver = GaussSolver(workers=workers)
+        return lambda: solver.solve(coefficients, bias, record_snapshots=False)
+
+    return setup
+
+
+def _basin_benchmark(method: str, size: int) -> typing.Callable[[], typing.Callable[[], typing.Any]]:
+    def setup():
+        mapper = BasinMapper(lambda z: z * z * z - 1, lambda z: 3 * z * z, method=method)
+        return lambda: mapper.map_grid((-2, 2), (-2, 2), (size, size))
+
+    return setup
+
+
+def _visualizer_benchmark(solver_factory, function, kwargs) -> typing.Callable[[], typing.Callable[[], typing.Any]]:
+    def setup():
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        from matplotlib.animation import AbstractMovieWriter
+        from visualizers.monadic.monadic_equation_visualizer import MonadicEquationVisualizer
+
+        class RenderingWriter(AbstractMovieWriter):
+            # renders every frame like a real writer would, then throws the pixels away
+            def setup(self, fig, outfile, dpi=None):
+                self.fig = fig
+
+            def grab_frame(self, **savefig_kwargs):
+                self.fig.canvas.draw()
+
+            def finish(self):
+                pass
+
+        solver = solver_factory(function)
+        solver.solve(**kwargs)
+        visualizer = MonadicEquationVisualizer(solver)
+
+        def run():
+            animation = visualizer.create_animation(figure_size=(8, 4.5))
+            animation.save("frames", writer=RenderingWriter())
+            plt.close("all")
+
+        return run
+
+    return setup
+
+
+def all_benchmarks() -> typing.List[Benchmark]:
+    benchmarks = []
+    for solver_name, difficulty, function, kwargs, factory in _MONADIC_PROBLEMS:
+        for cost, wrapped in (("cheap", function), ("expensive", _expensive(function))):
+            benchmarks.append(Benchmark(
+                f"monadic.{solver_name}.{difficulty}.{cost}", "monadic",
+                _monadic_benchmark(factory, wrapped, kwargs),
+                dict(solver=solver_name, difficulty=difficulty, cost=cost),
+            ))
+    for method in BasinMapper.METHODS:
+        for size in BASIN_SIZES:
+            benchmarks.append(Benchmark(f"monadic.basins.{method}.n{size}", "monadic", _basin_benchmark(method, size),
+                                        dict(solver=method, n=size), slow=size >= SLOW_BASIN_SIZE))
+    for size in GAUSS_SIZES:
+        benchmarks.append(Benchmark(f"linear_system.gauss.n{size}", "linear_system", _gauss_benchmark(size),
+                                    dict(n=size), slow=size >= SLOW_GAUSS_SIZE))
+    for size in TILED_GAUSS_SIZES:
+        for workers in THREAD_COUNTS:
+            if workers <= (os.cpu_count() or 1):
+                benchmarks.append(Benchmark(f"linear_system.gauss_tiled.n{size}.t{workers}", "linear_system",
+                                            _tiled_gauss_benchmark(size, workers), dict(n=size, threads=workers),
+                                            slow=size >= SLOW_GAUSS_SIZE))
+    for solver_name, difficulty, function, kwargs, factory in _MONADIC_PROBLEMS:
+        if difficulty == "easy":
+            benchmarks.append(Benchmark(f"visualizer.{solver_name}", "visualizer",
+                                        _visualizer_benchmark(factory, function, kwargs),
+                                        dict(solver=solver_name)))
+    return benchmarks
@@ -1,28 +1,66 @@
-import math
-import numpy as np
+import ast
+import inspect
+import typing
 
-from solvers.monadic import *
-from visualizers.monadic.monadic_equation_visualizer import MonadicEquationVisualizer
+from solvers.monadic.expression import Expression, ExpressionError
+from solvers.monadic.interval import Interval
+from solvers.registry import registry
+
+
+def _evaluate_argument(node: ast.expr) -> typing.Any:
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "Interval":
+        args, kwargs = _evaluate_call_arguments(node)
+        return Interval(*args, **kwargs)
+    if isinstance(node, ast.Constant) and isinstance(node.value, (bool, str)) or isinstance(node, (ast.Tuple, ast.List)):
+        return ast.literal_eval(node)
+    expression = Expression(ast.unparse(node))
+    if not expression.is_constant:
+        raise ExpressionError(f"Parameter {ast.unparse(node)!r} must not depend on x.")
+    return expression.scalar(0.0)
+
+
+def _evaluate_call_arguments(call: ast.Call) -> typing.Tuple[list, dict]:
+    if any(isinstance(argument, ast.Starred) for argument in call.args) or any(
+            keyword.arg is None for keyword in call.keywords):
+        raise ExpressionError("Argument unpacking is not supported.")
+    args = [_evaluate_argument(argument) for argument in call.args]
+    kwargs = {keyword.arg: _evaluate_argument(keyword.value) for keyword in call.keywords}
+    return args, kwargs
+
+
+def parse_arguments(text: str) -> typing.Tuple[list, dict]:
+    """
+    Parse a comma-separated argument list such as ``guess=1, tolerance=1e-12`` or
+    ``Interval(1, 2), 1e-8`` without executing it. Values may be literals, constant
+    formulas (``pi / 2``) or ``Interval(...)`` constructions.
+    """
+    try:
+        call = ast.parse(f"_({text})", mode="eval").body
+    except SyntaxError as e:
+        raise ExpressionError(f"Invalid parameters {text!r}: {e.msg}") from None
+    return _evaluate_call_arguments(call)
 
 
 class Cli:
     def __init__(self):
-        pass
+        registry.load_plugins()
 
     def run_monadic(self):
         print("-" * 80)
         print("Select a solver (Ctrl + C to exit):")
-        print("- BisectionSolver")
-        print("- NewtonSolver")
-        print("- NewtonDownhillSolver")
-        solver = eval(input())()
+        for name in registry.names("monadic"):
+            print(f"- {name}")
+        registration = registry.get(input().strip())
+        if registration.category != "monadic":
+            raise ValueError(f"{registration.name} does not solve monadic equations.")
         print("-" * 60)
-        solver.function = eval("lambda x: " +
-                               input("Input the function (math and np imported): "
-                                     "f(x) = lambda x: "))
+        expression = Expression(input("Input the function (math and np functions allowed): f(x) = "))
+        solver = registration.solver_class()(expression)
         print("-" * 60)
-        parameters = input("Input the parameters: ")
-        exec("solver.solve(" + parameters + ")")
+        args, kwargs = parse_arguments(input("Input the parameters: "))
+        if "derivative" in inspect.signature(solver.solve).parameters:
+            kwargs.setdefault("derivative", expression.derivative())
+        solver.solve(*args, **kwargs)
         print("-" * 60)
         print("Solution trace:")
         for step in solver.trace.steps:
@@ -30,9 +68,14 @@ class Cli:
         print("Final result:", solver.trace.final_result)
         print("Has converged:", solver.trace.has_converged)
         print("-" * 80)
+        if registration.visualizer is None:
+            print(f"No visualizer for {registration.name}.")
+            return
+        # deferred so that the solver prompt does not wait for matplotlib to load
+        from visualizers.monadic.monadic_equation_visualizer import MonadicEquationVisualizer
         visualizer = MonadicEquationVisualizer(solver)
-        parameters = input("Parameters for visualizer (optional):")
+        args, kwargs = parse_arguments(input("Parameters for visualizer (optional):"))
         print("-" * 60)
         print("Starting animation...")
-        exec("visualizer.animate(" + parameters + ")")
+        visualizer.animate(*args, **kwargs)
         print("Animation complete.")
@@ -1,7 +1,11 @@
-from cli import Cli
+import argparse
+import os
+import sys
 
 
-def main():
+def interactive():
+    from cli import Cli
+
     cli = Cli()
     while True:
         try:
@@ -14,5 +18,31 @@ def main():
             print(e.with_traceback(None))
 
 
+def batch(arguments: argparse.Namespace) -> int:
+    # imported here so that batch runs never pull in matplotlib or the visualizers
+    from batch import read_jobs, run_batch
+
+    summary = run_batch(read_jobs(arguments.jobs), arguments.output, workers=arguments.workers,
+                        progress=None if arguments.quiet else sys.stderr, cache_path=arguments.cache)
+    return 1 if summary.failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Numerical analysis solvers.")
+    subparsers = parser.add_subparsers(dest="command")
+    batch_parser = subparsers.add_parser("batch", help="Solve all jobs of a JSON Lines or CSV job file.")
+    batch_parser.add_argument("jobs", help="Job file (.jsonl or .csv).")
+    batch_parser.add_argument("-o", "--output", required=True, help="Result file (.jsonl or .csv).")
+    batch_parser.add_argument("-w", "--workers", type=int, default=1,
+                              help=f"Number of worker processes (default: 1, this machine has {os.cpu_count()}).")
+    batch_parser.add_argument("-c", "--cache", help="SQLite file caching results across runs.")
+    batch_parser.add_argument("-q", "--quiet", action="store_true", help="Do not print progress.")
+    arguments = parser.parse_args()
+
+    if arguments.command == "batch":
+        sys.exit(batch(arguments))
+    interactive()
+
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,92 @@
+"""
+Limits on a single solve: a wall-clock time limit and/or a number of function evaluations.
+
+A solver given a ``Budget`` starts a ``BudgetMeter`` when the solve begins. Monadic solvers
+route every evaluation of their function through the meter, which raises ``BudgetExhausted``
+from inside the evaluation that would break the budget, however deep in an iteration (e.g.
+the damping loop of ``NewtonDownhillSolver``) it happens. The solver then finishes with the
+best point evaluated so far, the one of smallest |f|, and sets ``trace.budget_exhausted``.
+Linear system solvers evaluate no function and check only the clock, once per elimination step
+or panel.
+
+The meter costs a counter increment and a read of the monotonic clock per evaluation, nothing
+when no budget is given.
+"""
+
+import dataclasses
+import math
+import time
+import typing
+
+
+class BudgetExhausted(Exception):
+    """The time or the evaluations of a budget ran out."""
+
+
+@dataclasses.dataclass(frozen=True)
+class Budget:
+    # wall-clock seconds from the start of the solve
+    seconds: float | None = None
+    # evaluations of the function
+    evaluations: int | None = None
+
+    def __post_init__(self):
+        if self.seconds is not None and not self.seconds > 0:
+            raise ValueError(f"seconds must be positive, got {self.seconds}.")
+        if self.evaluations is not None and self.evaluations < 1:
+            raise ValueError(f"evaluations must be positive, got {self.evaluations}.")
+
+    def start(self) -> "BudgetMeter":
+        return BudgetMeter(self)
+
+
+class BudgetMeter:
+    """The running account of one solve against its budget."""
+
+    def __init__(self, budget: Budget):
+        self.budget = budget
+        self.deadline = math.inf if budget.seconds is None else time.monotonic() + budget.seconds
+        self.max_evaluations = math.inf if budget.evaluations is None else budget.evaluations
+        self.evaluations = 0
+        # the point of smallest |f| evaluated so far
+        self.best_x: typing.Any = None
+        self.best_magnitude = math.inf
+
+    def check(self):
+        if time.monotonic() >= self.deadline:
+            raise BudgetExhausted(f"The time limit of {self.budget.seconds} s passed.")
+
+    def spend(self):
+        """Account for one evaluation about to happen."""
+        if self.evaluations >= self.max_evaluations:
+            raise BudgetExhausted(f"The budget of {self.budget.evaluations} evaluations is spent.")
+        self.check()
+        self.evaluations += 1
+
+    def observe(self, x: typing.Any, value: typing.Any):
+        """Remember ``x`` if ``|value|`` is the smallest seen; array values have no single best point."""
+        try:
+            if abs(value) < self.best_magnitude:
+                self.best_x, self.best_magnitude = x, abs(value)
+        except (TypeError, ValueError):
+            pass
+
+    def wrap(self, function: typing.Callable) -> typing.Callable:
+        """``function`` counted against the budget, remembering the best point it saw."""
+
+        def metered(x, *args):
+            self.spend()
+            value = function(x, *args)
+            self.observe(x, value)
+            return value
+
+        return metered
+
+
+def start_clock(budget: Budget | None) -> BudgetMeter | None:
+    """The meter of a solve that evaluates no function, to which only the time limit of ``budget`` applies."""
+    if budget is None:
+        return None
+    if budget.evaluations is not None:
+        raise ValueError("This solver evaluates no function; only the seconds of a budget apply to it.")
+    return budget.start()
@@ -0,0 +1,241 @@
+"""
+Persistent cache of solve results keyed by a fingerprint of the problem.
+
+The fingerprint covers the solver class and its configuration (``cache_key()``), the
+objective function (the normalized formula of an ``Expression``, or the code, captured
+values and global values of a plain Python function) and the solve keyword arguments.
+Entries live in a SQLite file, are evicted least recently used first once the store
+exceeds ``max_bytes``, and are discarded when the solver's ``VERSION`` no longer matches
+the version that produced them.
+"""
+
+import builtins
+import hashlib
+import math
+import pickle
+import sqlite3
+import time
+import types
+import typing
+import zlib
+
+from solvers.monadic.expression import Expression
+from solvers.monadic.interval import Interval
+from solvers.monadic.monadic_equation_solver import MonadicEquationSolverNotConvergedException
+from solvers.monadic.polynomial import Polynomial
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS solutions (
+    fingerprint TEXT PRIMARY KEY,
+    solver TEXT NOT NULL,
+    version TEXT NOT NULL,
+    final_result BLOB NOT NULL,
+    has_converged INTEGER NOT NULL,
+    steps BLOB,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS solutions_last_access ON solutions (last_access);
+"""
+
+# bytes charged per entry on top of its blobs, so that tiny entries cannot grow the file unbounded
+_ENTRY_OVERHEAD = 128
+_MAX_IDENTITY_DEPTH = 8
+
+
+class UnstableFingerprintException(Exception):
+    """Raised when a problem cannot be fingerprinted reproducibly across processes."""
+
+
+def _identity(value: typing.Any, depth: int = 0) -> str:
+    if depth > _MAX_IDENTITY_DEPTH:
+        raise UnstableFingerprintException("Function closure is nested too deeply to fingerprint.")
+    if value is None or isinstance(value, (bool, int, str, bytes)):
+        return repr(value)
+    if isinstance(value, float):
+        return value.hex() if math.isfinite(value) else repr(value)
+    if isinstance(value, complex):
+        return f"complex({_identity(value.real)}, {_identity(value.imag)})"
+    if isinstance(value, Expression):
+        return f"Expression[{value.variable}]({value})"
+    if isinstance(value, Polynomial):
+        return f"Polynomial({_identity(value.coefficients.tolist(), depth + 1)})"
+    if isinstance(value, Interval):
+        return (f"Interval({_identity(value.left)}, {_identity(value.right)}, "
+                f"{value.include_left}, {value.include_right})")
+    if isinstance(value, frozenset):
+        return f"frozenset({', '.join(sorted(_identity(item, depth + 1) for item in value))})"
+    if isinstance(value, (tuple, list)):
+        return f"{type(value).__name__}({', '.join(_identity(item, depth + 1) for item in value)})"
+    if isinstance(value, dict):
+        items = sorted((_identity(key, depth + 1), _identity(item, depth + 1)) for key, item in value.items())
+        return "dict(" + ", ".join(f"{key}: {item}" for key, item in items) + ")"
+    if isinstance(value, types.BuiltinFunctionType):
+        return f"builtin:{value.__module__}.{value.__qualname__}"
+    if isinstance(value, types.FunctionType):
+        closure = tuple(cell.cell_contents for cell in value.__closure__ or ())
+        return (f"function:{value.__module__}.{value.__qualname__}"
+                f"({_code_identity(value.__code__, depth + 1)}, "
+                f"defaults={_identity(value.__defaults__, depth + 1)}, closure={_identity(closure, depth + 1)}, "
+                f"globals={_globals_identity(value, depth + 1)})")
+    if isinstance(value, types.CodeType):
+        return _code_identity(value, depth + 1)
+    raise UnstableFingerprintException(f"Cannot fingerprint a value of type {type(value).__name__}.")
+
+
+def _code_identity(code: types.CodeType, depth: int) -> str:
+    constants = _identity(code.co_consts, depth + 1)
+    return hashlib.sha256(code.co_code + repr((code.co_names, constants)).encode()).hexdigest()
+
+
+def _global_names(code: types.CodeType) -> typing.Set[str]:
+    names = set(code.co_names)
+    for constant in code.co_consts:
+        if isinstance(constant, types.CodeType):
+            names |= _global_names(constant)
+    return names
+
+
+def _globals_identity(function: types.FunctionType, depth: int) -> str:
+    """
+    The values of the globals ``function`` reads, so that rebinding one changes the fingerprint.
+    Modules and builtins are left out, as are names that are only attributes, and a reference
+    of the function to itself.
+    """
+    values = {}
+    for name in sorted(_global_names(function.__code__)):
+        if name not in function.__globals__:
+            continue
+        value = function.__globals__[name]
+        if isinstance(value, types.ModuleType) or value is getattr(builtins, name, None):
+            continue
+        values[name] = "<self>" if value is function else _identity(value, depth + 1)
+    return _identity(values, depth)
+
+
+def fingerprint(solver: typing.Any, kwargs: typing.Dict[str, typing.Any]) -> str:
+    """
+    Return a stable hex digest identifying ``solver.solve(**kwargs)``, including the solver's
+    configuration from ``cache_key()``. A ``budget`` is left out: a solve that finishes within
+    it has the same outcome as one without.
+    """
+    solver_class = type(solver)
+    description = "\n".join((
+        f"{solver_class.__module__}.{solver_class.__qualname__}",
+        _identity(solver.function),
+        _identity(solver.cache_key()),
+        _identity({name: value for name, value in kwargs.items() if name != "budget"}),
+    ))
+    return hashlib.sha256(description.encode()).hexdigest()
+
+
+class SolveCache:
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.executescript(_SCHEMA)
+
+    def __enter__(self) -> "SolveCache":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def total_bytes(self) -> int:
+        return self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM solutions").fetchone()[0]
+
+    def clear(self):
+        with self.connection:
+            self.connection.execute("DELETE FROM solutions")
+
+    def lookup(self, solver: typing.Any, **kwargs) -> bool:
+        """
+        Restore ``solver.trace`` from the cache if this problem was solved before by the same
+        solver version. Returns whether the lookup hit; steps are restored only if they were stored.
+        """
+        key = fingerprint(solver, kwargs)
+        row = self.connection.execute(
+            "SELECT version, final_result, has_converged, steps FROM solutions WHERE fingerprint = ?", (key,)
+        ).fetchone()
+        if row is not None and row[0] != str(solver.VERSION):
+            with self.connection:
+                self.connection.execute("DELETE FROM solutions WHERE fingerprint = ?", (key,))
+            row = None
+        if row is None:
+            self.misses += 1
+            return False
+
+        version, final_result, has_converged, steps = row
+        with self.connection:
+            self.connection.execute("UPDATE solutions SET last_access = ? WHERE fingerprint = ?",
+                                    (time.time(), key))
+        solver.trace.clear()
+        if steps is not None:
+            solver.trace.steps.extend(pickle.loads(zlib.decompress(steps)))
+        solver.trace.final_result = pickle.loads(final_result)
+        solver.trace.has_converged = bool(has_converged)
+        self.hits += 1
+        return True
+
+    def store(self, solver: typing.Any, include_steps: bool = False, **kwargs):
+        """
+        Record the outcome currently held in ``solver.trace`` for ``solver.solve(**kwargs)``.
+        The outcome of a solve stopped by its budget depends on timing and is not recorded.
+        """
+        if solver.trace.budget_exhausted:
+            return
+        key = fingerprint(solver, kwargs)
+        final_result = pickle.dumps(solver.trace.final_result)
+        steps = zlib.compress(pickle.dumps(list(solver.trace.steps))) if include_steps else None
+        size = _ENTRY_OVERHEAD + len(final_result) + (len(steps) if steps is not None else 0)
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, type(solver).__qualname__, str(solver.VERSION), final_result,
+                 int(solver.trace.has_converged), steps, size, time.time())
+            )
+            self._evict()
+
+    def _evict(self):
+        excess = self.total_bytes() - self.max_bytes
+        if excess <= 0:
+            return
+        evicted = []
+        for key, size in self.connection.execute("SELECT fingerprint, size FROM solutions ORDER BY last_access, rowid"):
+            evicted.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self.connection.executemany("DELETE FROM solutions WHERE fingerprint = ?", evicted)
+
+    def solve(self, solver: typing.Any, include_steps: bool = False, **kwargs) -> typing.Any:
+        """
+        ``solver.solve(**kwargs)`` backed by the cache. Problems that cannot be fingerprinted
+        reproducibly (e.g. closures over arbitrary objects) are solved without caching.
+        """
+        try:
+            is_hit = self.lookup(solver, **kwargs)
+        except UnstableFingerprintException:
+            return solver.solve(**kwargs)
+        if is_hit:
+            if not solver.trace.has_converged and kwargs.get("raise_exception_if_no_convergence"):
+                raise MonadicEquationSolverNotConvergedException(solver)
+            return solver.trace.final_result
+        try:
+            result = solver.solve(**kwargs)
+        except MonadicEquationSolverNotConvergedException:
+            self.store(solver, include_steps, **kwargs)
+            raise
+        self.store(solver, include_steps, **kwargs)
+        return result
@@ -1,6 +1,11 @@
+import concurrent.futures
 import numpy as np
+import numpy.typing
 import dataclasses
+import typing
 
+from solvers.budget import Budget, BudgetExhausted, BudgetMeter, start_clock
+from solvers.linear_system.lu import estimate_condition, forward_substitution
 from solvers.solution_trace import Step, SolutionTrace
 
 
@@ -14,11 +19,72 @@ class GaussStep(Step):
 
 
 class GaussSolver:
-    def __init__(self):
+    # entries this close to zero are treated as zero, as np.isclose(value, 0) would
+    ZERO_TOLERANCE = 1e-8
+    DEFAULT_TILE_SIZE = 64
+
+    def __init__(self, workers: int | None = None, tile_size: int = DEFAULT_TILE_SIZE):
+        """
+        By default the elimination runs one row at a time. Given a number of ``workers``, a
+        square system is eliminated in tiles instead: every panel of ``tile_size`` columns is
+        eliminated on its own, and the updates of the tiles to its right, which NumPy computes
+        without holding the GIL, are shared out to that many threads. Each tile is updated by
+        the same operations whatever the number of workers, so for a given ``tile_size`` the
+        result, ``permutation`` and ``determinant`` are bit for bit the same for any number of
+        workers. They are not bit for bit those of the default elimination, which sums the
+        updates in another order and skips rows whose entry is within ``ZERO_TOLERANCE`` of
+        zero: the two agree to rounding error, and pick different pivots only where two
+        candidates are that close.
+        """
+        if workers is not None and workers < 1:
+            raise ValueError(f"workers must be positive, got {workers}.")
+        if tile_size < 1:
+            raise ValueError(f"tile_size must be positive, got {tile_size}.")
+        self.workers = workers
+        self.tile_size = tile_size
         self.trace = SolutionTrace()
+        # the row order chosen by pivoting in the last solve
+        self.permutation: np.ndarray | None = None
+        # determinant of the coefficients of the last solve, a by-product of the elimination
+        self.determinant: float | None = None
+        # the eliminated matrix of the last square solve, unless it overwrote the caller's buffers
+        # (L below the diagonal, U on and above it),
+        # the rows of it in elimination order (None when they were swapped physically) and ||A||_1
+        self._factors: typing.Tuple[np.ndarray, np.ndarray | None, float] | None = None
+
+    def solve(
+            self,
+            coefficients: np.ndarray,
+            bias: np.ndarray,
+            dtype: np.typing.DTypeLike = float,
+            overwrite: bool = False,
+            out: np.ndarray | None = None,
+            record_snapshots: bool | None = None,
+            budget: Budget | None = None
+    ) -> np.ndarray:
+        """
+        ``dtype`` is the precision of the elimination; ``np.float32`` halves the memory traffic.
+
+        With ``overwrite=True`` the elimination runs directly in ``coefficients`` and ``bias``,
+        which must then be writable arrays of ``dtype`` and hold the eliminated system afterwards,
+        row ``permutation[i]`` being row ``i`` of it: ``U`` on and above the diagonal and the
+        multipliers of ``L`` below it, so that ``coefficients[permutation] = L U`` before the
+        solve. The buffers stay the caller's, so ``condition_estimate()`` is not available after
+        such a solve. The result is written to ``out`` when given, an array of shape
+        ``(columns, right-hand sides)`` and ``dtype``. Rows are never moved, only ``permutation``
+        is, and without ``record_snapshots`` no steps are recorded, so a solve allocates O(n)
+        memory on top of the buffers. Snapshots are recorded by default, except
+        for memory-mapped coefficients, whose copies would not fit in memory; systems that large
+        belong to ``OutOfCoreSolver``.
 
-    def solve(self, coefficients: np.ndarray, bias: np.ndarray) -> np.ndarray:
+        The time limit of ``budget`` is checked once per pivot column (per tile panel when tiled).
+        A partly eliminated system has no usable result, so running out of time sets
+        ``trace.budget_exhausted`` and raises ``BudgetExhausted``.
+        """
         self.trace.clear()
+        self.determinant = None
+        self._factors = None
+        meter = start_clock(budget)
 
         if coefficients.ndim != 2:
             raise ValueError("coefficients must be a 2D matrix.")
@@ -33,60 +99,255 @@ class GaussSolver:
         if bias.shape[0] != row_number:
             raise ValueError("Number of rows of coefficients and bias must match.")
 
-        augmented_matrix = np.hstack((coefficients, bias)).astype(float)
+        if not np.issubdtype(dtype, np.inexact):
+            raise ValueError(f"dtype must be a floating point type, got {np.dtype(dtype)}.")
+        dtype = np.dtype(dtype)
+        if record_snapshots is None:
+            record_snapshots = not isinstance(coefficients, np.memmap)
+        rhs_count = bias.shape[1]
+
+        if self.workers is not None and (overwrite or row_number != column_number):
+            raise ValueError("Tiled elimination needs a square system and cannot overwrite its input.")
+
+        if overwrite:
+            for name, buffer in (("coefficients", coefficients), ("bias", bias)):
+                if buffer.dtype != dtype or not buffer.flags.writeable:
+                    raise ValueError(f"To be overwritten, {name} must be a writable {dtype} array, "
+                                     f"got a{'' if buffer.flags.writeable else ' read-only'} {buffer.dtype} array.")
+            matrix, rhs = coefficients, bias
+        else:
+            matrix, rhs = np.array(coefficients, dtype=dtype), np.array(bias, dtype=dtype)
+
+        if out is None:
+            result = np.empty((column_number, rhs_count), dtype=dtype)
+        elif out.shape != (column_number, rhs_count) or out.dtype != dtype:
+            raise ValueError(f"out must be a {dtype} array of shape {(column_number, rhs_count)}, "
+                             f"got a {out.dtype} array of shape {out.shape}.")
+        else:
+            result = out
+
+        # row i of the eliminated system is row rows[i] of the buffers
+        rows = np.arange(row_number)
+        scratch = np.empty(column_number + rhs_count, dtype=dtype)
+        # ||A||_1 for condition_estimate
+        norm = _one_norm(coefficients) if row_number == column_number and not overwrite else None
+
+        try:
+            if self.workers is None:
+                determinant = self._eliminate_rows(matrix, rhs, rows, scratch, record_snapshots, meter)
+                self.permutation = rows
+            else:
+                determinant, self.permutation = self._eliminate_tiles(matrix, rhs, record_snapshots, meter)
+        except BudgetExhausted:
+            self.trace.budget_exhausted = True
+            raise
+
+        # Back Substitution: compute result of shape (column_number, rhs_count)
+        sum_ax = scratch[column_number:]
+        for i in range(column_number - 1, -1, -1):
+            row = rows[i]
+            if i + 1 < column_number:
+                np.dot(matrix[row, i + 1:column_number], result[i + 1:column_number, :], out=sum_ax)
+            else:
+                sum_ax.fill(0)
+
+            np.subtract(rhs[row], sum_ax, out=result[i, :])
+            result[i, :] /= matrix[row, i]
+
+        if row_number == column_number:
+            self.determinant = determinant
+            if not overwrite:
+                self._factors = (matrix, rows if self.workers is None else None, norm)
+        self.trace.final_result = result
+        self.trace.has_converged = True
+        return result
 
+    def _eliminate_rows(
+            self,
+            matrix: np.ndarray,
+            rhs: np.ndarray,
+            rows: np.ndarray,
+            scratch: np.ndarray,
+            record_snapshots: bool,
+            meter: BudgetMeter | None = None
+    ) -> float | complex:
+        """Eliminate one row at a time, swapping entries of ``rows`` instead of rows; returns the determinant."""
+        column_number = matrix.shape[1]
         step_count = 0
-        self.trace.steps.append(GaussStep(
-            iteration=step_count,
-            matrix_snapshot=np.copy(augmented_matrix),
-            description="Initial Augmented Matrix"
-        ))
+        # a Python number, which overflows to inf quietly
+        determinant = 1.0
+        if record_snapshots:
+            self.trace.steps.append(GaussStep(
+                iteration=step_count,
+                matrix_snapshot=self._snapshot(matrix, rhs, rows, 0),
+                description="Initial Augmented Matrix"
+            ))
 
         for i in range(column_number):
-            pivot_row = i + np.argmax(np.abs(augmented_matrix[i:, i]))
+            if meter is not None:
+                meter.check()
+            pivot_row = i + np.argmax(np.abs(matrix[rows[i:], i]))
 
-            if np.isclose(augmented_matrix[pivot_row, i], 0):
+            if abs(matrix[rows[pivot_row], i]) <= self.ZERO_TOLERANCE:
                 raise ValueError("Matrix is singular (det=0), cannot solve.")
 
             if pivot_row != i:
-                augmented_matrix[[i, pivot_row]] = augmented_matrix[[pivot_row, i]]
+                rows[i], rows[pivot_row] = rows[pivot_row], rows[i]
+                determinant = -determinant
                 step_count += 1
-                self.trace.steps.append(GaussStep(
-                    iteration=step_count,
-                    matrix_snapshot=np.copy(augmented_matrix),
-                    description=f"Pivoting: Swapped Row {i} and Row {pivot_row}"
-                ))
+                if record_snapshots:
+                    self.trace.steps.append(GaussStep(
+                        iteration=step_count,
+                        matrix_snapshot=self._snapshot(matrix, rhs, rows, i),
+                        description=f"Pivoting: Swapped Row {i} and Row {pivot_row}"
+                    ))
 
-            current_pivot_val = augmented_matrix[i, i]
+            pivot_matrix_row, pivot_rhs_row = matrix[rows[i]], rhs[rows[i]]
+            current_pivot_val = pivot_matrix_row[i]
+            determinant *= current_pivot_val.item()
             changed = False
 
             for j in range(i + 1, column_number):
-                if not np.isclose(augmented_matrix[j, i], 0):
-                    factor = augmented_matrix[j, i] / current_pivot_val
-                    augmented_matrix[j] = augmented_matrix[j] - factor * augmented_matrix[i]
+                target_matrix_row, target_rhs_row = matrix[rows[j]], rhs[rows[j]]
+                factor = 0
+                if abs(target_matrix_row[i]) > self.ZERO_TOLERANCE:
+                    factor = target_matrix_row[i] / current_pivot_val
+                    # row j -= factor * row i, through the scratch row instead of temporaries; the
+                    # columns left of i hold the multipliers of earlier pivots and are not touched
+                    np.multiply(pivot_matrix_row[i:], factor, out=scratch[i:column_number])
+                    np.multiply(pivot_rhs_row, factor, out=scratch[column_number:])
+                    target_matrix_row[i:] -= scratch[i:column_number]
+                    target_rhs_row -= scratch[column_number:]
                     changed = True
+                # the multiplier of L takes the place of the eliminated entry
+                target_matrix_row[i] = factor
 
             if changed:
                 step_count += 1
-                self.trace.steps.append(GaussStep(
-                    iteration=step_count,
-                    matrix_snapshot=np.copy(augmented_matrix),
-                    description=f"Elimination: Cleared column {i} below pivot"
-                ))
+                if record_snapshots:
+                    self.trace.steps.append(GaussStep(
+                        iteration=step_count,
+                        matrix_snapshot=self._snapshot(matrix, rhs, rows, i + 1),
+                        description=f"Elimination: Cleared column {i} below pivot"
+                    ))
 
-        # Back Substitution: compute result of shape (column_number, rhs_count)
-        rhs_count = bias.shape[1]
-        result = np.zeros((column_number, rhs_count), dtype=float)
-        for i in range(column_number - 1, -1, -1):
-            if i + 1 < column_number:
-                sum_ax = augmented_matrix[i, i + 1:column_number].dot(
-                    result[i + 1:column_number, :])  # shape (rhs_count,)
-            else:
-                sum_ax = np.zeros(rhs_count, dtype=float)
+        return determinant
 
-            rhs_vals = augmented_matrix[i, column_number:]  # shape (rhs_count,)
-            result[i, :] = (rhs_vals - sum_ax) / augmented_matrix[i, i]
+    def _eliminate_tiles(
+            self,
+            matrix: np.ndarray,
+            rhs: np.ndarray,
+            record_snapshots: bool,
+            meter: BudgetMeter | None = None
+    ) -> typing.Tuple[float | complex, np.ndarray]:
+        """
+        Right-looking tiled elimination of a square system, swapping rows physically; returns the
+        determinant and the permutation of the original rows.
+        """
+        size = len(matrix)
+        tile = self.tile_size
+        permutation = np.arange(size)
+        # a Python number, which overflows to inf quietly
+        determinant = 1.0
+        if record_snapshots:
+            self.trace.steps.append(GaussStep(
+                iteration=0,
+                matrix_snapshot=self._snapshot(matrix, rhs, slice(None), 0),
+                description="Initial Augmented Matrix"
+            ))
 
-        self.trace.final_result = result
-        self.trace.has_converged = True
-        return result
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for start in range(0, size, tile):
+                if meter is not None:
+                    meter.check()
+                end = min(start + tile, size)
+                # the panel is eliminated serially, on a copy that keeps its multipliers below U
+                panel = np.array(matrix[start:, start:end])
+                order = np.arange(size - start)
+                for j in range(end - start):
+                    pivot_row = j + np.argmax(np.abs(panel[j:, j]))
+                    if abs(panel[pivot_row, j]) <= self.ZERO_TOLERANCE:
+                        raise ValueError("Matrix is singular (det=0), cannot solve.")
+                    if pivot_row != j:
+                        panel[[j, pivot_row]] = panel[[pivot_row, j]]
+                        order[[j, pivot_row]] = order[[pivot_row, j]]
+                        determinant = -determinant
+                    determinant *= panel[j, j].item()
+                    panel[j + 1:, j] /= panel[j, j]
+                    panel[j + 1:, j + 1:] -= np.outer(panel[j + 1:, j], panel[j, j + 1:])
+                permutation[start:] = permutation[start:][order]
+                # the multipliers of the earlier panels follow their rows, so that L U = A[permutation]
+                matrix[start:, :start] = matrix[start:, :start][order]
+                matrix[start:, start:end] = panel
+                unit_lower, multipliers = panel[:end - start], panel[end - start:]
+
+                # every column tile to the right, right-hand sides included, gets the row swaps
+                # and its rows of U; all tiles below them then get the update, in parallel
+                column_tiles = ([(matrix, slice(column, min(column + tile, size))) for column in range(end, size, tile)]
+                                + [(rhs, slice(column, column + tile)) for column in range(0, rhs.shape[1], tile)])
+
+                def solve_rows(array: np.ndarray, columns: slice):
+                    array[start:, columns] = array[start:, columns][order]
+                    array[start:end, columns] = forward_substitution(unit_lower, array[start:end, columns],
+                                                                      unit_diagonal=True)
+
+                def update(array: np.ndarray, columns: slice, row: int):
+                    rows = slice(row, min(row + tile, size))
+                    array[rows, columns] -= multipliers[row - end:rows.stop - end] @ array[start:end, columns]
+
+                _wait(executor.submit(solve_rows, array, columns) for array, columns in column_tiles)
+                _wait(executor.submit(update, array, columns, row)
+                      for array, columns in column_tiles for row in range(end, size, tile))
+
+                if record_snapshots:
+                    self.trace.steps.append(GaussStep(
+                        iteration=len(self.trace.steps),
+                        matrix_snapshot=self._snapshot(matrix, rhs, slice(None), end),
+                        description=f"Elimination: Cleared columns {start} to {end - 1} below pivots"
+                    ))
+        return determinant, permutation
+
+    def condition_estimate(self) -> float:
+        """
+        Estimate of the 1-norm condition number of the coefficients of the last solve, from the
+        ``L`` and ``U`` its elimination left in the buffer (Hager's method as refined by Higham,
+        shared with ``LUFactorization.condition_estimate``); a few solves, no inverse.
+        """
+        if self._factors is None:
+            raise ValueError("Only a completed solve of a square system that did not overwrite its input "
+                             "leaves factors to estimate from.")
+        matrix, rows, norm = self._factors
+        lu = matrix if rows is None else matrix[rows]
+        return estimate_condition(lu, self.permutation, norm)
+
+    def inverse(self, coefficients: np.ndarray, dtype: np.typing.DTypeLike = float) -> np.ndarray:
+        """
+        Invert a square matrix by solving against every column of the identity at once; the
+        same elimination also sets ``determinant``, and ``condition_estimate()`` works afterwards.
+        """
+        if coefficients.ndim != 2 or coefficients.shape[0] != coefficients.shape[1]:
+            raise ValueError(f"Only square matrices have an inverse, got shape {coefficients.shape}.")
+        return self.solve(coefficients, np.eye(len(coefficients)), dtype=dtype)
+
+    @staticmethod
+    def _snapshot(matrix: np.ndarray, rhs: np.ndarray, rows: np.ndarray | slice, eliminated: int) -> np.ndarray:
+        # the augmented matrix as if its rows had been swapped, with zeros for the multipliers
+        # stored below the first ``eliminated`` pivots
+        snapshot = np.hstack((matrix[rows], rhs[rows]))
+        for column in range(eliminated):
+            snapshot[column + 1:, column] = 0
+        return snapshot
+
+
+def _one_norm(coefficients: np.ndarray) -> float:
+    """The 1-norm (largest absolute column sum) of ``coefficients``, read a row at a time."""
+    sums = np.zeros(coefficients.shape[1])
+    for row in coefficients:
+        sums += np.abs(row)
+    return float(sums.max(initial=0.0))
+
+
+def _wait(futures: typing.Iterable[concurrent.futures.Future]):
+    """Wait for all of the futures, raising the first exception among them."""
+    for future in list(futures):
+        future.result()
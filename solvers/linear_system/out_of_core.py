@@ -0,0 +1,191 @@
+import dataclasses
+import os
+import tempfile
+import typing
+
+import numpy as np
+
+from solvers.budget import Budget, BudgetExhausted, BudgetMeter, start_clock
+from solvers.linear_system.lu import back_substitution, forward_substitution
+from solvers.solution_trace import SolutionTrace, Step
+
+
+@dataclasses.dataclass
+class PanelStep(Step):
+    first_column: int
+    last_column: int
+    description: str = ""
+
+
+class OutOfCoreSolver:
+    """
+    LU factorization with partial pivoting for matrices too large for memory, typically an
+    ``np.memmap`` of the coefficients. The matrix is factorized one panel of columns at a time:
+    the panel is read, factorized in memory and written back, then the columns to its right are
+    streamed through memory block by block to receive its row swaps and its update. The width
+    of the panels follows from ``memory_budget`` (in bytes), which holds the few panel-sized
+    buffers needed at the same time. Only right-hand sides and O(n) bookkeeping are held in memory
+    besides that.
+
+    Unless ``overwrite`` is set, the factors go to a temporary file in ``workspace`` (by default
+    the system's temporary directory), which is removed after the solve. Nothing like the
+    snapshots of ``GaussSolver`` is recorded; the trace has one step per panel.
+    """
+    DEFAULT_MEMORY_BUDGET = 256 * 2 ** 20
+    # panel-sized buffers in memory at once: the panel, a block, their product, and the outer
+    # product of a column update while the panel is factorized
+    BUFFERS = 4
+
+    def __init__(self, memory_budget: int = DEFAULT_MEMORY_BUDGET, workspace: str | None = None):
+        if memory_budget <= 0:
+            raise ValueError(f"memory_budget must be positive, got {memory_budget}.")
+        self.memory_budget = memory_budget
+        self.workspace = workspace
+        self.trace = SolutionTrace()
+
+    def panel_width(self, size: int, rhs_count: int = 1, itemsize: int = 8) -> int:
+        """The number of columns per panel for an n x n matrix within the memory budget."""
+        # the solution and the pivots stay in memory throughout
+        reserved = size * (rhs_count + 1) * itemsize
+        width = (self.memory_budget - reserved) // (self.BUFFERS * max(size, 1) * itemsize)
+        if width < 1:
+            raise ValueError(f"A memory budget of {self.memory_budget} bytes cannot hold a single column "
+                             f"of a {size} x {size} matrix.")
+        return min(width, max(size, 1))
+
+    def solve(
+            self,
+            coefficients: np.ndarray,
+            bias: np.ndarray,
+            out: np.ndarray | None = None,
+            overwrite: bool = False,
+            budget: Budget | None = None
+    ) -> np.ndarray:
+        """
+        Solve ``A x = bias`` for a vector or a matrix of right-hand sides. ``out``, for example
+        an ``np.memmap`` of the shape of ``bias``, receives the solution. With ``overwrite`` the
+        factors replace ``coefficients``, which must then be a writable float64 array.
+
+        The time limit of ``budget`` is checked before every panel and every trailing block.
+        Running out sets ``trace.budget_exhausted`` and raises ``BudgetExhausted``, leaving
+        overwritten ``coefficients`` partly factorized.
+        """
+        self.trace.clear()
+        meter = start_clock(budget)
+        if coefficients.ndim != 2 or coefficients.shape[0] != coefficients.shape[1]:
+            raise ValueError(f"coefficients must be a square matrix, got shape {coefficients.shape}.")
+        size = len(coefficients)
+        bias = np.asarray(bias)
+        if bias.ndim not in (1, 2) or bias.shape[0] != size:
+            raise ValueError(f"bias must have {size} rows, got shape {bias.shape}.")
+        if out is not None and out.shape != bias.shape:
+            raise ValueError(f"out must have the shape of bias {bias.shape}, got {out.shape}.")
+        if overwrite and (coefficients.dtype != np.float64 or not coefficients.flags.writeable):
+            raise ValueError("To be overwritten, coefficients must be a writable float64 array.")
+        width = self.panel_width(size, 1 if bias.ndim == 1 else bias.shape[1])
+
+        with tempfile.TemporaryDirectory(dir=self.workspace) as directory:
+            if overwrite:
+                factors = coefficients
+                scale = max((np.abs(coefficients[:, start:start + width]).max()
+                             for start in range(0, size, width)), default=0.0)
+            else:
+                factors = np.memmap(os.path.join(directory, "factors.dat"), dtype=np.float64, mode="w+",
+                                    shape=(size, size))
+                scale = 0.0
+                for start in range(0, size, width):
+                    block = np.asarray(coefficients[:, start:start + width], dtype=np.float64)
+                    scale = max(scale, np.abs(block).max())
+                    factors[:, start:start + width] = block
+            try:
+                pivots = self._factorize(factors, width, size * np.finfo(np.float64).eps * scale, meter)
+            except BudgetExhausted:
+                self.trace.budget_exhausted = True
+                raise
+            result = self._substitute(factors, pivots, bias, width)
+            if isinstance(factors, np.memmap):
+                factors.flush()
+            del factors  # release the mapping before the directory is removed
+
+        if out is not None:
+            out[...] = result
+            if isinstance(out, np.memmap):
+                out.flush()
+            result = out
+        self.trace.final_result = result
+        self.trace.has_converged = True
+        return result
+
+    def _factorize(
+            self,
+            factors: np.ndarray,
+            width: int,
+            singular_pivot: float,
+            meter: BudgetMeter | None = None
+    ) -> np.ndarray:
+        """Right-looking panel LU in place; returns LAPACK style pivots (row i was swapped with pivots[i])."""
+        size = len(factors)
+        pivots = np.arange(size)
+        for start in range(0, size, width):
+            if meter is not None:
+                meter.check()
+            end = min(start + width, size)
+            panel = np.array(factors[start:, start:end])
+            for j in range(end - start):
+                pivot_row = j + np.argmax(np.abs(panel[j:, j]))
+                if abs(panel[pivot_row, j]) <= singular_pivot:
+                    raise ValueError("Matrix is singular (det=0), cannot solve.")
+                pivots[start + j] = start + pivot_row
+                if pivot_row != j:
+                    panel[[j, pivot_row]] = panel[[pivot_row, j]]
+                panel[j + 1:, j] /= panel[j, j]
+                panel[j + 1:, j + 1:] -= np.outer(panel[j + 1:, j], panel[j, j + 1:])
+            factors[start:, start:end] = panel
+
+            # stream the trailing columns through memory: swap, solve for U12, update A22
+            for block_start in range(end, size, width):
+                if meter is not None:
+                    meter.check()
+                block_end = min(block_start + width, size)
+                block = np.array(factors[start:, block_start:block_end])
+                _swap_rows(block, pivots[start:end] - start)
+                block[:end - start] = forward_substitution(panel[:end - start], block[:end - start],
+                                                            unit_diagonal=True)
+                block[end - start:] -= panel[end - start:] @ block[:end - start]
+                factors[start:, block_start:block_end] = block
+            self.trace.steps.append(PanelStep(len(self.trace.steps), start, end,
+                                              f"Factorized columns {start} to {end - 1}"))
+
+        # the row swaps of later panels still have to reach the columns of earlier ones
+        for start in range(0, size, width):
+            end = min(start + width, size)
+            if end < size:
+                block = np.array(factors[end:, start:end])
+                _swap_rows(block, pivots[end:] - end)
+                factors[end:, start:end] = block
+        return pivots
+
+    def _substitute(self, factors: np.ndarray, pivots: np.ndarray, bias: np.ndarray, width: int) -> np.ndarray:
+        size = len(factors)
+        result = np.array(bias, dtype=np.result_type(bias, np.float64))
+        _swap_rows(result, pivots)
+        # forward: L y = P b, one column panel of L at a time
+        for start in range(0, size, width):
+            end = min(start + width, size)
+            panel = np.asarray(factors[start:, start:end])
+            result[start:end] = forward_substitution(panel[:end - start], result[start:end], unit_diagonal=True)
+            result[end:] -= panel[end - start:] @ result[start:end]
+        # backward: U x = y, from the last column panel of U to the first
+        for start in reversed(range(0, size, width)):
+            end = min(start + width, size)
+            panel = np.asarray(factors[:end, start:end])
+            result[start:end] = back_substitution(panel[start:], result[start:end], unit_diagonal=False)
+            result[:start] -= panel[:start] @ result[start:end]
+        return result
+
+
+def _swap_rows(array: np.ndarray, pivots: typing.Sequence[int]):
+    """Apply LAPACK style row swaps, row i with row pivots[i] in order, in place."""
+    for row, pivot_row in enumerate(pivots):
+        if pivot_row != row:
+            array[[row, pivot_row]] = array[[pivot_row, row]]
@@ -0,0 +1,271 @@
+"""
+Solve many linear systems in worker processes without sending the matrices through pipes.
+
+Inputs and outputs live in ``multiprocessing.shared_memory`` blocks. A worker receives only
+``ArrayDescriptor``s (block name, shape, dtype and offset), maps the blocks, and solves its
+share of the systems straight from and into them, so neither the coefficients nor the results
+are ever pickled.
+"""
+
+import concurrent.futures
+import contextlib
+import dataclasses
+import math
+import os
+import time
+import traceback
+import typing
+import weakref
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import numpy.typing
+
+from solvers.budget import Budget, BudgetExhausted, start_clock
+from solvers.linear_system.gauss import GaussSolver
+
+# the error of a system left unsolved when the time limit of a budget passed
+OUT_OF_TIME = "The time limit passed before the system was solved."
+
+
+@dataclasses.dataclass(frozen=True)
+class ArrayDescriptor:
+    """Where an array lives in shared memory: everything another process needs to map it."""
+    name: str
+    shape: typing.Tuple[int, ...]
+    dtype: str
+    offset: int = 0
+
+    def view(self, block: SharedMemory) -> np.ndarray:
+        return _view(block, self.shape, self.dtype, self.offset)
+
+
+def _view(
+        block: SharedMemory,
+        shape: typing.Tuple[int, ...],
+        dtype: np.typing.DTypeLike,
+        offset: int = 0
+) -> np.ndarray:
+    # unlike np.ndarray(buffer=...), frombuffer holds on to the buffer, so the block cannot be
+    # closed under a live array
+    return np.frombuffer(block.buf, dtype=dtype, count=math.prod(shape), offset=offset).reshape(shape)
+
+
+def _exporter(array: np.ndarray) -> typing.Any:
+    """The buffer object that the views of ``array`` share and that holds its memory exported."""
+    while isinstance(array.base, np.ndarray):
+        array = array.base
+    return array.base
+
+
+@contextlib.contextmanager
+def _mapped(*descriptors: ArrayDescriptor) -> typing.Iterator[typing.List[np.ndarray]]:
+    """
+    Map the shared memory of ``descriptors`` for the duration of the block and yield the arrays
+    they describe. The arrays are released before the blocks are closed, which a live view would
+    prevent; that includes the views in the frames of an exception raised in the block.
+    """
+    blocks = {descriptor.name: SharedMemory(name=descriptor.name) for descriptor in descriptors}
+    views = [descriptor.view(blocks[descriptor.name]) for descriptor in descriptors]
+    try:
+        yield views
+    except BaseException as e:
+        traceback.clear_frames(e.__traceback__)
+        raise
+    finally:
+        views.clear()
+        for block in blocks.values():
+            block.close()
+
+
+def _solve_chunk(
+        coefficients: ArrayDescriptor,
+        bias: ArrayDescriptor,
+        out: ArrayDescriptor,
+        start: int,
+        stop: int,
+        tile_size: int,
+        deadline: float | None = None
+) -> typing.Dict[int, str]:
+    """
+    Worker side: solve systems ``start`` to ``stop - 1``; returns the errors by system. The
+    ``deadline`` is a ``time.time()``, as the monotonic clock is not shared between processes.
+    """
+    with _mapped(coefficients, bias, out) as views:
+        return _solve_views(*views, start, stop, tile_size, deadline)
+
+
+def _solve_views(
+        coefficients: np.ndarray,
+        bias: np.ndarray,
+        out: np.ndarray,
+        start: int,
+        stop: int,
+        tile_size: int,
+        deadline: float | None = None
+) -> typing.Dict[int, str]:
+    # one solver for the whole chunk, with one thread: the processes are the parallelism
+    solver = GaussSolver(workers=1, tile_size=tile_size)
+    errors = {}
+    for index in range(start, stop):
+        result = out[index] if out.ndim == 3 else out[index][:, np.newaxis]
+        try:
+            budget = None
+            if deadline is not None:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise BudgetExhausted(OUT_OF_TIME)
+                budget = Budget(seconds=remaining)
+            solver.solve(coefficients[index], bias[index], dtype=out.dtype, out=result, record_snapshots=False,
+                         budget=budget)
+        except ValueError as e:
+            result[...] = np.nan
+            errors[index] = str(e)
+        except BudgetExhausted:
+            result[...] = np.nan
+            errors[index] = OUT_OF_TIME
+    return errors
+
+
+class ParallelLinearSolver:
+    """
+    A long-lived pool of worker processes solving stacks of square systems with the tiled
+    ``GaussSolver``. Arrays allocated with ``empty`` already live in shared memory and are
+    used in place; any other input is copied into shared memory once, in this process. Use it
+    as a context manager, or call ``close``, to stop the workers and free the shared memory;
+    arrays from ``empty`` stay valid after that, and their block is closed once the last view
+    of it is gone.
+    """
+
+    def __init__(
+            self,
+            workers: int | None = None,
+            chunk_size: int | None = None,
+            tile_size: int = GaussSolver.DEFAULT_TILE_SIZE
+    ):
+        """``chunk_size`` systems are sent to a worker at a time; by default each worker gets about four chunks."""
+        if workers is not None and workers < 1:
+            raise ValueError(f"workers must be positive, got {workers}.")
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}.")
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.tile_size = tile_size
+        self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers)
+        # shared memory blocks created by this solver, with the address of their first byte
+        self._blocks: typing.Dict[str, typing.Tuple[SharedMemory, int]] = {}
+        # errors of the last solve, by the index of the system
+        self.errors: typing.Dict[int, str] = {}
+        # whether the budget of the last solve ran out before every system was solved
+        self.budget_exhausted = False
+
+    def __enter__(self) -> "ParallelLinearSolver":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def empty(self, shape: typing.Tuple[int, ...], dtype: np.typing.DTypeLike = float) -> np.ndarray:
+        """An uninitialized array in shared memory, kept until ``release`` or ``close``."""
+        dtype = np.dtype(dtype)
+        block = SharedMemory(create=True, size=max(1, math.prod(shape) * dtype.itemsize))
+        array = _view(block, shape, dtype)
+        # the block is closed when the buffer all views share goes, never while one is exported;
+        # at exit there is nothing left to close
+        weakref.finalize(_exporter(array), block.close).atexit = False
+        self._blocks[block.name] = (block, array.__array_interface__["data"][0])
+        return array
+
+    def release(self, array: np.ndarray):
+        """
+        Free the shared memory of an array from ``empty``. The memory is returned to the system
+        once the array and all views of it are gone.
+        """
+        descriptor = self._describe(array)
+        if descriptor is None:
+            raise ValueError("The array does not live in shared memory of this solver.")
+        self._free(descriptor.name)
+
+    def close(self):
+        self._executor.shutdown()
+        for name in list(self._blocks):
+            self._free(name)
+
+    def solve(
+            self,
+            coefficients: np.ndarray,
+            bias: np.ndarray,
+            out: np.ndarray | None = None,
+            budget: Budget | None = None
+    ) -> np.ndarray:
+        """
+        Solve ``coefficients[i] x = bias[i]`` for a stack of m square matrices of shape
+        ``(m, n, n)`` and right-hand sides of shape ``(m, n)`` or ``(m, n, k)``. The solutions,
+        of the shape of ``bias``, go to ``out`` if given; that is free when ``out`` comes from
+        ``empty``. Systems that cannot be solved get NaN solutions and an entry in ``errors``.
+
+        Systems not solved by the time limit of ``budget`` are left the same way, with the error
+        ``OUT_OF_TIME``, and set ``budget_exhausted``; the solutions found by then are kept.
+        """
+        start_clock(budget)  # rejects evaluation budgets
+        deadline = None if budget is None or budget.seconds is None else time.time() + budget.seconds
+        if coefficients.ndim != 3 or coefficients.shape[1] != coefficients.shape[2]:
+            raise ValueError(f"coefficients must be a stack of square matrices, got shape {coefficients.shape}.")
+        if bias.ndim not in (2, 3) or bias.shape[:2] != coefficients.shape[:2]:
+            raise ValueError(f"bias must have shape {coefficients.shape[:2]} or {coefficients.shape[:2]} + (k,), "
+                             f"got {bias.shape}.")
+        dtype = np.result_type(coefficients, bias, float)
+        if out is not None and (out.shape != bias.shape or out.dtype != dtype):
+            raise ValueError(f"out must be a {dtype} array of shape {bias.shape}, got a {out.dtype} array "
+                             f"of shape {out.shape}.")
+        self.errors = {}
+        self.budget_exhausted = False
+
+        # inputs outside shared memory are copied in, the result is copied out
+        staged: typing.Dict[str, np.ndarray] = {}
+        descriptors = []
+        for array, shape, array_dtype in ((coefficients, coefficients.shape, coefficients.dtype),
+                                          (bias, bias.shape, bias.dtype), (out, bias.shape, dtype)):
+            descriptor = self._describe(array) if array is not None else None
+            if descriptor is None:
+                shared = self.empty(shape, array_dtype)
+                if array is not None and array is not out:
+                    shared[...] = array
+                descriptor = self._describe(shared)
+                staged[descriptor.name] = shared
+            descriptors.append(descriptor)
+        try:
+            count = len(coefficients)
+            chunk_size = self.chunk_size or max(1, math.ceil(count / (4 * self.workers)))
+            futures = [self._executor.submit(_solve_chunk, *descriptors, start, min(start + chunk_size, count),
+                                             self.tile_size, deadline)
+                       for start in range(0, count, chunk_size)]
+            for future in futures:
+                self.errors.update(future.result())
+            self.budget_exhausted = OUT_OF_TIME in self.errors.values()
+
+            if descriptors[2].name not in staged:
+                return out
+            result = staged[descriptors[2].name]
+            if out is None:
+                return np.array(result)
+            out[...] = result
+            return out
+        finally:
+            for name in staged:
+                self._free(name)
+            # dropping the staged arrays closes their blocks
+            staged.clear()
+
+    def _describe(self, array: np.ndarray) -> ArrayDescriptor | None:
+        if not array.flags.c_contiguous or array.size == 0:
+            return None
+        start = array.__array_interface__["data"][0]
+        for name, (block, address) in self._blocks.items():
+            if address <= start and start + array.nbytes <= address + block.size:
+                return ArrayDescriptor(name, array.shape, array.dtype.str, start - address)
+        return None
+
+    def _free(self, name: str):
+        block, _ = self._blocks.pop(name)
+        block.unlink()
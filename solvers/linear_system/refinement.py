@@ -0,0 +1,119 @@
+import dataclasses
+
+import numpy as np
+import numpy.typing
+
+from solvers.budget import Budget, BudgetExhausted, BudgetMeter, start_clock
+from solvers.linear_system.lu import LUFactorization
+from solvers.solution_trace import SolutionTrace, Step
+
+
+@dataclasses.dataclass
+class RefinementStep(Step):
+    residual_norm: float
+    correction_norm: float
+
+
+class MixedPrecisionSolver:
+    """
+    Iterative refinement: factorize once in low precision (float32 by default), then repeatedly
+    compute the residual ``b - A x`` in float64 and correct ``x`` with a cheap low-precision
+    solve. For matrices that are not too ill-conditioned (condition number well below 1e7 for
+    float32) this reaches float64 accuracy at close to the cost of a float32 factorization.
+    """
+    DEFAULT_MAX_ITERATIONS = 10
+    # a correction that does not at least halve the previous one means refinement has stalled
+    STAGNATION_RATIO = 0.5
+
+    def __init__(self, factorization_dtype: np.typing.DTypeLike = np.float32):
+        self.factorization_dtype = np.dtype(factorization_dtype)
+        self.trace = SolutionTrace()
+        # whether the last solve had to factorize in float64
+        self.used_fallback = False
+
+    def solve(
+            self,
+            coefficients: np.ndarray,
+            bias: np.ndarray,
+            tolerance: float | None = None,
+            max_iterations: int = DEFAULT_MAX_ITERATIONS,
+            budget: Budget | None = None
+    ) -> np.ndarray:
+        """
+        Refine until the relative residual ``|b - A x| / (|A| |x| + |b|)`` (infinity norms) is
+        below ``tolerance``, by default a small multiple of the float64 epsilon. If the matrix is
+        too ill-conditioned for the factorization precision (it looks singular, or refinement
+        stalls), the solve is redone with a float64 factorization and ``used_fallback`` is set.
+
+        The time limit of ``budget`` is checked before each factorization and each correction.
+        Once it passes, the solve returns the iterate of smallest residual so far and sets
+        ``trace.budget_exhausted``; it raises ``BudgetExhausted`` only if there is none yet.
+        """
+        self.trace.clear()
+        meter = start_clock(budget)
+        self._best: np.ndarray | None = None
+        self._best_residual_norm = np.inf
+        coefficients = np.asarray(coefficients, dtype=float)
+        bias = np.asarray(bias, dtype=float)
+        if tolerance is None:
+            tolerance = 4 * len(coefficients) * np.finfo(float).eps
+
+        coefficients_norm = np.max(np.sum(np.abs(coefficients), axis=1))
+        bias_norm = np.max(np.abs(bias))
+        self.used_fallback = False
+        # like LAPACK's dsgesv, fall back to a float64 factorization if the cheap one fails
+        try:
+            for dtype in dict.fromkeys((self.factorization_dtype, np.dtype(float))):
+                if meter is not None:
+                    meter.check()
+                self.used_fallback = dtype != self.factorization_dtype
+                try:
+                    factorization = LUFactorization(coefficients, dtype=dtype)
+                except ValueError:
+                    if dtype == float:
+                        raise
+                    continue
+                result = factorization.solve(bias).astype(float)
+                if self._refine(coefficients, bias, result, factorization, tolerance, max_iterations,
+                                coefficients_norm, bias_norm, meter):
+                    break
+        except BudgetExhausted:
+            self.trace.budget_exhausted = True
+            if self._best is None:
+                raise
+            result = self._best
+
+        self.trace.final_result = result
+        return result
+
+    def _refine(
+            self,
+            coefficients: np.ndarray,
+            bias: np.ndarray,
+            result: np.ndarray,
+            factorization: LUFactorization,
+            tolerance: float,
+            max_iterations: int,
+            coefficients_norm: float,
+            bias_norm: float,
+            meter: BudgetMeter | None = None
+    ) -> bool:
+        previous_correction_norm = np.inf
+        for iteration in range(max_iterations):
+            residual = bias - coefficients @ result
+            residual_norm = float(np.max(np.abs(residual)))
+            if residual_norm <= tolerance * (coefficients_norm * np.max(np.abs(result)) + bias_norm):
+                self.trace.has_converged = True
+                return True
+            if meter is not None:
+                if residual_norm < self._best_residual_norm:
+                    self._best, self._best_residual_norm = result.copy(), residual_norm
+                meter.check()
+            correction = factorization.solve(residual)
+            correction_norm = float(np.max(np.abs(correction)))
+            self.trace.steps.append(RefinementStep(len(self.trace.steps), residual_norm, correction_norm))
+            if correction_norm > self.STAGNATION_RATIO * previous_correction_norm:
+                return False
+            result += correction
+            previous_correction_norm = correction_norm
+        return False
@@ -0,0 +1,247 @@
+import dataclasses
+import typing
+
+import numpy as np
+
+from solvers.budget import Budget, BudgetExhausted, BudgetMeter, start_clock
+from solvers.linear_system.lu import LUFactorization, back_substitution, forward_substitution
+from solvers.solution_trace import SolutionTrace, Step
+
+
+@dataclasses.dataclass
+class StructureStep(Step):
+    structure: str
+    kernel: str
+    description: str = ""
+
+
+class _Breakdown(Exception):
+    """A symmetric factorization met a pivot it cannot use."""
+
+
+class StructuredSolver:
+    """
+    Solve ``A x = b`` with the cheapest exact kernel the structure of ``A`` allows. A pass over
+    the matrix detects diagonal, triangular and symmetric (Hermitian) input:
+
+    * diagonal matrices are solved by scaling, in O(n);
+    * triangular ones by a single substitution, in O(n^2);
+    * symmetric ones by a blocked Cholesky ``L L^H`` factorization when the matrix turns out
+      to be positive definite, and by a blocked ``L D L^H`` factorization otherwise, both at
+      about half the flops of LU;
+    * anything else, or a symmetric matrix whose ``L D L^H`` factorization breaks down
+      without pivoting, by ``LUFactorization``.
+
+    Every detected structure and every kernel tried is recorded in the trace, and the kernel
+    that produced the result is kept in ``kernel``.
+    """
+    BLOCK_SIZE = 64
+    # relative asymmetry tolerated in a matrix treated as symmetric, in units of the epsilon
+    SYMMETRY_ULPS = 64
+    # without pivoting, L D L^H is only stable while the diagonal of |L| |D| |L|^H stays within
+    # this factor of the largest entry of A (for positive definite matrices it never exceeds 1)
+    MAX_LDL_GROWTH = 1e3
+
+    def __init__(self, block_size: int = BLOCK_SIZE):
+        if block_size < 1:
+            raise ValueError(f"block_size must be positive, got {block_size}.")
+        self.block_size = block_size
+        self.trace = SolutionTrace()
+        self.structure: str | None = None
+        self.kernel: str | None = None
+        self._meter: BudgetMeter | None = None
+
+    def solve(self, coefficients: np.ndarray, bias: np.ndarray, budget: Budget | None = None) -> np.ndarray:
+        """
+        Solve for a vector or a matrix of right-hand sides; the result has the shape of ``bias``.
+        The time limit of ``budget`` is checked before every kernel and every block column of a
+        symmetric factorization; running out sets ``trace.budget_exhausted`` and raises
+        ``BudgetExhausted``.
+        """
+        self.trace.clear()
+        self.structure = self.kernel = None
+        self._meter = start_clock(budget)
+        try:
+            result = self._solve(coefficients, bias)
+        except BudgetExhausted:
+            self.trace.budget_exhausted = True
+            raise
+        finally:
+            self._meter = None
+        self.trace.final_result = result
+        self.trace.has_converged = True
+        return result
+
+    def _solve(self, coefficients: np.ndarray, bias: np.ndarray) -> np.ndarray:
+        coefficients = np.asarray(coefficients)
+        bias = np.asarray(bias)
+        if coefficients.ndim != 2 or coefficients.shape[0] != coefficients.shape[1]:
+            raise ValueError(f"coefficients must be a square matrix, got shape {coefficients.shape}.")
+        if bias.ndim not in (1, 2) or bias.shape[0] != len(coefficients):
+            raise ValueError(f"bias must have {len(coefficients)} rows, got shape {bias.shape}.")
+        coefficients = coefficients.astype(np.result_type(coefficients, float), copy=False)
+
+        self.structure = detect_structure(coefficients, self.SYMMETRY_ULPS, self.block_size)
+        self._record("detected", f"Detected a {self.structure.replace('_', ' ')} matrix")
+
+        self._check()
+        if self.structure == "diagonal":
+            return self._scale(coefficients, bias)
+        if self.structure in ("upper_triangular", "lower_triangular"):
+            return self._substitute(coefficients, bias)
+        if self.structure == "symmetric":
+            return self._symmetric(coefficients, bias)
+        return self._general(coefficients, bias)
+
+    def _check(self):
+        if self._meter is not None:
+            self._meter.check()
+
+    def _record(self, kernel: str, description: str):
+        self.trace.steps.append(StructureStep(len(self.trace.steps), self.structure, kernel, description))
+
+    def _use(self, kernel: str):
+        self.kernel = kernel
+        self._record(kernel, f"Solved with the {kernel.replace('_', ' ')} kernel")
+
+    def _scale(self, coefficients: np.ndarray, bias: np.ndarray) -> np.ndarray:
+        diagonal = np.diagonal(coefficients)
+        _check_diagonal(diagonal, coefficients)
+        self._use("diagonal_scale")
+        return bias / (diagonal if bias.ndim == 1 else diagonal[:, np.newaxis])
+
+    def _substitute(self, coefficients: np.ndarray, bias: np.ndarray) -> np.ndarray:
+        _check_diagonal(np.diagonal(coefficients), coefficients)
+        if self.structure == "upper_triangular":
+            self._use("back_substitution")
+            return back_substitution(coefficients, bias, unit_diagonal=False)
+        self._use("forward_substitution")
+        return forward_substitution(coefficients, bias, unit_diagonal=False)
+
+    def _symmetric(self, coefficients: np.ndarray, bias: np.ndarray) -> np.ndarray:
+        if np.all(np.real(np.diagonal(coefficients)) > 0):
+            try:
+                lower, _ = _symmetric_factorization(coefficients, self.block_size, cholesky=True,
+                                                    meter=self._meter)
+            except _Breakdown as e:
+                self._record("cholesky", f"Cholesky failed, the matrix is not positive definite: {e}")
+            else:
+                self._use("cholesky")
+                intermediate = forward_substitution(lower, bias, unit_diagonal=False)
+                return back_substitution(lower.conj().T, intermediate, unit_diagonal=False)
+        else:
+            self._record("cholesky", "Skipped Cholesky, the diagonal is not positive")
+
+        self._check()
+        try:
+            lower, diagonal = _symmetric_factorization(coefficients, self.block_size, cholesky=False,
+                                                       meter=self._meter)
+            growth = np.max(np.abs(lower) ** 2 @ np.abs(diagonal), initial=0) / np.abs(coefficients).max()
+            if growth > self.MAX_LDL_GROWTH:
+                raise _Breakdown(f"element growth {growth:.3g}")
+        except _Breakdown as e:
+            self._record("ldl", f"LDL^H without pivoting is unstable for this matrix: {e}")
+            return self._general(coefficients, bias)
+        self._use("ldl")
+        intermediate = forward_substitution(lower, bias, unit_diagonal=True)
+        intermediate /= diagonal if intermediate.ndim == 1 else diagonal[:, np.newaxis]
+        return back_substitution(lower.conj().T, intermediate, unit_diagonal=True)
+
+    def _general(self, coefficients: np.ndarray, bias: np.ndarray) -> np.ndarray:
+        self._check()
+        factorization = LUFactorization(coefficients)
+        self._use("lu")
+        return factorization.solve(bias)
+
+
+def detect_structure(
+        coefficients: np.ndarray,
+        symmetry_ulps: float = StructuredSolver.SYMMETRY_ULPS,
+        block_size: int = StructuredSolver.BLOCK_SIZE
+) -> str:
+    """
+    Classify a square matrix as ``"diagonal"``, ``"upper_triangular"``, ``"lower_triangular"``,
+    ``"symmetric"`` (Hermitian, for complex matrices) or ``"general"``, in O(n^2) operations on
+    one block of rows at a time, stopping as soon as no structure is left. Triangular structure
+    must be exact; symmetry is tolerated up to ``symmetry_ulps`` units of round-off relative to
+    the largest entry, as products like ``B^T B`` are rarely exactly symmetric.
+    """
+    size = len(coefficients)
+    blocks = [(start, min(start + block_size, size)) for start in range(0, size, block_size)]
+    scale = max((np.abs(coefficients[start:end]).max() for start, end in blocks), default=0)
+    tolerance = symmetry_ulps * np.finfo(coefficients.dtype).eps * scale
+    lower_empty = upper_empty = symmetric = True
+    for start, end in blocks:
+        rows = coefficients[start:end]
+        # row i of the block is row start + i of the matrix
+        lower_empty = lower_empty and not np.tril(rows, start - 1).any()
+        upper_empty = upper_empty and not np.triu(rows, start + 1).any()
+        symmetric = symmetric and bool(np.all(np.abs(rows - coefficients[:, start:end].conj().T) <= tolerance)
+                                       and np.all(np.abs(np.imag(np.diagonal(rows, start))) <= tolerance))
+        if not (lower_empty or upper_empty or symmetric):
+            return "general"
+    if lower_empty and upper_empty:
+        return "diagonal"
+    if lower_empty:
+        return "upper_triangular"
+    if upper_empty:
+        return "lower_triangular"
+    return "symmetric"
+
+
+def _check_diagonal(diagonal: np.ndarray, coefficients: np.ndarray):
+    if np.any(np.abs(diagonal) <= len(diagonal) * np.finfo(coefficients.dtype).eps * np.abs(coefficients).max()):
+        raise ValueError("Matrix is singular (det=0), cannot solve.")
+
+
+def _symmetric_factorization(
+        coefficients: np.ndarray,
+        block_size: int,
+        cholesky: bool,
+        meter: BudgetMeter | None = None
+) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """
+    Right-looking blocked ``A = L D L^H`` (unit ``L``) or, with ``cholesky``, ``A = L L^H``
+    (``D`` all ones), using only the lower triangle of ``A``. The trailing update after every
+    block column touches only block rows on and below the diagonal, which is what halves the
+    flops of LU.
+    """
+    size = len(coefficients)
+    lower = np.tril(coefficients)
+    diagonal = np.ones(size, dtype=float)
+    singular_pivot = size * np.finfo(lower.dtype).eps * (np.abs(lower).max() if size else 0)
+
+    for start in range(0, size, block_size):
+        if meter is not None:
+            meter.check()
+        end = min(start + block_size, size)
+        block = lower[start:end, start:end]
+        for j in range(end - start):
+            # the update of column j by the earlier columns of this block
+            scaled = diagonal[start:start + j] * block[j, :j].conj()
+            pivot = (block[j, j] - block[j, :j] @ scaled).real
+            # Cholesky needs positive pivots, L D L^H merely nonzero ones
+            if not (pivot if cholesky else abs(pivot)) > singular_pivot:
+                raise _Breakdown(f"pivot {pivot:.3g} in column {start + j}")
+            column = block[j + 1:, j] - block[j + 1:, :j] @ scaled
+            if cholesky:
+                block[j, j] = np.sqrt(pivot)
+                block[j + 1:, j] = column / block[j, j]
+            else:
+                diagonal[start + j] = pivot
+                block[j, j] = 1
+                block[j + 1:, j] = column / pivot
+        if end == size:
+            break
+
+        # panel: L21 = A21 L11^-H D1^-1
+        panel = lower[end:, start:end]
+        solved = forward_substitution(block, panel.conj().T, unit_diagonal=not cholesky)
+        panel[:] = solved.conj().T / diagonal[start:end]
+        # trailing lower triangle: A22 -= L21 D1 L21^H, one block row at a time
+        weighted = panel * diagonal[start:end]
+        for row in range(end, size, block_size):
+            row_end = min(row + block_size, size)
+            lower[row:row_end, end:row_end] -= (weighted[row - end:row_end - end]
+                                                @ panel[:row_end - end].conj().T)
+    return np.tril(lower), diagonal
@@ -1,23 +1,46 @@
-"""Expose solver classes from submodules in this package."""
+"""Expose solver classes from submodules in this package, importing each submodule on first use."""
 
-import pkgutil
 import importlib
-import inspect
-from types import ModuleType
+import typing
 
-__all__ = []
+# exported name -> module defining it (relative to this package unless absolute)
+_EXPORTS: typing.Dict[str, str] = {
+    "AitkenSolver": ".aitken",
+    "AitkenStep": ".aitken",
+    "BasinMap": ".basins",
+    "BasinMapper": ".basins",
+    "BisectionSolver": ".bisection",
+    "BisectionStep": ".bisection",
+    "ContinuationSolver": ".continuation",
+    "ContinuationStep": ".continuation",
+    "Expression": ".expression",
+    "ExpressionError": ".expression",
+    "Interval": ".interval",
+    "MonadicEquationSolver": ".monadic_equation_solver",
+    "MonadicEquationSolverNotConvergedException": ".monadic_equation_solver",
+    "NewtonDownhillSolver": ".newton_downhill",
+    "NewtonDownhillStep": ".newton_downhill",
+    "NewtonSolver": ".newton",
+    "NewtonStep": ".newton",
+    "Polynomial": ".polynomial",
+    "PolynomialSolver": ".polynomial",
+    "PolynomialStep": ".polynomial",
+    "PortfolioSolver": ".portfolio",
+    "PortfolioStep": ".portfolio",
+    "SolutionTrace": "solvers.solution_trace",
+    "Step": "solvers.solution_trace",
+}
 
-for finder, name, ispkg in pkgutil.iter_modules(__path__):
-    try:
-        mod: ModuleType = importlib.import_module(f"{__name__}.{name}")
-    except Exception:
-        # Skip modules that cannot be imported to avoid breaking package import
-        continue
+__all__ = sorted(_EXPORTS)
 
-    for attr_name, attr in vars(mod).items():
-        # Export classes that follow the "<Name>Solver" convention
-        if not attr_name.startswith("_") and inspect.isclass(attr):
-            globals()[attr_name] = attr
-            __all__.append(attr_name)
 
-__all__ = sorted(set(__all__))
+def __getattr__(name: str) -> typing.Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value  # later lookups bypass __getattr__
+    return value
+
+
+def __dir__() -> typing.List[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
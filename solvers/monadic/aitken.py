@@ -1,9 +1,10 @@
 import dataclasses
 import math
+import typing
 
-from solvers.solution_trace import Step, SolutionTrace
-from solvers.monadic.monadic_equation_solver import UnaryFunction, MonadicEquationSolver, \
-    MonadicEquationSolverNotConvergedException
+from solvers.budget import Budget
+from solvers.solution_trace import Step
+from solvers.monadic.monadic_equation_solver import UnaryFunction, MonadicEquationSolver
 
 
 @dataclasses.dataclass
@@ -25,23 +26,26 @@ class AitkenSolver(MonadicEquationSolver):
             guess: float,
             tolerance: float,
             raise_exception_if_no_convergence: bool = False,
-            max_iterations: int = DEFAULT_MAX_ITERATIONS
+            max_iterations: int = DEFAULT_MAX_ITERATIONS,
+            budget: Budget | None = None
     ) -> float:
+        return self._run_budgeted(lambda: self.iterate(guess, tolerance, max_iterations),
+                                  raise_exception_if_no_convergence, budget)
+
+    def iterate(
+            self,
+            guess: float,
+            tolerance: float,
+            max_iterations: int = DEFAULT_MAX_ITERATIONS
+    ) -> typing.Generator[AitkenStep, None, float]:
         for iteration in range(max_iterations):
             x = guess
             y = self.function(x)
             if math.isclose(y, x, abs_tol=tolerance):
-                self.trace.final_result = x
-                self.trace.has_converged = True
-                return x
+                return self._finish(x, True)
             z = self.function(y)
             slope = (z - y) / (y - x)
-            step = AitkenStep(iteration, x, y, z, slope)
-            self.trace.steps.append(step)
+            yield AitkenStep(iteration, x, y, z, slope)
             guess = (x * z - y ** 2) / (x - 2 * y + z)
 
-        self.trace.final_result = guess
-        self.trace.has_converged = False
-        if raise_exception_if_no_convergence:
-            raise MonadicEquationSolverNotConvergedException(self)
-        return guess
+        return self._finish(guess, False)
@@ -0,0 +1,232 @@
+"""
+Basins of attraction: which root Newton's method reaches, and how fast, from every point of a
+grid of starting values.
+
+``BasinMapper`` runs Newton's method (or the downhill variant) on all starting points of a
+chunk at once. Every iteration works on the points still active only, which shrink as points
+converge or stall, so a chunk costs about as much as its slowest points need. Large grids are
+processed chunk by chunk; a complex grid is generated chunk by chunk as well, so that a
+4096 x 4096 map never holds more than the per-point results and one chunk of work arrays.
+"""
+
+import dataclasses
+import typing
+
+import numpy as np
+
+from solvers.monadic import calculus
+from solvers.monadic.calculus import DEFAULT_STEP_SIZE
+from solvers.monadic.monadic_equation_solver import UnaryFunction
+from solvers.monadic.newton import NewtonSolver
+
+
+@dataclasses.dataclass
+class BasinMap:
+    # the distinct roots reached, in order of discovery (or as given)
+    roots: np.ndarray
+    # per starting point: the index into roots, or -1 where the iteration did not converge
+    root_index: np.ndarray
+    # per starting point: Newton steps taken to converge, or to give up
+    iterations: np.ndarray
+    max_iterations: int
+    # (real min, real max, imaginary min, imaginary max) of a complex grid
+    extent: typing.Tuple[float, float, float, float] | None = None
+
+    @property
+    def converged(self) -> np.ndarray:
+        return self.root_index >= 0
+
+
+class BasinMapper:
+    """
+    ``function`` (and ``derivative``, by default a central difference) must accept NumPy
+    arrays, and complex ones for complex grids. The convergence tests are those of
+    ``NewtonSolver`` and ``NewtonDownhillSolver``, so a point takes as many steps here as a
+    single run of the solver from it.
+    """
+    DEFAULT_MAX_ITERATIONS = 64
+    # starting points per chunk: the work arrays of a chunk take a few tens of megabytes
+    DEFAULT_CHUNK_SIZE = 2 ** 18
+    DERIVATIVE_TOLERANCE = NewtonSolver.DERIVATIVE_TOLERANCE
+    METHODS = ("newton", "newton_downhill")
+
+    def __init__(
+            self,
+            function: UnaryFunction,
+            derivative: UnaryFunction | None = None,
+            method: str = "newton",
+            step_size: float = DEFAULT_STEP_SIZE
+    ):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown method {method!r}, expected one of {self.METHODS}.")
+        self.function = function
+        self.derivative = calculus.get_derivative_of(function, step_size) if derivative is None else derivative
+        self.method = method
+
+    def map(
+            self,
+            starts: np.ndarray,
+            tolerance: float = 1e-12,
+            max_iterations: int = DEFAULT_MAX_ITERATIONS,
+            roots: typing.Sequence[complex] | None = None,
+            root_tolerance: float | None = None,
+            chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> BasinMap:
+        """
+        Map an array of starting points of any shape, such as a dense 1D real grid. Iterates
+        that converge within ``root_tolerance`` (by default ``max(1e3 * tolerance, 1e-8)``) of
+        the same point belong to the same root; with ``roots`` given, iterates reaching none of
+        them count as not converged.
+        """
+        starts = np.asarray(starts)
+        if starts.dtype.kind not in "fc":
+            starts = starts.astype(float)
+        return self._map(starts.shape, lambda first, last: starts.reshape(-1)[first:last], starts.dtype,
+                         tolerance, max_iterations, roots, root_tolerance, chunk_size)
+
+    def map_grid(
+            self,
+            real: typing.Tuple[float, float],
+            imaginary: typing.Tuple[float, float],
+            shape: typing.Tuple[int, int],
+            tolerance: float = 1e-12,
+            max_iterations: int = DEFAULT_MAX_ITERATIONS,
+            roots: typing.Sequence[complex] | None = None,
+            root_tolerance: float | None = None,
+            chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> BasinMap:
+        """
+        Map the complex grid of ``shape = (rows, columns)`` points spanning ``real`` and
+        ``imaginary``. Row 0 is the top of the image, at the largest imaginary part.
+        """
+        rows, columns = shape
+        if rows < 1 or columns < 1:
+            raise ValueError(f"shape must be positive, got {shape}.")
+        real_axis = np.linspace(real[0], real[1], columns)
+        imaginary_axis = np.linspace(imaginary[1], imaginary[0], rows)
+
+        def chunk(first: int, last: int) -> np.ndarray:
+            row, column = np.divmod(np.arange(first, last), columns)
+            return real_axis[column] + 1j * imaginary_axis[row]
+
+        basin_map = self._map((rows, columns), chunk, np.dtype(complex), tolerance, max_iterations, roots,
+                              root_tolerance, chunk_size)
+        basin_map.extent = (real[0], real[1], imaginary[0], imaginary[1])
+        return basin_map
+
+    def _map(
+            self,
+            shape: typing.Tuple[int, ...],
+            chunk: typing.Callable[[int, int], np.ndarray],
+            dtype: np.dtype,
+            tolerance: float,
+            max_iterations: int,
+            roots: typing.Sequence[complex] | None,
+            root_tolerance: float | None,
+            chunk_size: int
+    ) -> BasinMap:
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}.")
+        if not 0 < max_iterations < np.iinfo(np.uint16).max:
+            raise ValueError(f"max_iterations must be in [1, {np.iinfo(np.uint16).max}), got {max_iterations}.")
+        root_tolerance = max(1e3 * tolerance, 1e-8) if root_tolerance is None else root_tolerance
+        known = np.asarray([] if roots is None else roots, dtype=dtype)
+        fixed_roots = roots is not None
+
+        size = int(np.prod(shape))
+        root_index = np.full(size, -1, dtype=np.int16)
+        iterations = np.full(size, max_iterations, dtype=np.uint16)
+        for first in range(0, size, chunk_size):
+            last = min(first + chunk_size, size)
+            finals, steps, converged = self._iterate(chunk(first, last), tolerance, max_iterations)
+            iterations[first:last] = steps
+            indices, known = _classify(finals[converged], known, root_tolerance, fixed_roots)
+            chunk_index = np.full(last - first, -1, dtype=np.int16)
+            chunk_index[converged] = indices
+            root_index[first:last] = chunk_index
+        return BasinMap(known, root_index.reshape(shape), iterations.reshape(shape), max_iterations)
+
+    def _iterate(
+            self,
+            starts: np.ndarray,
+            tolerance: float,
+            max_iterations: int
+    ) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Newton on all points at once; returns the final iterates, the steps taken and what converged."""
+        finals = starts.copy()
+        steps = np.full(len(starts), max_iterations, dtype=np.uint16)
+        converged = np.zeros(len(starts), dtype=bool)
+        # the points still iterating, by their position in the chunk
+        active = np.arange(len(starts))
+        x = starts
+        with np.errstate(all="ignore"):
+            for iteration in range(max_iterations):
+                value = self._evaluate(self.function, x)
+                done = np.abs(value) <= tolerance
+                finals[active[done]] = x[done]
+                steps[active[done]] = iteration
+                converged[active[done]] = True
+
+                derivative = self._evaluate(self.derivative, x)
+                stalled = ~done & ~(np.abs(derivative) > self.DERIVATIVE_TOLERANCE)
+                finals[active[stalled]] = x[stalled]
+                steps[active[stalled]] = iteration
+
+                keep = ~(done | stalled)
+                active, x, value, derivative = active[keep], x[keep], value[keep], derivative[keep]
+                difference = -value / derivative
+                if self.method == "newton_downhill":
+                    difference = self._damp(x, value, difference, tolerance)
+                x = x + difference
+
+                # Newton also stops on a negligible step; the downhill variant only on a small |f|
+                small = np.abs(difference) < tolerance if self.method == "newton" else np.zeros(len(x), dtype=bool)
+                finals[active[small]] = x[small]
+                steps[active[small]] = iteration + 1
+                converged[active[small]] = True
+                lost = ~small & ~np.isfinite(x)
+                steps[active[lost]] = iteration + 1
+                keep = ~(small | lost)
+                active, x = active[keep], x[keep]
+                if not len(active):
+                    break
+        finals[active] = x
+        return finals, steps, converged
+
+    def _damp(self, x: np.ndarray, value: np.ndarray, difference: np.ndarray, tolerance: float) -> np.ndarray:
+        """The downhill rule: halve each step until it decreases |f|, or until it is negligible."""
+        magnitude = np.abs(value)
+        trying = np.flatnonzero(np.isfinite(difference))
+        while len(trying):
+            worse = ((np.abs(self._evaluate(self.function, x[trying] + difference[trying])) >= magnitude[trying])
+                     & (np.abs(difference[trying]) > tolerance))
+            trying = trying[worse]
+            difference[trying] /= 2
+        return difference
+
+    @staticmethod
+    def _evaluate(function: UnaryFunction, x: np.ndarray) -> np.ndarray:
+        return np.broadcast_to(function(x), x.shape)
+
+
+def _classify(
+        finals: np.ndarray,
+        roots: np.ndarray,
+        root_tolerance: float,
+        fixed_roots: bool
+) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """Index of the root each final iterate reached, growing the list of roots unless it is fixed."""
+    indices = np.full(len(finals), -1, dtype=np.int16)
+    while True:
+        unmatched = np.flatnonzero(indices < 0)
+        if len(roots) and len(unmatched):
+            distances = np.abs(finals[unmatched, np.newaxis] - roots[np.newaxis, :])
+            nearest = np.argmin(distances, axis=1)
+            matched = distances[np.arange(len(unmatched)), nearest] <= root_tolerance
+            indices[unmatched[matched]] = nearest[matched]
+            unmatched = unmatched[~matched]
+        if fixed_roots or not len(unmatched):
+            return indices, roots
+        if len(roots) >= np.iinfo(np.int16).max:
+            raise ValueError("Too many distinct roots; pass the roots or a larger root_tolerance.")
+        roots = np.append(roots, finals[unmatched[0]])
@@ -1,6 +1,8 @@
 import dataclasses
 import math
+import typing
 
+from solvers.budget import Budget
 from solvers.monadic.interval import Interval
 from solvers.monadic.monadic_equation_solver import UnaryFunction, MonadicEquationSolver
 from solvers.solution_trace import Step
@@ -15,32 +17,46 @@ class BisectionStep(Step):
 
 
 class BisectionSolver(MonadicEquationSolver):
+    VERSION = 2
+
     def __init__(self, function: UnaryFunction | None = None):
         super().__init__(function)
 
-    def solve(self, interval: Interval, tolerance: float) -> float:
+    def solve(self, interval: Interval, tolerance: float, budget: Budget | None = None) -> float:
+        return self._run_budgeted(lambda: self.iterate(interval, tolerance), False, budget)
+
+    def iterate(self, interval: Interval, tolerance: float) -> typing.Generator[BisectionStep, None, float]:
+        # The interval is checked eagerly, so invalid input raises here rather than on the first step.
         left, right = interval.left, interval.right
 
         if not interval.is_finite():
-            raise ValueError(f"Bisection requires a finite interval: got left={left:%r}, right={right:%r}")
+            raise ValueError(f"Bisection requires a finite interval: got left={left!r}, right={right!r}")
 
         left_function_value, right_function_value = self.function(left), self.function(right)
 
-        self.trace.clear()  # initialize solution trace
+        endpoint_is_root = ((interval.include_left and left_function_value == 0) or
+                            (interval.include_right and right_function_value == 0))
+        if not endpoint_is_root and (left_function_value < 0) == (right_function_value < 0):
+            raise ValueError(f"Function values at interval endpoints must have opposite signs: "
+                             f"f({left:.6g})={left_function_value:.6g}, f({right:.6g})={right_function_value:.6g}")
+
+        return self._bisect(interval, left_function_value, right_function_value, tolerance)
+
+    def _bisect(
+            self,
+            interval: Interval,
+            left_function_value: float,
+            right_function_value: float,
+            tolerance: float
+    ) -> typing.Generator[BisectionStep, None, float]:
+        left, right = interval.left, interval.right
 
         if interval.include_left and left_function_value == 0:
-            self.trace.final_result = left
-            self.trace.has_converged = True
-            return left
+            return self._finish(left, True)
         if interval.include_right and right_function_value == 0:
-            self.trace.final_result = left
-            self.trace.has_converged = True
-            return right
+            return self._finish(right, True)
 
         left_function_value_is_negative: bool = (left_function_value < 0)
-        if left_function_value_is_negative == (right_function_value < 0):
-            raise ValueError(f"Function values at interval endpoints must have opposite signs: "
-                             f"f({left:.6g})={left_function_value:.6g}, f({right:.6g})={right_function_value:.6g}")
 
         iteration = 0
         while right - left > tolerance:
@@ -48,14 +64,10 @@ class BisectionSolver(MonadicEquationSolver):
             middle_function_value: float = self.function(middle)
             middle_function_value_is_negative: bool = (middle_function_value < 0)
 
-            # save step to history
-            step = BisectionStep(iteration, left, right, middle, middle_function_value)
-            self.trace.steps.append(step)
+            yield BisectionStep(iteration, left, right, middle, middle_function_value)
 
             if math.isclose(middle_function_value, 0, abs_tol=tolerance):
-                self.trace.final_result = middle
-                self.trace.has_converged = True
-                return middle
+                return self._finish(middle, True)
             if middle_function_value_is_negative == left_function_value_is_negative:
                 left = middle
                 left_function_value_is_negative = middle_function_value_is_negative
@@ -64,7 +76,4 @@ class BisectionSolver(MonadicEquationSolver):
 
             iteration += 1
 
-        result = (left + right) / 2
-        self.trace.final_result = result
-        self.trace.has_converged = True
-        return result
+        return self._finish((left + right) / 2, True)
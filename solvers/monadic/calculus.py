@@ -1,7 +1,147 @@
+import dataclasses
+import typing
+
+import numpy as np
+
 from solvers.monadic.monadic_equation_solver import UnaryFunction
 
 DEFAULT_STEP_SIZE = 1e-5  # determined by features of double precision floating point numbers
 
+# adaptive differentiation: the largest step as a fraction of the scale of x, the ratio between
+# consecutive steps, the number of steps, and the most Richardson extrapolations of one difference
+MAX_STEP_FRACTION = 0.25
+STEP_RATIO = 4.0
+RICHARDSON_STEPS = 14
+RICHARDSON_ORDER = 4
+# round-off in a difference quotient, in units of epsilon * |f| / h
+ROUNDING_ULPS = 8
+
+
+@dataclasses.dataclass
+class DerivativeEstimate:
+    value: typing.Any
+    # estimated absolute error of value
+    error: typing.Any
+    # the finite-difference step the estimate was extrapolated from
+    step_size: typing.Any
 
-def get_derivative_of(function: UnaryFunction, step_size: float = DEFAULT_STEP_SIZE) -> UnaryFunction:
+
+def get_derivative_of(
+        function: UnaryFunction,
+        step_size: float | None = DEFAULT_STEP_SIZE,
+        vectorized: bool = False
+) -> UnaryFunction:
+    """
+    Central-difference derivative with a fixed ``step_size``, or the adaptive ``differentiate``
+    when ``step_size`` is None.
+    """
+    if step_size is None:
+        return lambda x: differentiate(function, x, vectorized=vectorized).value
     return lambda x: (function(x + step_size) - function(x- step_size)) / (2 * step_size)
+
+
+def differentiate(
+        function: UnaryFunction,
+        x: typing.Any,
+        value: typing.Any = None,
+        side: int = 0,
+        scale: float | None = None,
+        vectorized: bool = False
+) -> DerivativeEstimate:
+    """
+    Adaptive numerical derivative of ``function`` at ``x`` (a float, or an array of points for
+    an elementwise function). Difference quotients are taken over a geometric sequence of steps,
+    from ``MAX_STEP_FRACTION`` of the scale of x (``max(|x|, 1)`` unless ``scale`` is given)
+    down by ``STEP_RATIO``, and extrapolated to step zero by Richardson's method. Of all entries
+    of the extrapolation tableau the one with the smallest error estimate is returned; the
+    estimate combines the change along the tableau with the round-off of its smallest step, so
+    that badly scaled functions get neither truncated nor noisy derivatives.
+
+    ``side`` 0 uses central differences; +1 and -1 use one-sided differences, for functions
+    defined on one side of x only, and take ``value = function(x)`` if it is already known.
+    A ``vectorized`` function is evaluated once on an array holding every point of the stencil,
+    with the stencil of each point of x along a new last axis.
+    """
+    if side not in (-1, 0, 1):
+        raise ValueError(f"side must be -1, 0 or 1, got {side}.")
+    if scale is not None and not scale > 0:
+        raise ValueError(f"scale must be positive, got {scale}.")
+    points = np.asarray(x, dtype=float)[..., np.newaxis]
+    scale = np.maximum(np.abs(points), 1.0) if scale is None else scale
+    ratios = STEP_RATIO ** -np.arange(RICHARDSON_STEPS)
+    steps = MAX_STEP_FRACTION * scale * ratios
+
+    if side == 0:
+        offsets = np.concatenate([steps, -steps], axis=-1)
+    else:
+        offsets = side * steps
+        if value is None:
+            offsets = np.concatenate([offsets, np.zeros_like(points)], axis=-1)
+    stencil = points + offsets
+    # the largest steps may leave the domain of the function; their NaNs (also standing in for
+    # the errors a scalar function raises there) are simply never chosen
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        values = _evaluate(function, stencil, vectorized)
+
+    if side == 0:
+        upper, lower = values[..., :RICHARDSON_STEPS], values[..., RICHARDSON_STEPS:2 * RICHARDSON_STEPS]
+        # (x + h) - (x - h) is what was actually spanned, which is not exactly 2 h in floating point
+        spans = stencil[..., :RICHARDSON_STEPS] - stencil[..., RICHARDSON_STEPS:]
+        magnitude = np.maximum(np.abs(upper), np.abs(lower))
+        # the error of a central difference is a series in h^2
+        power = 2
+    else:
+        center = values[..., RICHARDSON_STEPS:] if value is None else np.asarray(value, dtype=float)[..., np.newaxis]
+        upper, lower = (values[..., :RICHARDSON_STEPS], center) if side > 0 else (center, values[..., :RICHARDSON_STEPS])
+        spans = side * (stencil[..., :RICHARDSON_STEPS] - points)
+        magnitude = np.maximum(np.abs(upper), np.abs(lower))
+        power = 1
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        return _extrapolate((upper - lower) / spans, ROUNDING_ULPS * np.finfo(float).eps * magnitude / spans,
+                            power, steps)
+
+
+def _evaluate(function: UnaryFunction, stencil: np.ndarray, vectorized: bool) -> np.ndarray:
+    if vectorized:
+        return np.broadcast_to(np.asarray(function(stencil), dtype=float), stencil.shape)
+    values = (_value_at(function, point) for point in stencil.flat)
+    return np.fromiter(values, float, stencil.size).reshape(stencil.shape)
+
+
+def _value_at(function: UnaryFunction, point: float) -> float:
+    # scalar functions such as math.log raise outside their domain where NumPy's give NaN
+    try:
+        return function(point)
+    except (ArithmeticError, ValueError):
+        return np.nan
+
+
+def _extrapolate(quotients: np.ndarray, rounding: np.ndarray, power: int, steps: np.ndarray) -> DerivativeEstimate:
+    """
+    Richardson tableau over the last axis of ``quotients``, whose error is a series in powers
+    of ``h^power`` (all of them for one-sided differences, the even ones for central ones).
+    """
+    best = np.full(quotients.shape[:-1], np.nan)
+    best_error = np.full(quotients.shape[:-1], np.inf)
+    best_step = np.full(quotients.shape[:-1], np.nan)
+    column = quotients
+    for order in range(1, RICHARDSON_ORDER + 1):
+        factor = STEP_RATIO ** (power * order) - 1
+        extrapolated = column[..., 1:] + (column[..., 1:] - column[..., :-1]) / factor
+        # the entry against its neighbours in the previous column, plus the amplified round-off
+        error = np.maximum(np.abs(extrapolated - column[..., 1:]), np.abs(extrapolated - column[..., :-1]))
+        error = error + (2 ** order) * rounding[..., order:]
+        error = np.where(np.isfinite(error) & np.isfinite(extrapolated), error, np.inf)
+        row = np.argmin(error, axis=-1)[..., np.newaxis]
+        candidate_error = np.take_along_axis(error, row, axis=-1)[..., 0]
+        better = candidate_error < best_error
+        best = np.where(better, np.take_along_axis(extrapolated, row, axis=-1)[..., 0], best)
+        best_error = np.where(better, candidate_error, best_error)
+        best_step = np.where(better, np.take_along_axis(np.broadcast_to(steps, quotients.shape)[..., order:],
+                                                        row, axis=-1)[..., 0], best_step)
+        column = extrapolated
+        if column.shape[-1] < 2:
+            break
+    if best.ndim == 0:
+        return DerivativeEstimate(float(best), float(best_error), float(best_step))
+    return DerivativeEstimate(best, best_error, best_step)
@@ -0,0 +1,219 @@
+"""
+Natural parameter continuation for equations ``f(x, p) = 0`` with a parameter ``p``.
+
+``ContinuationSolver`` walks a grid of parameter values and follows every branch of roots
+from one value to the next: a secant predictor extrapolates the last two roots of the
+branch, and Newton's method in x corrects the prediction. When the corrector fails the
+step is halved and retried, and after easy steps it grows again, never past the next grid
+point. All branches march together, so a function accepting NumPy arrays is evaluated once
+per iteration for all of them.
+"""
+
+import dataclasses
+import typing
+
+import numpy as np
+
+from solvers.budget import Budget, BudgetMeter
+from solvers.monadic.calculus import DEFAULT_STEP_SIZE
+from solvers.monadic.monadic_equation_solver import MonadicEquationSolver
+from solvers.solution_trace import Step
+
+ParameterFunction: typing.TypeAlias = typing.Callable[[typing.Any, float], typing.Any]
+
+
+@dataclasses.dataclass
+class ContinuationStep(Step):
+    parameter: float
+    roots: np.ndarray
+    step_length: float
+    corrector_iterations: int
+    accepted: bool
+
+
+class ContinuationSolver(MonadicEquationSolver):
+    DEFAULT_MAX_ITERATIONS = 128
+    DEFAULT_MAX_CORRECTOR_ITERATIONS = 8
+    # Epsilon for derivative to prevent division by zero
+    DERIVATIVE_TOLERANCE = 1e-15
+    # the step grows again after a correction taking at most this many iterations
+    EASY_CORRECTOR_ITERATIONS = 3
+    # steps shrinking below this fraction of the smallest grid spacing give up
+    MIN_STEP_FRACTION = 2 ** -12
+    # a corrector whose Newton steps shrink by less than this is too far from the branch and may
+    # jump to another one; the continuation step is retried shorter instead
+    MAX_CONTRACTION = 0.5
+
+    def __init__(self, function: ParameterFunction | None = None, vectorized: bool = False):
+        """
+        ``function(x, p)`` is evaluated with a NumPy array holding x of every branch when it is
+        ``vectorized``, and once per branch with a float otherwise.
+        """
+        super().__init__(function)
+        self.vectorized = vectorized
+        # the roots of the sweep in progress, what a sweep stopped by its budget returns
+        self._partial_results: np.ndarray | None = None
+
+    def cache_key(self) -> typing.Dict[str, typing.Any]:
+        return {"vectorized": self.vectorized}
+
+    def solve(
+            self,
+            guesses: typing.Any,
+            parameters: typing.Sequence[float],
+            tolerance: float = 1e-12,
+            raise_exception_if_no_convergence: bool = False,
+            max_iterations: int = DEFAULT_MAX_ITERATIONS,
+            max_corrector_iterations: int = DEFAULT_MAX_CORRECTOR_ITERATIONS,
+            step_size: float = DEFAULT_STEP_SIZE,
+            derivative: ParameterFunction | None = None,
+            budget: Budget | None = None
+    ) -> np.ndarray:
+        """A sweep stopped by its ``budget`` returns the roots of the grid points it reached, NaN elsewhere."""
+        return self._run_budgeted(lambda: self.iterate(guesses, parameters, tolerance, max_iterations,
+                                                       max_corrector_iterations, step_size, derivative),
+                                  raise_exception_if_no_convergence, budget)
+
+    def iterate(
+            self,
+            guesses: typing.Any,
+            parameters: typing.Sequence[float],
+            tolerance: float = 1e-12,
+            max_iterations: int = DEFAULT_MAX_ITERATIONS,
+            max_corrector_iterations: int = DEFAULT_MAX_CORRECTOR_ITERATIONS,
+            step_size: float = DEFAULT_STEP_SIZE,
+            derivative: ParameterFunction | None = None
+    ) -> typing.Generator[ContinuationStep, None, np.ndarray]:
+        """
+        Follow the roots starting near ``guesses`` (one per branch, or a single float) along
+        the strictly monotonic ``parameters``. ``max_iterations`` bounds the Newton iterations
+        of the cold start at the first parameter and ``max_corrector_iterations`` those of every
+        continuation step; ``derivative(x, p)`` is the partial derivative in x.
+
+        The result has a row of roots per parameter value (a single root for a float guess);
+        values the sweep did not reach are NaN.
+        """
+        parameters = np.asarray(parameters, dtype=float)
+        if parameters.ndim != 1 or len(parameters) == 0:
+            raise ValueError(f"parameters must be a non-empty sequence, got shape {parameters.shape}.")
+        spacing = np.diff(parameters)
+        if not (np.all(spacing > 0) or np.all(spacing < 0)):
+            raise ValueError("parameters must be strictly increasing or strictly decreasing.")
+        scalar = np.ndim(guesses) == 0
+        roots = np.atleast_1d(np.asarray(guesses, dtype=float)).copy()
+        if roots.ndim != 1:
+            raise ValueError(f"guesses must be a float or a sequence of floats, got shape {roots.shape}.")
+        if max_corrector_iterations < 1:
+            raise ValueError(f"max_corrector_iterations must be positive, got {max_corrector_iterations}.")
+
+        # Everything above is checked eagerly, so invalid input raises here rather than on the first step.
+        return self._sweep(roots, parameters, scalar, tolerance, max_iterations, max_corrector_iterations,
+                           self._partial_derivative(step_size) if derivative is None else derivative)
+
+    def _sweep(
+            self,
+            roots: np.ndarray,
+            parameters: np.ndarray,
+            scalar: bool,
+            tolerance: float,
+            max_iterations: int,
+            max_corrector_iterations: int,
+            derivative: ParameterFunction
+    ) -> typing.Generator[ContinuationStep, None, np.ndarray]:
+        results = np.full((len(parameters), len(roots)), np.nan)
+        self._partial_results = results[:, 0] if scalar else results
+
+        def finish(has_converged: bool) -> np.ndarray:
+            return self._finish(self._partial_results, has_converged)
+
+        # the cold start has no branch to stay on yet, so its slow first steps are no jump
+        roots, iterations, converged = self._correct(roots, parameters[0], tolerance, max_iterations, derivative,
+                                                     guard_branch=False)
+        yield ContinuationStep(0, parameters[0], roots.copy(), 0.0, iterations, converged)
+        if not converged:
+            return finish(False)
+        results[0] = roots
+
+        min_step_length = self.MIN_STEP_FRACTION * np.abs(np.diff(parameters)).min(initial=np.inf)
+        parameter, previous = parameters[0], None
+        step_length = abs(parameters[1] - parameters[0]) if len(parameters) > 1 else 0.0
+        iteration, grid_index = 1, 1
+        while grid_index < len(parameters):
+            target = parameters[grid_index]
+            step = np.copysign(min(step_length, abs(target - parameter)), target - parameter)
+            next_parameter = target if abs(step) == abs(target - parameter) else parameter + step
+            predicted = roots
+            if previous is not None:
+                # secant predictor through the last two points of every branch
+                previous_parameter, previous_roots = previous
+                predicted = roots + (roots - previous_roots) * (step / (parameter - previous_parameter))
+            corrected, iterations, converged = self._correct(predicted, next_parameter, tolerance,
+                                                             max_corrector_iterations, derivative)
+            yield ContinuationStep(iteration, next_parameter, corrected.copy(), abs(step), iterations, converged)
+            iteration += 1
+
+            if not converged:
+                step_length = abs(step) / 2
+                if step_length < min_step_length:
+                    return finish(False)
+                continue
+            previous, parameter, roots = (parameter, roots), next_parameter, corrected
+            if next_parameter == target:
+                results[grid_index] = roots
+                grid_index += 1
+            if iterations <= self.EASY_CORRECTOR_ITERATIONS:
+                step_length = 2 * abs(step)
+
+        return finish(True)
+
+    def _best_so_far(self, meter: BudgetMeter) -> np.ndarray | None:
+        return self._partial_results
+
+    def _evaluate(self, function: ParameterFunction, x: np.ndarray, parameter: float) -> np.ndarray:
+        if self.vectorized:
+            return np.broadcast_to(np.asarray(function(x, parameter), dtype=float), x.shape)
+        return np.fromiter((function(value, parameter) for value in x), float, len(x))
+
+    def _partial_derivative(self, step_size: float) -> ParameterFunction:
+        # the central difference of solvers.monadic.calculus, in x only
+        function = self.function
+        return lambda x, parameter: (function(x + step_size, parameter)
+                                     - function(x - step_size, parameter)) / (2 * step_size)
+
+    def _correct(
+            self,
+            guesses: np.ndarray,
+            parameter: float,
+            tolerance: float,
+            max_iterations: int,
+            derivative: ParameterFunction,
+            guard_branch: bool = True
+    ) -> typing.Tuple[np.ndarray, int, bool]:
+        """
+        Newton's method in x on all branches at once; converged branches stop moving. With
+        ``guard_branch``, a step that does not contract by ``MAX_CONTRACTION`` stops the corrector.
+        Returns the corrected x, the number of Newton steps taken and whether all branches converged.
+        """
+        x = guesses.copy()
+        active = np.ones(len(x), dtype=bool)
+        previous_difference = np.full(len(x), np.inf)
+        for iteration in range(max_iterations):
+            function_value = self._evaluate(self.function, x, parameter)
+            active &= ~(np.abs(function_value) <= tolerance)
+            if not active.any():
+                return x, iteration, True
+            derivative_value = self._evaluate(derivative, x, parameter)
+            if np.any(np.abs(derivative_value[active]) <= self.DERIVATIVE_TOLERANCE) \
+                    or not np.all(np.isfinite(function_value[active])):
+                return x, iteration, False
+
+            difference = np.where(active, -function_value / np.where(active, derivative_value, 1), 0)
+            if guard_branch and np.any(np.abs(difference) > self.MAX_CONTRACTION * previous_difference):
+                return x, iteration, False
+            previous_difference = np.abs(difference)
+            x += difference
+            active &= ~(np.abs(difference) < tolerance)
+            if not active.any():
+                return x, iteration + 1, True
+
+        return x, max_iterations, False
@@ -0,0 +1,374 @@
+import ast
+import math
+import typing
+
+import numpy as np
+
+from solvers.monadic.monadic_equation_solver import UnaryFunction
+
+DEFAULT_VARIABLE = "x"
+
+# canonical name -> (scalar implementation, vectorized implementation)
+FUNCTIONS: typing.Dict[str, typing.Tuple[typing.Callable, typing.Callable]] = {
+    "sin": (math.sin, np.sin),
+    "cos": (math.cos, np.cos),
+    "tan": (math.tan, np.tan),
+    "asin": (math.asin, np.arcsin),
+    "acos": (math.acos, np.arccos),
+    "atan": (math.atan, np.arctan),
+    "sinh": (math.sinh, np.sinh),
+    "cosh": (math.cosh, np.cosh),
+    "tanh": (math.tanh, np.tanh),
+    "asinh": (math.asinh, np.arcsinh),
+    "acosh": (math.acosh, np.arccosh),
+    "atanh": (math.atanh, np.arctanh),
+    "exp": (math.exp, np.exp),
+    "expm1": (math.expm1, np.expm1),
+    "log": (math.log, np.log),
+    "log2": (math.log2, np.log2),
+    "log10": (math.log10, np.log10),
+    "log1p": (math.log1p, np.log1p),
+    "sqrt": (math.sqrt, np.sqrt),
+    "cbrt": (math.cbrt, np.cbrt),
+    "abs": (abs, np.abs),
+    "floor": (math.floor, np.floor),
+    "ceil": (math.ceil, np.ceil),
+    "hypot": (math.hypot, np.hypot),
+    "atan2": (math.atan2, np.arctan2),
+    "pow": (math.pow, np.power),
+}
+
+FUNCTION_ARITIES: typing.Dict[str, int] = {name: 1 for name in FUNCTIONS}
+FUNCTION_ARITIES.update(hypot=2, atan2=2, pow=2)
+
+# spellings accepted in user input that map onto a canonical function name
+ALIASES: typing.Dict[str, str] = {
+    "arcsin": "asin", "arccos": "acos", "arctan": "atan",
+    "arcsinh": "asinh", "arccosh": "acosh", "arctanh": "atanh",
+    "fabs": "abs", "absolute": "abs", "arctan2": "atan2", "power": "pow",
+}
+
+CONSTANTS: typing.Dict[str, float] = {"pi": math.pi, "e": math.e, "tau": math.tau}
+
+MODULE_NAMES = ("math", "np", "numpy")
+
+
+class ExpressionError(ValueError):
+    pass
+
+
+def _constant_value(node: ast.expr) -> float | None:
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub) and isinstance(node.operand, ast.Constant):
+        return -node.operand.value
+    return None
+
+
+def _is_constant(node: ast.expr, value: float | None = None) -> bool:
+    constant = _constant_value(node)
+    if constant is None:
+        return False
+    return value is None or constant == value
+
+
+def _constant(value: float) -> ast.expr:
+    if value < 0:
+        return ast.UnaryOp(ast.USub(), ast.Constant(-value))
+    return ast.Constant(value)
+
+
+def _call(name: str, *args: ast.expr) -> ast.expr:
+    return ast.Call(ast.Name(name, ast.Load()), list(args), [])
+
+
+def _add(left: ast.expr, right: ast.expr) -> ast.expr:
+    if _is_constant(left, 0):
+        return right
+    if _is_constant(right, 0):
+        return left
+    if _is_constant(left) and _is_constant(right):
+        return _constant(_constant_value(left) + _constant_value(right))
+    return ast.BinOp(left, ast.Add(), right)
+
+
+def _sub(left: ast.expr, right: ast.expr) -> ast.expr:
+    if _is_constant(right, 0):
+        return left
+    if _is_constant(left, 0):
+        return _neg(right)
+    if _is_constant(left) and _is_constant(right):
+        return _constant(_constant_value(left) - _constant_value(right))
+    return ast.BinOp(left, ast.Sub(), right)
+
+
+def _mul(left: ast.expr, right: ast.expr) -> ast.expr:
+    if _is_constant(left, 0) or _is_constant(right, 0):
+        return ast.Constant(0)
+    if _is_constant(left, 1):
+        return right
+    if _is_constant(right, 1):
+        return left
+    if _is_constant(left, -1):
+        return _neg(right)
+    if _is_constant(right, -1):
+        return _neg(left)
+    if _is_constant(left) and _is_constant(right):
+        return _constant(_constant_value(left) * _constant_value(right))
+    return ast.BinOp(left, ast.Mult(), right)
+
+
+def _div(left: ast.expr, right: ast.expr) -> ast.expr:
+    if _is_constant(left, 0):
+        return ast.Constant(0)
+    if _is_constant(right, 1):
+        return left
+    return ast.BinOp(left, ast.Div(), right)
+
+
+def _pow(base: ast.expr, exponent: ast.expr) -> ast.expr:
+    if _is_constant(exponent, 0):
+        return ast.Constant(1)
+    if _is_constant(exponent, 1):
+        return base
+    if _is_constant(base, 1):
+        return ast.Constant(1)
+    return ast.BinOp(base, ast.Pow(), exponent)
+
+
+def _neg(operand: ast.expr) -> ast.expr:
+    if _is_constant(operand):
+        return _constant(-_constant_value(operand))
+    if isinstance(operand, ast.UnaryOp) and isinstance(operand.op, ast.USub):
+        return operand.operand
+    return ast.UnaryOp(ast.USub(), operand)
+
+
+class _Normalizer(ast.NodeTransformer):
+    """
+    Validates a parsed formula against the whitelist and rewrites every function
+    reference (``math.sin``, ``np.arcsin``, ``sqrt``...) to its bare canonical name.
+    """
+
+    def __init__(self, variable: str):
+        self.variable = variable
+
+    def generic_visit(self, node: ast.AST) -> ast.AST:
+        raise ExpressionError(f"Unsupported syntax in expression: {type(node).__name__}")
+
+    def visit_Expression(self, node: ast.Expression) -> ast.expr:
+        return self.visit(node.body)
+
+    def visit_Constant(self, node: ast.Constant) -> ast.expr:
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ExpressionError(f"Unsupported constant in expression: {node.value!r}")
+        return node
+
+    def visit_Name(self, node: ast.Name) -> ast.expr:
+        if node.id == self.variable or node.id in CONSTANTS:
+            return ast.Name(node.id, ast.Load())
+        raise ExpressionError(f"Unknown name in expression: {node.id!r}")
+
+    def visit_Attribute(self, node: ast.Attribute) -> ast.expr:
+        if isinstance(node.value, ast.Name) and node.value.id in MODULE_NAMES and node.attr in CONSTANTS:
+            return ast.Name(node.attr, ast.Load())
+        raise ExpressionError(f"Unknown attribute in expression: {ast.unparse(node)!r}")
+
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> ast.expr:
+        if not isinstance(node.op, (ast.UAdd, ast.USub)):
+            raise ExpressionError(f"Unsupported operator in expression: {type(node.op).__name__}")
+        operand = self.visit(node.operand)
+        return operand if isinstance(node.op, ast.UAdd) else ast.UnaryOp(ast.USub(), operand)
+
+    def visit_BinOp(self, node: ast.BinOp) -> ast.expr:
+        if isinstance(node.op, ast.BitXor):
+            raise ExpressionError("'^' is not exponentiation, use '**' instead.")
+        if not isinstance(node.op, (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow)):
+            raise ExpressionError(f"Unsupported operator in expression: {type(node.op).__name__}")
+        return ast.BinOp(self.visit(node.left), node.op, self.visit(node.right))
+
+    def visit_Call(self, node: ast.Call) -> ast.expr:
+        if isinstance(node.func, ast.Name):
+            name = node.func.id
+        elif (isinstance(node.func, ast.Attribute) and isinstance(node.func.value, ast.Name)
+              and node.func.value.id in MODULE_NAMES):
+            name = node.func.attr
+        else:
+            raise ExpressionError(f"Unsupported function call in expression: {ast.unparse(node.func)!r}")
+        name = ALIASES.get(name, name)
+        if name not in FUNCTIONS:
+            raise ExpressionError(f"Function {name!r} is not allowed in expressions.")
+        if node.keywords or len(node.args) != FUNCTION_ARITIES[name]:
+            raise ExpressionError(f"Function {name!r} takes exactly {FUNCTION_ARITIES[name]} positional argument(s).")
+        return _call(name, *(self.visit(argument) for argument in node.args))
+
+
+class _Differentiator:
+    def __init__(self, variable: str):
+        self.variable = variable
+
+    def depends_on_variable(self, node: ast.expr) -> bool:
+        return any(isinstance(child, ast.Name) and child.id == self.variable for child in ast.walk(node))
+
+    def differentiate(self, node: ast.expr) -> ast.expr:
+        if not self.depends_on_variable(node):
+            return ast.Constant(0)
+        if isinstance(node, ast.Name):
+            return ast.Constant(1)
+        if isinstance(node, ast.UnaryOp):
+            return _neg(self.differentiate(node.operand))
+        if isinstance(node, ast.BinOp):
+            return self._differentiate_binary(node)
+        if isinstance(node, ast.Call):
+            return self._differentiate_call(node.func.id, node.args)
+        raise ExpressionError(f"Cannot differentiate {ast.unparse(node)!r}")
+
+    def _differentiate_binary(self, node: ast.BinOp) -> ast.expr:
+        left, right = node.left, node.right
+        if isinstance(node.op, ast.Add):
+            return _add(self.differentiate(left), self.differentiate(right))
+        if isinstance(node.op, ast.Sub):
+            return _sub(self.differentiate(left), self.differentiate(right))
+        if isinstance(node.op, ast.Mult):
+            return _add(_mul(self.differentiate(left), right), _mul(left, self.differentiate(right)))
+        if isinstance(node.op, ast.Div):
+            if not self.depends_on_variable(right):
+                return _div(self.differentiate(left), right)
+            numerator = _sub(_mul(self.differentiate(left), right), _mul(left, self.differentiate(right)))
+            return _div(numerator, _pow(right, ast.Constant(2)))
+        return self._differentiate_power(left, right)
+
+    def _differentiate_power(self, base: ast.expr, exponent: ast.expr) -> ast.expr:
+        if not self.depends_on_variable(exponent):
+            # d(u^c) = c * u^(c - 1) * u'
+            reduced = _constant(_constant_value(exponent) - 1) if _is_constant(exponent) else _sub(exponent, ast.Constant(1))
+            return _mul(_mul(exponent, _pow(base, reduced)), self.differentiate(base))
+        if not self.depends_on_variable(base):
+            # d(c^v) = c^v * ln(c) * v'
+            return _mul(_mul(_pow(base, exponent), _call("log", base)), self.differentiate(exponent))
+        # d(u^v) = u^v * (v' * ln(u) + v * u' / u)
+        return _mul(_pow(base, exponent),
+                    _add(_mul(self.differentiate(exponent), _call("log", base)),
+                         _div(_mul(exponent, self.differentiate(base)), base)))
+
+    def _differentiate_call(self, name: str, arguments: typing.List[ast.expr]) -> ast.expr:
+        if name == "pow":
+            return self._differentiate_power(*arguments)
+        if name == "hypot":
+            a, b = arguments
+            numerator = _add(_mul(a, self.differentiate(a)), _mul(b, self.differentiate(b)))
+            return _div(numerator, _call("hypot", a, b))
+        if name == "atan2":
+            y, x = arguments
+            numerator = _sub(_mul(x, self.differentiate(y)), _mul(y, self.differentiate(x)))
+            return _div(numerator, _add(_pow(x, ast.Constant(2)), _pow(y, ast.Constant(2))))
+
+        (u,) = arguments
+        du = self.differentiate(u)
+        one, two = ast.Constant(1), ast.Constant(2)
+        if name in ("floor", "ceil"):
+            return ast.Constant(0)
+        if name == "sin":
+            outer = _call("cos", u)
+        elif name == "cos":
+            outer = _neg(_call("sin", u))
+        elif name == "tan":
+            outer = _div(one, _pow(_call("cos", u), two))
+        elif name == "asin":
+            outer = _div(one, _call("sqrt", _sub(one, _pow(u, two))))
+        elif name == "acos":
+            outer = _neg(_div(one, _call("sqrt", _sub(one, _pow(u, two)))))
+        elif name == "atan":
+            outer = _div(one, _add(one, _pow(u, two)))
+        elif name == "sinh":
+            outer = _call("cosh", u)
+        elif name == "cosh":
+            outer = _call("sinh", u)
+        elif name == "tanh":
+            outer = _div(one, _pow(_call("cosh", u), two))
+        elif name == "asinh":
+            outer = _div(one, _call("sqrt", _add(_pow(u, two), one)))
+        elif name == "acosh":
+            outer = _div(one, _call("sqrt", _sub(_pow(u, two), one)))
+        elif name == "atanh":
+            outer = _div(one, _sub(one, _pow(u, two)))
+        elif name in ("exp", "expm1"):
+            outer = _call("exp", u)
+        elif name == "log":
+            outer = _div(one, u)
+        elif name == "log2":
+            outer = _div(one, _mul(u, _call("log", two)))
+        elif name == "log10":
+            outer = _div(one, _mul(u, _call("log", ast.Constant(10))))
+        elif name == "log1p":
+            outer = _div(one, _add(one, u))
+        elif name == "sqrt":
+            outer = _div(one, _mul(two, _call("sqrt", u)))
+        elif name == "cbrt":
+            outer = _div(one, _mul(ast.Constant(3), _pow(_call("cbrt", u), two)))
+        elif name == "abs":
+            outer = _div(u, _call("abs", u))
+        else:
+            raise ExpressionError(f"Cannot differentiate function {name!r}")
+        return _mul(outer, du)
+
+
+class Expression:
+    """
+    A whitelisted arithmetic formula in one variable, parsed once and compiled to both
+    a scalar callable (backed by ``math``) and a vectorized callable (backed by NumPy).
+
+    Only numbers, the variable, the constants ``pi``, ``e`` and ``tau``, the operators
+    ``+ - * / **`` and the functions in ``FUNCTIONS`` (bare, or as ``math.``/``np.``
+    attributes) are accepted, so evaluating an expression never runs arbitrary code.
+    """
+
+    def __init__(self, source: str, variable: str = DEFAULT_VARIABLE):
+        try:
+            parsed = ast.parse(source.strip(), mode="eval")
+        except SyntaxError as e:
+            raise ExpressionError(f"Invalid expression {source!r}: {e.msg}") from None
+        self.variable = variable
+        self.tree: ast.expr = ast.fix_missing_locations(_Normalizer(variable).visit(parsed))
+        self.scalar: UnaryFunction = self._compile({name: scalar for name, (scalar, _) in FUNCTIONS.items()})
+        vectorized = self._compile({name: vectorized for name, (_, vectorized) in FUNCTIONS.items()})
+        self.is_constant = not _Differentiator(variable).depends_on_variable(self.tree)
+        if not self.is_constant:
+            self.vectorized: typing.Callable[[np.ndarray], np.ndarray] = vectorized
+        else:
+            # constant formulas would otherwise collapse to a scalar instead of matching the input shape
+            self.vectorized = lambda x: np.full(np.shape(x), vectorized(x), dtype=float)
+
+    @classmethod
+    def _from_tree(cls, tree: ast.expr, variable: str) -> "Expression":
+        return cls(ast.unparse(tree), variable)
+
+    def _compile(self, functions: typing.Dict[str, typing.Callable]) -> typing.Callable:
+        arguments = ast.arguments(posonlyargs=[], args=[ast.arg(self.variable)], kwonlyargs=[], kw_defaults=[],
+                                  defaults=[])
+        code = compile(ast.fix_missing_locations(ast.Expression(ast.Lambda(arguments, self.tree))),
+                       "<expression>", "eval")
+        return eval(code, {"__builtins__": {}, **functions, **CONSTANTS})
+
+    def derivative(self) -> "Expression":
+        differentiator = _Differentiator(self.variable)
+        return Expression._from_tree(differentiator.differentiate(self.tree), self.variable)
+
+    def __call__(self, x: float) -> float:
+        return self.scalar(x)
+
+    def __str__(self) -> str:
+        return ast.unparse(self.tree)
+
+    def __repr__(self) -> str:
+        return f"Expression({str(self)!r})"
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Expression) and (self.variable, str(self)) == (other.variable, str(other))
+
+    def __hash__(self) -> int:
+        return hash((self.variable, str(self)))
+
+    def __reduce__(self):
+        # compiled lambdas cannot be pickled or deep-copied, so rebuild from the normalized source
+        return Expression, (str(self), self.variable)
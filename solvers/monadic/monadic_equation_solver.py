@@ -1,18 +1,89 @@
 import typing
 
-from solvers.solution_trace import SolutionTrace
+from solvers.budget import Budget, BudgetExhausted, BudgetMeter
+from solvers.solution_trace import SolutionTrace, Step
 
 UnaryFunction: typing.TypeAlias = typing.Callable[[float], float]
 
 
 class MonadicEquationSolver:
+    # Bump in a subclass whenever a change alters its results or trace; invalidates cached solutions
+    VERSION = 1
+    # the meter of the budgeted solve in progress, if any
+    _meter: BudgetMeter | None = None
+
     def __init__(self, func: UnaryFunction | None = None):
         self.function: UnaryFunction = func
         self.trace = SolutionTrace()
 
+    def cache_key(self) -> typing.Dict[str, typing.Any]:
+        """
+        The configuration besides ``function`` that the results depend on, e.g. constructor
+        arguments; part of the fingerprint of ``solvers.cache``. Override it in every solver
+        that has such state.
+        """
+        return {}
+
+    def iterate(self, *args, **kwargs) -> typing.Generator[Step, None, typing.Any]:
+        """
+        Yield the steps of the method lazily. Once the generator is exhausted, the outcome is
+        in ``trace.final_result`` and ``trace.has_converged`` (and is the generator's return
+        value); the steps themselves are not recorded, so that consumers can stop early, stream
+        them elsewhere or interleave several solvers without storing a trace.
+        """
+        raise NotImplementedError("Subclasses must implement the iterate method.")
+
+    def _finish(self, result: typing.Any, has_converged: bool) -> typing.Any:
+        self.trace.final_result = result
+        self.trace.has_converged = has_converged
+        return result
+
+    def _run(self, steps: typing.Iterator[Step], raise_exception_if_no_convergence: bool) -> typing.Any:
+        self.trace.clear()
+        for step in steps:
+            self.trace.steps.append(step)
+        if raise_exception_if_no_convergence and not self.trace.has_converged:
+            raise MonadicEquationSolverNotConvergedException(self)
+        return self.trace.final_result
+
+    def _run_budgeted(
+            self,
+            start: typing.Callable[[], typing.Iterator[Step]],
+            raise_exception_if_no_convergence: bool,
+            budget: Budget | None
+    ) -> typing.Any:
+        """
+        ``_run(start(), ...)`` with ``self.function`` metered by ``budget``. ``start`` creates
+        the steps only once the meter is in place, as ``iterate`` may already evaluate the
+        function. When the budget runs out, the result is ``_best_so_far``.
+        """
+        if budget is None:
+            return self._run(start(), raise_exception_if_no_convergence)
+        self._meter = meter = budget.start()
+        function, self.function = self.function, self._metered_function(meter)
+        self.trace.clear()
+        try:
+            return self._run(start(), raise_exception_if_no_convergence)
+        except BudgetExhausted:
+            self._finish(self._best_so_far(meter), False)
+            self.trace.budget_exhausted = True
+            if raise_exception_if_no_convergence:
+                raise MonadicEquationSolverNotConvergedException(self)
+            return self.trace.final_result
+        finally:
+            self.function = function
+            self._meter = None
+
+    def _metered_function(self, meter: BudgetMeter) -> typing.Any:
+        """``self.function`` as seen during a budgeted solve."""
+        return meter.wrap(self.function)
+
+    def _best_so_far(self, meter: BudgetMeter) -> typing.Any:
+        """The result of a solve stopped by its budget: by default the point of smallest |f|."""
+        return meter.best_x
+
 
 class MonadicEquationSolverNotConvergedException(Exception):
     def __init__(self, solver: MonadicEquationSolver):
-        super().__init__(
-            f"Method {solver.__class__.__name__} did not converge after {len(solver.trace.steps)} iterations."
-        )
+        reason = "exhausted its budget" if solver.trace.budget_exhausted else "did not converge"
+        super().__init__(f"Method {solver.__class__.__name__} {reason} after {len(solver.trace.steps)} iterations.")
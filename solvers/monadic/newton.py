@@ -1,9 +1,10 @@
 import dataclasses
 import math
+import typing
 
+from solvers.budget import Budget
 from solvers.monadic.calculus import DEFAULT_STEP_SIZE
-from solvers.monadic.monadic_equation_solver import UnaryFunction, MonadicEquationSolver, \
-    MonadicEquationSolverNotConvergedException
+from solvers.monadic.monadic_equation_solver import UnaryFunction, MonadicEquationSolver
 from solvers.solution_trace import Step
 import solvers.monadic.calculus as calculus
 
@@ -29,44 +30,47 @@ class NewtonSolver(MonadicEquationSolver):
             tolerance: float,
             raise_exception_if_no_convergence: bool = False,
             max_iterations: int = DEFAULT_MAX_ITERATIONS,
-            step_size: float = DEFAULT_STEP_SIZE
+            step_size: float | None = DEFAULT_STEP_SIZE,
+            derivative: UnaryFunction | None = None,
+            budget: Budget | None = None
     ):
-        self.trace.clear()
-        derivative = calculus.get_derivative_of(self.function, step_size)
+        return self._run_budgeted(lambda: self.iterate(guess, tolerance, max_iterations, step_size, derivative),
+                                  raise_exception_if_no_convergence, budget)
+
+    def iterate(
+            self,
+            guess: float,
+            tolerance: float,
+            max_iterations: int = DEFAULT_MAX_ITERATIONS,
+            step_size: float | None = DEFAULT_STEP_SIZE,
+            derivative: UnaryFunction | None = None
+    ) -> typing.Generator[NewtonStep, None, float]:
+        if derivative is None:
+            derivative = calculus.get_derivative_of(self.function, step_size)
 
         for iteration in range(max_iterations):
             function_value = self.function(guess)
             derivative_value = derivative(guess)
 
             if math.isclose(function_value, 0, abs_tol=tolerance):
-                self.trace.final_result = guess
-                self.trace.has_converged = True
-                return guess
+                return self._finish(guess, True)
 
             # Safety Check: Avoid Division by Zero
             if math.isclose(derivative_value, 0, abs_tol=self.DERIVATIVE_TOLERANCE):
                 break
 
-            step = NewtonStep(
+            yield NewtonStep(
                 iteration=iteration,
                 guess=guess,
                 function_value=function_value,
                 derivative_value=derivative_value,
             )
-            self.trace.steps.append(step)
 
             difference = -function_value / derivative_value
             new_guess = guess + difference
             if abs(difference) < tolerance:
-                self.trace.final_result = new_guess
-                self.trace.has_converged = True
-                return new_guess
+                return self._finish(new_guess, True)
 
             guess = new_guess
 
-        self.trace.final_result = guess
-        self.trace.has_converged = False
-        if raise_exception_if_no_convergence:
-            raise MonadicEquationSolverNotConvergedException(self)
-
-        return guess
+        return self._finish(guess, False)
@@ -1,11 +1,12 @@
 import dataclasses
 import math
+import typing
 
+from solvers.budget import Budget
 from solvers.monadic import calculus
 from solvers.monadic.calculus import DEFAULT_STEP_SIZE
-from solvers.solution_trace import Step, SolutionTrace
-from solvers.monadic.monadic_equation_solver import UnaryFunction, MonadicEquationSolver, \
-    MonadicEquationSolverNotConvergedException
+from solvers.solution_trace import Step
+from solvers.monadic.monadic_equation_solver import UnaryFunction, MonadicEquationSolver
 
 
 @dataclasses.dataclass
@@ -28,16 +29,28 @@ class NewtonDownhillSolver(MonadicEquationSolver):
             tolerance: float,
             raise_exception_if_no_convergence: bool = False,
             max_iterations: int = DEFAULT_MAX_ITERATIONS,
-            step_size: float = DEFAULT_STEP_SIZE
+            step_size: float | None = DEFAULT_STEP_SIZE,
+            derivative: UnaryFunction | None = None,
+            budget: Budget | None = None
     ) -> float:
-        derivative = calculus.get_derivative_of(self.function, step_size)
+        return self._run_budgeted(lambda: self.iterate(guess, tolerance, max_iterations, step_size, derivative),
+                                  raise_exception_if_no_convergence, budget)
+
+    def iterate(
+            self,
+            guess: float,
+            tolerance: float,
+            max_iterations: int = DEFAULT_MAX_ITERATIONS,
+            step_size: float | None = DEFAULT_STEP_SIZE,
+            derivative: UnaryFunction | None = None
+    ) -> typing.Generator[NewtonDownhillStep, None, float]:
+        if derivative is None:
+            derivative = calculus.get_derivative_of(self.function, step_size)
         for iteration in range(max_iterations):
             x = guess
             x_function_value = self.function(x)
             if math.isclose(x_function_value, 0, abs_tol=tolerance):
-                self.trace.final_result = x
-                self.trace.has_converged = True
-                return x
+                return self._finish(x, True)
             x_derivative_value = derivative(x)
             damping_factor_denominator = 1
             while (abs(self.function(x - x_function_value / (damping_factor_denominator * x_derivative_value))) >=
@@ -45,12 +58,7 @@ class NewtonDownhillSolver(MonadicEquationSolver):
                    math.isclose(x_function_value / (damping_factor_denominator * x_derivative_value), 0,
                                 abs_tol=tolerance)):
                 damping_factor_denominator <<= 1
-            step = NewtonDownhillStep(iteration, x, x_function_value, x_derivative_value, damping_factor_denominator)
-            self.trace.steps.append(step)
+            yield NewtonDownhillStep(iteration, x, x_function_value, x_derivative_value, damping_factor_denominator)
             guess = x - x_function_value / (damping_factor_denominator * x_derivative_value)
 
-        self.trace.final_result = guess
-        self.trace.has_converged = False
-        if raise_exception_if_no_convergence:
-            raise MonadicEquationSolverNotConvergedException(self)
-        return guess
+        return self._finish(guess, False)
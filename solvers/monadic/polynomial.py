@@ -0,0 +1,334 @@
+"""
+Polynomials given by their coefficients, highest degree first (the order of ``np.polyval``).
+
+``horner`` evaluates p and p' together in a single pass and broadcasts over NumPy arrays,
+so one call can evaluate many polynomials of equal degree at many points. ``PolynomialSolver``
+finds all roots of one polynomial by Newton's method with deflation, or from the eigenvalues
+of its companion matrix for high degrees; ``roots`` does the latter for a whole stack of
+polynomials of equal degree at once.
+"""
+
+import ast
+import dataclasses
+import time
+import typing
+
+import numpy as np
+import numpy.typing
+
+from solvers.budget import Budget, BudgetMeter
+from solvers.monadic.expression import CONSTANTS, Expression
+from solvers.monadic.monadic_equation_solver import MonadicEquationSolver
+from solvers.solution_trace import Step
+
+Coefficients: typing.TypeAlias = typing.Sequence[complex] | np.ndarray
+
+# Newton's iteration starts off the real axis, so that it can reach complex roots
+NEWTON_START = 0.4 + 0.9j
+DEFAULT_POLISH_ITERATIONS = 2
+# relative imaginary parts below this are dropped from roots of real polynomials; a double
+# root is only accurate to about the square root of the machine epsilon
+IMAGINARY_TOLERANCE = 1e-8
+
+
+def horner(coefficients: Coefficients, x: typing.Any) -> typing.Tuple[typing.Any, typing.Any]:
+    """
+    Return ``(p(x), p'(x))``. The coefficients run along the last axis; any leading axes
+    broadcast against ``x``, e.g. coefficients of shape ``(m, 1, n + 1)`` and points of shape
+    ``(m, k)`` evaluate m polynomials at k points each.
+    """
+    coefficients = np.asarray(coefficients)
+    value = coefficients[..., 0] * np.ones_like(x)
+    derivative = np.zeros_like(value)
+    for index in range(1, coefficients.shape[-1]):
+        derivative = derivative * x + value
+        value = value * x + coefficients[..., index]
+    return value, derivative
+
+
+def _scalar_horner(coefficients: typing.Sequence[complex], x: complex) -> typing.Tuple[complex, complex]:
+    # plain Python arithmetic is much faster than NumPy for a single point
+    value, derivative = coefficients[0], 0
+    for coefficient in coefficients[1:]:
+        derivative = derivative * x + value
+        value = value * x + coefficient
+    return value, derivative
+
+
+def _exhaust(generator: typing.Generator) -> typing.Any:
+    """Run a generator to its end and return its return value."""
+    while True:
+        try:
+            next(generator)
+        except StopIteration as stop:
+            return stop.value
+
+
+def _expand(node: ast.expr, variable: str) -> np.ndarray:
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return np.array([float(node.value)])
+    if isinstance(node, ast.Name):
+        if node.id == variable:
+            return np.array([1.0, 0.0])
+        if node.id in CONSTANTS:
+            return np.array([CONSTANTS[node.id]])
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+        operand = _expand(node.operand, variable)
+        return -operand if isinstance(node.op, ast.USub) else operand
+    if isinstance(node, ast.BinOp):
+        left = _expand(node.left, variable)
+        if isinstance(node.op, ast.Pow):
+            exponent = _expand(node.right, variable)
+            if len(exponent) == 1 and exponent[0] >= 0 and exponent[0] == int(exponent[0]):
+                return np.polynomial.polynomial.polypow(left[::-1], int(exponent[0]))[::-1]
+        else:
+            right = _expand(node.right, variable)
+            if isinstance(node.op, ast.Add):
+                return np.polyadd(left, right)
+            if isinstance(node.op, ast.Sub):
+                return np.polysub(left, right)
+            if isinstance(node.op, ast.Mult):
+                return np.polymul(left, right)
+            if isinstance(node.op, ast.Div) and len(right) == 1 and right[0] != 0:
+                return left / right[0]
+    raise ValueError(f"Not a polynomial in {variable}: {ast.unparse(node)}")
+
+
+class Polynomial:
+    """A polynomial usable wherever a ``UnaryFunction`` is expected."""
+
+    def __init__(self, coefficients: Coefficients):
+        coefficients = np.trim_zeros(np.atleast_1d(np.asarray(coefficients)), "f")
+        if coefficients.ndim != 1 or len(coefficients) == 0:
+            raise ValueError("A polynomial needs a one-dimensional array with a non-zero coefficient.")
+        if not np.iscomplexobj(coefficients):
+            coefficients = coefficients.astype(float)
+        self.coefficients: np.ndarray = coefficients
+        self._scalar_coefficients = tuple(coefficients.tolist())
+
+    @classmethod
+    def from_expression(cls, expression: Expression) -> "Polynomial":
+        """Expand a polynomial ``Expression``; raises ``ValueError`` if it is not a polynomial."""
+        return cls(_expand(expression.tree, expression.variable))
+
+    @property
+    def degree(self) -> int:
+        return len(self.coefficients) - 1
+
+    def evaluate(self, x: typing.Any) -> typing.Tuple[typing.Any, typing.Any]:
+        """Return ``(p(x), p'(x))`` from one Horner pass."""
+        if np.ndim(x) == 0:
+            return _scalar_horner(self._scalar_coefficients, x)
+        return horner(self.coefficients, np.asarray(x))
+
+    def derivative(self) -> "Polynomial":
+        return Polynomial(np.polyder(self.coefficients) if self.degree > 0 else [0])
+
+    def __call__(self, x: typing.Any) -> typing.Any:
+        return self.evaluate(x)[0]
+
+    def __repr__(self) -> str:
+        return f"Polynomial({self.coefficients.tolist()!r})"
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Polynomial) and np.array_equal(self.coefficients, other.coefficients)
+
+    def __hash__(self) -> int:
+        return hash(self._scalar_coefficients)
+
+
+def _companion_matrices(coefficients: np.ndarray) -> np.ndarray:
+    if np.any(coefficients[..., 0] == 0):
+        raise ValueError("Leading coefficients must be non-zero.")
+    degree = coefficients.shape[-1] - 1
+    matrices = np.zeros(coefficients.shape[:-1] + (degree, degree), dtype=np.result_type(coefficients, np.float32))
+    matrices[..., 0, :] = -coefficients[..., 1:] / coefficients[..., :1]
+    matrices[..., np.arange(1, degree), np.arange(degree - 1)] = 1
+    return matrices
+
+
+def _tidy(roots: np.ndarray, real_coefficients: bool) -> np.ndarray:
+    if real_coefficients:
+        # only imaginary parts are pruned, relative to the modulus, so that tiny real roots survive
+        roots = np.where(np.abs(roots.imag) <= IMAGINARY_TOLERANCE * np.abs(roots), roots.real, roots)
+    # sorted by real part, then imaginary part; real parts that are rounding noise next to the
+    # modulus count as zero for the order, so that conjugate pairs sort the same way every time
+    roots = np.asarray(roots, dtype=np.result_type(roots, complex)) + 0.0  # no negative zeros
+    order_real = np.where(np.abs(roots.real) <= IMAGINARY_TOLERANCE * np.abs(roots), 0.0, roots.real)
+    roots = np.take_along_axis(roots, np.lexsort((roots.imag, order_real)), axis=-1)
+    return roots.real if not np.iscomplexobj(roots) or np.all(roots.imag == 0) else roots
+
+
+def roots(
+        coefficients: Coefficients,
+        polish_iterations: int = DEFAULT_POLISH_ITERATIONS,
+        dtype: np.typing.DTypeLike | None = None
+) -> np.ndarray:
+    """
+    All roots of one polynomial (coefficients of shape ``(n + 1,)``) or of a stack of
+    polynomials of equal degree (shape ``(m, n + 1)``), sorted per polynomial. The roots are the
+    eigenvalues of the stacked companion matrices, improved by ``polish_iterations`` vectorized
+    Newton steps. Like ``np.roots``, the result is real when every root is. With ``dtype``
+    (e.g. ``np.float32``) the work is done in that precision instead of the coefficients' own.
+    """
+    coefficients = np.asarray(coefficients, dtype=dtype)
+    if coefficients.ndim not in (1, 2) or coefficients.shape[-1] < 2:
+        raise ValueError(f"Expected coefficients of shape (n + 1,) or (m, n + 1) with n >= 1, "
+                         f"got {coefficients.shape}.")
+    found = np.linalg.eigvals(_companion_matrices(coefficients))
+    found = found.astype(np.result_type(found, np.complex64))
+    for _ in range(polish_iterations):
+        value, derivative = horner(coefficients[..., np.newaxis, :], found)
+        safe = derivative != 0
+        found = found - np.where(safe, value / np.where(safe, derivative, 1), 0)
+    return _tidy(found, not np.iscomplexobj(coefficients))
+
+
+@dataclasses.dataclass
+class PolynomialStep(Step):
+    root_index: int
+    guess: complex
+    function_value: complex
+    derivative_value: complex
+
+
+class PolynomialSolver(MonadicEquationSolver):
+    """
+    Finds all roots of a polynomial, given as a ``Polynomial``, its coefficients or a
+    polynomial ``Expression``. The final result is the sorted array of roots, real when every
+    root is real.
+    """
+    DEFAULT_MAX_ITERATIONS = 64
+    # above this degree, the eigenvalue method is both faster and more robust than deflation
+    COMPANION_DEGREE = 16
+    METHODS = ("auto", "newton", "companion")
+
+    def __init__(self, function: Polynomial | Expression | Coefficients | None = None):
+        if isinstance(function, Expression):
+            function = Polynomial.from_expression(function)
+        elif function is not None and not isinstance(function, Polynomial):
+            function = Polynomial(function)
+        super().__init__(function)
+        # the roots found so far, what a solve stopped by its budget returns
+        self._found: typing.List[complex] = []
+
+    def solve(
+            self,
+            tolerance: float = 1e-12,
+            method: str = "auto",
+            raise_exception_if_no_convergence: bool = False,
+            max_iterations: int = DEFAULT_MAX_ITERATIONS,
+            budget: Budget | None = None
+    ) -> np.ndarray:
+        """
+        Every Horner evaluation of the Newton iterations counts against ``budget``; a solve it
+        stops returns the roots found so far. The companion method is a single eigenvalue
+        computation and runs to the end.
+        """
+        return self._run_budgeted(lambda: self.iterate(tolerance, method, max_iterations),
+                                  raise_exception_if_no_convergence, budget)
+
+    def iterate(
+            self,
+            tolerance: float = 1e-12,
+            method: str = "auto",
+            max_iterations: int = DEFAULT_MAX_ITERATIONS
+    ) -> typing.Generator[PolynomialStep, None, np.ndarray]:
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown method {method!r}; expected one of {self.METHODS}.")
+        if self.function.degree < 1:
+            raise ValueError(f"A polynomial of degree {self.function.degree} has no roots to find.")
+        if method == "companion" or (method == "auto" and self.function.degree > self.COMPANION_DEGREE):
+            return self._eigenvalues()
+        return self._deflate(tolerance, max_iterations)
+
+    def _metered_function(self, meter: BudgetMeter) -> Polynomial:
+        # the Newton iterations evaluate the coefficients directly and charge the meter themselves
+        return self.function
+
+    def _best_so_far(self, meter: BudgetMeter) -> np.ndarray:
+        return _tidy(np.array(self._found), not np.iscomplexobj(self.function.coefficients))
+
+    def _eigenvalues(self) -> typing.Generator[PolynomialStep, None, np.ndarray]:
+        yield from ()
+        return self._finish(roots(self.function.coefficients), True)
+
+    def _newton(
+            self,
+            coefficients: typing.Sequence[complex],
+            guess: complex,
+            tolerance: float,
+            max_iterations: int
+    ) -> typing.Generator[typing.Tuple[complex, complex, complex], None, typing.Tuple[complex, bool]]:
+        for _ in range(max_iterations):
+            if self._meter is not None:
+                self._meter.spend()
+            value, derivative = _scalar_horner(coefficients, guess)
+            yield guess, value, derivative
+            if value == 0:
+                return guess, True
+            if derivative == 0:
+                # stationary point: nudge the guess and try again
+                guess += tolerance * (1 + abs(guess)) * NEWTON_START
+                continue
+            difference = value / derivative
+            guess -= difference
+            if abs(difference) <= tolerance * max(1.0, abs(guess)):
+                return guess, True
+        return guess, False
+
+    def _deflate(self, tolerance: float, max_iterations: int) -> typing.Generator[PolynomialStep, None, np.ndarray]:
+        original = tuple(complex(coefficient) for coefficient in self.function._scalar_coefficients)
+        remaining = list(original)
+        self._found = found = []
+        has_converged, iteration = True, 0
+        for root_index in range(self.function.degree):
+            newton = self._newton(remaining, NEWTON_START, tolerance, max_iterations)
+            while True:
+                try:
+                    guess, value, derivative = next(newton)
+                except StopIteration as stop:
+                    root, converged = stop.value
+                    break
+                yield PolynomialStep(iteration, root_index, guess, value, derivative)
+                iteration += 1
+            # polish on the original polynomial to shed the error deflation accumulated
+            polished, polish_converged = _exhaust(self._newton(original, root, tolerance, max_iterations))
+            if polish_converged:
+                root, converged = polished, True
+            has_converged &= converged
+            found.append(root)
+            # synthetic division by (x - root)
+            quotient = [remaining[0]]
+            for coefficient in remaining[1:-1]:
+                quotient.append(coefficient + root * quotient[-1])
+            remaining = quotient
+        real_coefficients = not np.iscomplexobj(self.function.coefficients)
+        return self._finish(_tidy(np.array(found), real_coefficients), has_converged)
+
+
+def solve_jobs(jobs: typing.List[typing.Any]) -> typing.List[typing.Dict[str, typing.Any]]:
+    """
+    Vectorized batch implementation: solve the polynomial jobs of a batch run together, one
+    ``roots`` call per degree, and return their result records.
+    """
+    records, groups = [], {}
+    for job in jobs:
+        record = dict(id=job.id, solver=job.solver, expression=job.expression, result=None, has_converged=False,
+                      iterations=0, cached=False, elapsed=0.0, error=None)
+        records.append(record)
+        try:
+            polynomial = Polynomial.from_expression(Expression(job.expression))
+            if polynomial.degree < 1:
+                raise ValueError(f"A polynomial of degree {polynomial.degree} has no roots to find.")
+        except ValueError as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+            continue
+        groups.setdefault(polynomial.degree, []).append((record, polynomial.coefficients))
+    for group in groups.values():
+        start = time.perf_counter()
+        found = roots(np.stack([coefficients for _, coefficients in group]))
+        elapsed = (time.perf_counter() - start) / len(group)
+        for (record, _), row in zip(group, found):
+            record.update(result=_tidy(row, True), has_converged=True, elapsed=elapsed)
+    return records
@@ -0,0 +1,252 @@
+import concurrent.futures
+import dataclasses
+import inspect
+import math
+import queue
+import threading
+import typing
+
+from solvers.budget import Budget, BudgetExhausted
+from solvers.monadic.interval import Interval
+from solvers.monadic.monadic_equation_solver import MonadicEquationSolver, UnaryFunction
+from solvers.registry import registry
+from solvers.solution_trace import Step
+
+
+# the fields that hold the current point in the steps of the monadic solvers, in order of preference
+_POINT_FIELDS = ("x", "guess", "middle")
+
+
+@dataclasses.dataclass
+class PortfolioStep(Step):
+    """A step of one of the methods, flattened to its point so that the trace can be saved."""
+    method: str
+    x: float
+    # |f(x)|, NaN if the method took the step without evaluating f at x
+    residual: float
+
+
+def _point_of(step: Step) -> float:
+    for name in _POINT_FIELDS:
+        value = getattr(step, name, None)
+        if isinstance(value, (int, float)):
+            return float(value)
+    return math.nan
+
+
+class _SharedEvaluations:
+    """Memoizes the function for all methods of a portfolio, so a point is only evaluated once."""
+
+    def __init__(self, function: UnaryFunction):
+        self.function = function
+        self.values: typing.Dict[float, float] = {}
+        self.hits = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, x: float) -> float:
+        with self._lock:
+            if x in self.values:
+                self.hits += 1
+                return self.values[x]
+        value = self.function(x)
+        with self._lock:
+            self.values[x] = value
+        return value
+
+
+class PortfolioSolver(MonadicEquationSolver):
+    """
+    Runs several methods on the same equation and returns the result of the first one to
+    converge. The methods take turns one step at a time or, with ``concurrent=True``, run in
+    threads of their own (which only overlap where the function releases the GIL, e.g. NumPy
+    or I/O bound functions). Either way they share one memoized copy of the function, and the
+    others are stopped at their next step once a method converges.
+    """
+    DEFAULT_METHODS = ("NewtonSolver", "AitkenSolver", "NewtonDownhillSolver", "BisectionSolver")
+
+    def __init__(
+            self,
+            function: UnaryFunction | None = None,
+            methods: typing.Sequence[str] = DEFAULT_METHODS,
+            concurrent: bool = False
+    ):
+        super().__init__(function)
+        if not methods:
+            raise ValueError("A portfolio needs at least one method.")
+        for method in methods:
+            if registry.get(method).category != "monadic":
+                raise ValueError(f"{method} does not solve monadic equations.")
+        self.methods = tuple(methods)
+        self.concurrent = concurrent
+        # outcome of the last solve
+        self.winner: str | None = None
+        self.errors: typing.Dict[str, Exception] = {}
+        self.evaluations = 0
+        self.cache_hits = 0
+
+    def cache_key(self) -> typing.Dict[str, typing.Any]:
+        return {"methods": self.methods, "concurrent": self.concurrent}
+
+    def solve(
+            self,
+            guess: float | None = None,
+            tolerance: float = 1e-12,
+            interval: Interval | None = None,
+            raise_exception_if_no_convergence: bool = False,
+            max_iterations: int | None = None,
+            derivative: UnaryFunction | None = None,
+            budget: Budget | None = None
+    ) -> float:
+        """The methods share ``budget``: its evaluations count the distinct points evaluated by any of them."""
+        return self._run_budgeted(lambda: self.iterate(guess, tolerance, interval, max_iterations, derivative),
+                                  raise_exception_if_no_convergence, budget)
+
+    def iterate(
+            self,
+            guess: float | None = None,
+            tolerance: float = 1e-12,
+            interval: Interval | None = None,
+            max_iterations: int | None = None,
+            derivative: UnaryFunction | None = None
+    ) -> typing.Generator[PortfolioStep, None, float]:
+        """
+        Methods needing a starting point use ``guess`` (by default the middle of ``interval``);
+        bracketing methods take part only when an ``interval`` is given. ``max_iterations`` and
+        ``derivative`` are passed to the methods that accept them.
+        """
+        if guess is None and interval is None:
+            raise ValueError("A portfolio needs a guess, an interval or both.")
+        if guess is None:
+            if not interval.is_finite():
+                raise ValueError(f"Cannot guess a starting point in an infinite interval: "
+                                 f"left={interval.left!r}, right={interval.right!r}")
+            guess = (interval.left + interval.right) / 2
+
+        shared = _SharedEvaluations(self.function)
+        self.winner, self.errors = None, {}
+        arguments = dict(guess=guess, tolerance=tolerance, interval=interval, max_iterations=max_iterations,
+                         derivative=derivative)
+        members: typing.Dict[str, MonadicEquationSolver] = {}
+        generators: typing.Dict[str, typing.Iterator[Step]] = {}
+        for method in self.methods:
+            member = registry.get(method).solver_class()(shared)
+            parameters = inspect.signature(member.iterate).parameters
+            required = [name for name, parameter in parameters.items()
+                        if parameter.default is inspect.Parameter.empty and
+                        parameter.kind not in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD)]
+            if any(arguments.get(name) is None for name in required):
+                continue  # e.g. bisection without an interval
+            try:
+                generators[method] = member.iterate(**{name: value for name, value in arguments.items()
+                                                       if name in parameters and value is not None})
+            except BudgetExhausted:
+                raise
+            except Exception as e:
+                # e.g. an interval whose endpoints do not bracket a root
+                self.errors[method] = e
+                continue
+            members[method] = member
+        if not generators:
+            if self.errors:
+                raise next(iter(self.errors.values()))
+            raise ValueError(f"None of the methods {self.methods} can run with the given arguments.")
+
+        # Everything above is checked eagerly, so invalid input raises here rather than on the first step.
+        return self._compete(shared, members, generators, guess)
+
+    def _compete(
+            self,
+            shared: _SharedEvaluations,
+            members: typing.Dict[str, MonadicEquationSolver],
+            generators: typing.Dict[str, typing.Iterator[Step]],
+            guess: float
+    ) -> typing.Generator[PortfolioStep, None, float]:
+        race = self._race_concurrently if self.concurrent else self._race_in_turns
+        for iteration, (method, step) in enumerate(race(members, generators)):
+            x = _point_of(step)
+            # the value the method itself computed, so that recording the step evaluates nothing
+            yield PortfolioStep(iteration, method, x, abs(shared.values.get(x, math.nan)))
+
+        self.evaluations, self.cache_hits = len(shared.values), shared.hits
+        if self.winner is not None:
+            return self._finish(members[self.winner].trace.final_result, True)
+        if all(method in self.errors for method in members):
+            raise next(iter(self.errors.values()))
+        # nobody converged: the result closest to a root is the best there is
+        results = [members[method].trace.final_result for method in members
+                   if method not in self.errors and members[method].trace.final_result is not None]
+        return self._finish(min(results, key=lambda x: abs(shared(x))) if results else guess, False)
+
+    def _race_in_turns(
+            self,
+            members: typing.Dict[str, MonadicEquationSolver],
+            generators: typing.Dict[str, typing.Iterator[Step]]
+    ) -> typing.Iterator[typing.Tuple[str, Step]]:
+        active = dict(generators)
+        try:
+            while active and self.winner is None:
+                for method, generator in list(active.items()):
+                    try:
+                        step = next(generator)
+                    except StopIteration:
+                        del active[method]
+                        if self._declare_winner(method, members[method]):
+                            break
+                        continue
+                    except BudgetExhausted:
+                        # the budget is shared, so it ends the race rather than one method
+                        raise
+                    except Exception as e:
+                        del active[method]
+                        self.errors[method] = e
+                        continue
+                    yield method, step
+        finally:
+            for generator in active.values():
+                generator.close()
+
+    def _race_concurrently(
+            self,
+            members: typing.Dict[str, MonadicEquationSolver],
+            generators: typing.Dict[str, typing.Iterator[Step]]
+    ) -> typing.Iterator[typing.Tuple[str, Step]]:
+        finished = object()
+        stop = threading.Event()
+        outcomes: queue.Queue = queue.Queue()
+
+        def drive(method: str, generator: typing.Iterator[Step]):
+            try:
+                for step in generator:
+                    if stop.is_set():
+                        generator.close()
+                        return
+                    outcomes.put((method, step))
+            except Exception as e:
+                outcomes.put((method, e))
+                return
+            outcomes.put((method, finished))
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(generators)) as executor:
+            for method, generator in generators.items():
+                executor.submit(drive, method, generator)
+            running = len(generators)
+            try:
+                while running and self.winner is None:
+                    method, outcome = outcomes.get()
+                    if isinstance(outcome, BudgetExhausted):
+                        raise outcome
+                    if outcome is finished or isinstance(outcome, Exception):
+                        running -= 1
+                        if outcome is not finished:
+                            self.errors[method] = outcome
+                        elif self._declare_winner(method, members[method]):
+                            break
+                        continue
+                    yield method, outcome
+            finally:
+                stop.set()
+
+    def _declare_winner(self, method: str, member: MonadicEquationSolver) -> bool:
+        if member.trace.has_converged:
+            self.winner = method
+        return member.trace.has_converged
@@ -0,0 +1,32 @@
+"""Expose solver classes from submodules in this package, importing each submodule on first use."""
+
+import importlib
+import typing
+
+# exported name -> module defining it (relative to this package unless absolute)
+_EXPORTS: typing.Dict[str, str] = {
+    "AndersonSolver": ".fixed_point",
+    "BroydenSolver": ".broyden",
+    "ExtrapolationSolver": ".fixed_point",
+    "FixedPointSolver": ".fixed_point",
+    "FixedPointStep": ".fixed_point",
+    "NewtonSystemSolver": ".newton",
+    "NonlinearSystemSolver": ".nonlinear_system_solver",
+    "NonlinearSystemSolverNotConvergedException": ".nonlinear_system_solver",
+    "NonlinearSystemStep": ".nonlinear_system_solver",
+    "SolutionTrace": "solvers.solution_trace",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str) -> typing.Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value  # later lookups bypass __getattr__
+    return value
+
+
+def __dir__() -> typing.List[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,88 @@
+import typing
+
+import numpy as np
+
+from solvers.linear_system.lu import LUFactorization
+from solvers.nonlinear_system.calculus import DEFAULT_STEP_SIZE, get_jacobian_of
+from solvers.nonlinear_system.nonlinear_system_solver import NonlinearSystemSolver, NonlinearSystemStep
+
+
+class BroydenSolver(NonlinearSystemSolver):
+    """
+    Broyden's ("good") method. The inverse Jacobian is computed once from an LU factorization
+    and then corrected by a Sherman-Morrison rank-1 update per step, so a step costs O(n^2)
+    and one function evaluation. The Jacobian is evaluated afresh only when an update
+    breaks down or a step makes the residual grow.
+    """
+    DEFAULT_MAX_ITERATIONS = 128
+
+    def solve(
+            self,
+            guess: np.ndarray,
+            tolerance: float,
+            raise_exception_if_no_convergence: bool = False,
+            max_iterations: int = DEFAULT_MAX_ITERATIONS,
+            step_size: float = DEFAULT_STEP_SIZE,
+            vectorized: bool = False
+    ) -> np.ndarray:
+        return self._run(self.iterate(guess, tolerance, max_iterations, step_size, vectorized),
+                         raise_exception_if_no_convergence)
+
+    def iterate(
+            self,
+            guess: np.ndarray,
+            tolerance: float,
+            max_iterations: int = DEFAULT_MAX_ITERATIONS,
+            step_size: float = DEFAULT_STEP_SIZE,
+            vectorized: bool = False
+    ) -> typing.Generator[NonlinearSystemStep, None, np.ndarray]:
+        x = np.array(guess, dtype=float)
+        if x.ndim != 1:
+            raise ValueError(f"guess must be a vector, got shape {x.shape}.")
+        if self.jacobian is not None:
+            jacobian = lambda point, value: self.jacobian(point)
+        else:
+            jacobian = get_jacobian_of(self.function, step_size, vectorized)
+        return self._broyden(x, tolerance, max_iterations, jacobian)
+
+    def _broyden(
+            self,
+            x: np.ndarray,
+            tolerance: float,
+            max_iterations: int,
+            jacobian: typing.Callable[[np.ndarray, np.ndarray], np.ndarray]
+    ) -> typing.Generator[NonlinearSystemStep, None, np.ndarray]:
+        residual = self._residual(x)
+        inverse = None
+        for iteration in range(max_iterations):
+            residual_norm = float(np.max(np.abs(residual)))
+            if residual_norm <= tolerance:
+                return self._finish(x, True)
+
+            evaluated = inverse is None
+            if evaluated:
+                try:
+                    inverse = LUFactorization(jacobian(x, residual)).solve(np.eye(len(x)))
+                except ValueError:
+                    break
+            difference = -inverse @ residual
+            step_norm = float(np.max(np.abs(difference)))
+
+            yield NonlinearSystemStep(iteration, x.copy(), residual_norm, step_norm, evaluated)
+
+            x = x + difference
+            new_residual = self._residual(x)
+            change = new_residual - residual
+            inverse_change = inverse @ change
+            denominator = difference @ inverse_change
+            if (abs(denominator) <= np.finfo(float).eps * np.linalg.norm(difference) * np.linalg.norm(inverse_change)
+                    or np.max(np.abs(new_residual)) > residual_norm):
+                inverse = None
+            else:
+                # Sherman-Morrison: H += (s - H y) s^T H / (s^T H y)
+                inverse += np.outer((difference - inverse_change) / denominator, difference @ inverse)
+            residual = new_residual
+            if step_norm < tolerance:
+                return self._finish(x, True)
+
+        return self._finish(x, False)
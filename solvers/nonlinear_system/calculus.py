@@ -0,0 +1,38 @@
+import typing
+
+import numpy as np
+
+VectorFunction: typing.TypeAlias = typing.Callable[[np.ndarray], np.ndarray]
+JacobianFunction: typing.TypeAlias = typing.Callable[[np.ndarray], np.ndarray]
+
+# relative forward-difference step, about the square root of the machine epsilon
+DEFAULT_STEP_SIZE = 1.5e-8
+
+
+def get_jacobian_of(
+        function: VectorFunction,
+        step_size: float = DEFAULT_STEP_SIZE,
+        vectorized: bool = False
+) -> typing.Callable[[np.ndarray, np.ndarray | None], np.ndarray]:
+    """
+    Forward-difference Jacobian of ``function``. The returned callable takes the point and,
+    optionally, the function value there, which saves one evaluation. A ``vectorized``
+    function maps an ``(n, k)`` array of k points (as columns) to an ``(m, k)`` array of
+    values, so that all n perturbed points are evaluated in a single call.
+    """
+
+    def jacobian(x: np.ndarray, value: np.ndarray | None = None) -> np.ndarray:
+        x = np.asarray(x, dtype=float)
+        if value is None:
+            value = np.asarray(function(x), dtype=float)
+        steps = step_size * np.maximum(1.0, np.abs(x))
+        # (x + h) - x is what was actually added, which is not exactly h in floating point
+        perturbed = x[:, np.newaxis] + np.diag(steps)
+        steps = np.diagonal(perturbed) - x
+        if vectorized:
+            values = np.asarray(function(perturbed), dtype=float)
+        else:
+            values = np.column_stack([function(perturbed[:, j]) for j in range(len(x))])
+        return (values - value[:, np.newaxis]) / steps
+
+    return jacobian
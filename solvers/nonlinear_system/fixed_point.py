@@ -0,0 +1,240 @@
+"""
+Accelerated fixed-point iteration ``x = g(x)`` for maps of vectors, generalizing the Aitken
+Delta-squared acceleration of ``solvers.monadic.aitken`` to many unknowns.
+
+``AndersonSolver`` mixes the last few iterates every step, choosing the combination whose
+residuals ``g(x) - x`` cancel best in the least-squares sense. ``ExtrapolationSolver`` runs
+plain iteration in cycles and extrapolates each cycle to its limit, by minimal polynomial
+extrapolation (MPE) or the vector epsilon algorithm; in one dimension both reduce to Aitken's
+formula.
+"""
+
+import dataclasses
+import typing
+
+import numpy as np
+
+from solvers.nonlinear_system.calculus import VectorFunction
+from solvers.nonlinear_system.nonlinear_system_solver import NonlinearSystemSolver
+from solvers.solution_trace import Step
+
+
+@dataclasses.dataclass
+class FixedPointStep(Step):
+    x: np.ndarray
+    # max |g(x) - x|
+    residual_norm: float
+    # the number of earlier iterates combined into the next one
+    history_size: int
+
+
+class FixedPointSolver(NonlinearSystemSolver):
+    """
+    Base class of the accelerated fixed-point solvers. Like ``AitkenSolver``, they solve
+    ``F(x) = 0`` through the map ``g(x) = x + F(x)``, or take ``g`` itself with
+    ``is_fixed_point=True``.
+    """
+
+    def __init__(self, function: VectorFunction | None = None, is_fixed_point: bool = False):
+        super().__init__(function if is_fixed_point or function is None else lambda x: x + function(x))
+
+    def _map(self, x: np.ndarray) -> np.ndarray:
+        value = np.asarray(self.function(x), dtype=float)
+        if value.shape != x.shape:
+            raise ValueError(f"The map must take {x.shape[0]} unknowns to as many values, got shape {value.shape}.")
+        return value
+
+    @staticmethod
+    def _guess(guess: np.ndarray) -> np.ndarray:
+        x = np.array(guess, dtype=float)
+        if x.ndim != 1:
+            raise ValueError(f"guess must be a vector, got shape {x.shape}.")
+        return x
+
+
+class AndersonSolver(FixedPointSolver):
+    """
+    Anderson acceleration (Anderson mixing) with a history of the last ``history`` steps. The
+    differences of the iterates and of their residuals are kept in preallocated ``(n, history)``
+    ring buffers, and each step solves an ``n x history`` least-squares problem for the mixing
+    coefficients, which costs O(n history^2) on top of one evaluation of the map.
+    """
+    DEFAULT_MAX_ITERATIONS = 256
+    DEFAULT_HISTORY = 10
+
+    def solve(
+            self,
+            guess: np.ndarray,
+            tolerance: float,
+            raise_exception_if_no_convergence: bool = False,
+            max_iterations: int = DEFAULT_MAX_ITERATIONS,
+            history: int = DEFAULT_HISTORY,
+            mixing: float = 1.0
+    ) -> np.ndarray:
+        return self._run(self.iterate(guess, tolerance, max_iterations, history, mixing),
+                         raise_exception_if_no_convergence)
+
+    def iterate(
+            self,
+            guess: np.ndarray,
+            tolerance: float,
+            max_iterations: int = DEFAULT_MAX_ITERATIONS,
+            history: int = DEFAULT_HISTORY,
+            mixing: float = 1.0
+    ) -> typing.Generator[FixedPointStep, None, np.ndarray]:
+        """
+        ``mixing`` is the fraction of the residual added to each step (1 takes the combined
+        ``g`` values as they are); ``history=0`` gives plain damped fixed-point iteration.
+        """
+        x = self._guess(guess)
+        if history < 0:
+            raise ValueError(f"history must not be negative, got {history}.")
+        if not 0 < mixing <= 1:
+            raise ValueError(f"mixing must be in (0, 1], got {mixing}.")
+        return self._anderson(x, tolerance, max_iterations, history, mixing)
+
+    def _anderson(
+            self,
+            x: np.ndarray,
+            tolerance: float,
+            max_iterations: int,
+            history: int,
+            mixing: float
+    ) -> typing.Generator[FixedPointStep, None, np.ndarray]:
+        size = len(x)
+        iterate_differences = np.empty((size, history))
+        residual_differences = np.empty((size, history))
+        previous_x = previous_residual = None
+        for iteration in range(max_iterations):
+            residual = self._map(x) - x
+            residual_norm = float(np.max(np.abs(residual)))
+            if residual_norm <= tolerance:
+                return self._finish(x, True)
+
+            used = min(iteration, history)
+            if used:
+                slot = (iteration - 1) % history
+                np.subtract(x, previous_x, out=iterate_differences[:, slot])
+                np.subtract(residual, previous_residual, out=residual_differences[:, slot])
+            yield FixedPointStep(iteration, x.copy(), residual_norm, used)
+
+            previous_x, previous_residual = x, residual
+            if used:
+                # gamma minimizes |residual - dF gamma|; the slot order does not matter
+                gamma = np.linalg.lstsq(residual_differences[:, :used], residual, rcond=None)[0]
+                x = (x - iterate_differences[:, :used] @ gamma
+                     + mixing * (residual - residual_differences[:, :used] @ gamma))
+            else:
+                x = x + mixing * residual
+
+        return self._finish(x, False)
+
+
+class ExtrapolationSolver(FixedPointSolver):
+    """
+    Cycling extrapolation: from the start of a cycle, ``cycle_length`` plain fixed-point
+    steps are taken into a preallocated ``(n, cycle_length + 1)`` array, and the limit of the
+    sequence they start is estimated by ``method``:
+
+    * ``"mpe"``, minimal polynomial extrapolation, a least-squares combination of the iterates;
+    * ``"vector_epsilon"``, Wynn's epsilon algorithm with the Samelson inverse of vectors.
+
+    The estimate starts the next cycle unless its residual is no smaller than that of the
+    last plain iterate, which then starts it instead, so that a cycle never does worse than
+    plain iteration. Each cycle is one step of the trace.
+    """
+    DEFAULT_MAX_ITERATIONS = 64
+    DEFAULT_CYCLE_LENGTH = 8
+    METHODS = ("mpe", "vector_epsilon")
+
+    def __init__(self, function: VectorFunction | None = None, is_fixed_point: bool = False, method: str = "mpe"):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown extrapolation method {method!r}, expected one of {self.METHODS}.")
+        super().__init__(function, is_fixed_point)
+        self.method = method
+
+    def cache_key(self) -> typing.Dict[str, typing.Any]:
+        return {**super().cache_key(), "method": self.method}
+
+    def solve(
+            self,
+            guess: np.ndarray,
+            tolerance: float,
+            raise_exception_if_no_convergence: bool = False,
+            max_iterations: int = DEFAULT_MAX_ITERATIONS,
+            cycle_length: int = DEFAULT_CYCLE_LENGTH
+    ) -> np.ndarray:
+        return self._run(self.iterate(guess, tolerance, max_iterations, cycle_length),
+                         raise_exception_if_no_convergence)
+
+    def iterate(
+            self,
+            guess: np.ndarray,
+            tolerance: float,
+            max_iterations: int = DEFAULT_MAX_ITERATIONS,
+            cycle_length: int = DEFAULT_CYCLE_LENGTH
+    ) -> typing.Generator[FixedPointStep, None, np.ndarray]:
+        """``max_iterations`` bounds the cycles; the vector epsilon algorithm uses an even ``cycle_length``."""
+        x = self._guess(guess)
+        if cycle_length < 2:
+            raise ValueError(f"cycle_length must be at least 2, got {cycle_length}.")
+        if self.method == "vector_epsilon":
+            cycle_length -= cycle_length % 2
+        return self._cycles(x, tolerance, max_iterations, cycle_length)
+
+    def _cycles(
+            self,
+            x: np.ndarray,
+            tolerance: float,
+            max_iterations: int,
+            cycle_length: int
+    ) -> typing.Generator[FixedPointStep, None, np.ndarray]:
+        iterates = np.empty((len(x), cycle_length + 1))
+        extrapolate = self._mpe if self.method == "mpe" else self._vector_epsilon
+        mapped = self._map(x)
+        for iteration in range(max_iterations):
+            iterates[:, 0] = x
+            iterates[:, 1] = mapped
+            residual_norm = float(np.max(np.abs(mapped - x)))
+            if residual_norm <= tolerance:
+                return self._finish(x, True)
+            yield FixedPointStep(iteration, x.copy(), residual_norm, cycle_length)
+
+            for j in range(2, cycle_length + 1):
+                iterates[:, j] = self._map(iterates[:, j - 1])
+            last = iterates[:, -1].copy()
+            last_mapped = self._map(last)
+            try:
+                x = extrapolate(iterates)
+            except np.linalg.LinAlgError:
+                x = last
+            if x is not last and np.all(np.isfinite(x)):
+                mapped = self._map(x)
+                if np.max(np.abs(mapped - x)) < np.max(np.abs(last_mapped - last)):
+                    continue
+            # the cycle already sits at the limit, or the extrapolation broke down or made things worse
+            x, mapped = last, last_mapped
+
+        return self._finish(x, False)
+
+    @staticmethod
+    def _mpe(iterates: np.ndarray) -> np.ndarray:
+        differences = np.diff(iterates, axis=1)
+        # c minimizes |U c + u_k| with u_j the differences; the limit is the iterates weighted by c / sum(c)
+        coefficients = np.linalg.lstsq(differences[:, :-1], -differences[:, -1], rcond=None)[0]
+        coefficients = np.append(coefficients, 1.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return iterates[:, :-1] @ (coefficients / coefficients.sum())
+
+    @staticmethod
+    def _vector_epsilon(iterates: np.ndarray) -> np.ndarray:
+        # columns of eps^(j)_{s-1} and eps^(j)_s for j = 0, 1, ...; the even columns approximate the limit
+        previous = np.zeros_like(iterates)
+        current = iterates
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for _ in range(iterates.shape[1] - 1):
+                differences = current[:, 1:] - current[:, :-1]
+                # the Samelson inverse v / |v|^2
+                inverses = differences / np.einsum("ij,ij->j", differences, differences)
+                previous, current = current, previous[:, 1:current.shape[1]] + inverses
+        return current[:, 0]
@@ -0,0 +1,90 @@
+import math
+import typing
+
+import numpy as np
+
+from solvers.linear_system.lu import LUFactorization
+from solvers.nonlinear_system.calculus import DEFAULT_STEP_SIZE, get_jacobian_of
+from solvers.nonlinear_system.nonlinear_system_solver import NonlinearSystemSolver, NonlinearSystemStep
+
+
+class NewtonSystemSolver(NonlinearSystemSolver):
+    """
+    Newton's method for systems. Each step solves ``J(x) dx = -F(x)`` with an LU factorization
+    of the Jacobian, which is kept for up to ``max_jacobian_age`` steps as long as the residual
+    keeps shrinking fast; ``max_jacobian_age=1`` gives the classic method.
+    """
+    DEFAULT_MAX_ITERATIONS = 64
+    DEFAULT_MAX_JACOBIAN_AGE = 4
+    # a reused factorization is refreshed once a step shrinks the residual by less than this factor
+    REFRESH_CONTRACTION = 0.5
+
+    def solve(
+            self,
+            guess: np.ndarray,
+            tolerance: float,
+            raise_exception_if_no_convergence: bool = False,
+            max_iterations: int = DEFAULT_MAX_ITERATIONS,
+            step_size: float = DEFAULT_STEP_SIZE,
+            max_jacobian_age: int = DEFAULT_MAX_JACOBIAN_AGE,
+            vectorized: bool = False
+    ) -> np.ndarray:
+        return self._run(self.iterate(guess, tolerance, max_iterations, step_size, max_jacobian_age, vectorized),
+                         raise_exception_if_no_convergence)
+
+    def iterate(
+            self,
+            guess: np.ndarray,
+            tolerance: float,
+            max_iterations: int = DEFAULT_MAX_ITERATIONS,
+            step_size: float = DEFAULT_STEP_SIZE,
+            max_jacobian_age: int = DEFAULT_MAX_JACOBIAN_AGE,
+            vectorized: bool = False
+    ) -> typing.Generator[NonlinearSystemStep, None, np.ndarray]:
+        """``vectorized`` tells the finite-difference Jacobian that the function accepts ``(n, k)`` arrays."""
+        if max_jacobian_age < 1:
+            raise ValueError(f"max_jacobian_age must be at least 1, got {max_jacobian_age}.")
+        x = np.array(guess, dtype=float)
+        if x.ndim != 1:
+            raise ValueError(f"guess must be a vector, got shape {x.shape}.")
+        if self.jacobian is not None:
+            jacobian = lambda point, value: self.jacobian(point)
+        else:
+            jacobian = get_jacobian_of(self.function, step_size, vectorized)
+        return self._newton(x, tolerance, max_iterations, max_jacobian_age, jacobian)
+
+    def _newton(
+            self,
+            x: np.ndarray,
+            tolerance: float,
+            max_iterations: int,
+            max_jacobian_age: int,
+            jacobian: typing.Callable[[np.ndarray, np.ndarray], np.ndarray]
+    ) -> typing.Generator[NonlinearSystemStep, None, np.ndarray]:
+        factorization, age, previous_norm = None, 0, math.inf
+        for iteration in range(max_iterations):
+            residual = self._residual(x)
+            residual_norm = float(np.max(np.abs(residual)))
+            if residual_norm <= tolerance:
+                return self._finish(x, True)
+
+            refresh = (factorization is None or age >= max_jacobian_age
+                       or residual_norm > self.REFRESH_CONTRACTION * previous_norm)
+            if refresh:
+                try:
+                    factorization, age = LUFactorization(jacobian(x, residual)), 0
+                except ValueError:
+                    # singular Jacobian: no Newton direction exists
+                    break
+            difference = factorization.solve(-residual)
+            age += 1
+            step_norm = float(np.max(np.abs(difference)))
+
+            yield NonlinearSystemStep(iteration, x.copy(), residual_norm, step_norm, refresh)
+
+            x = x + difference
+            previous_norm = residual_norm
+            if step_norm < tolerance:
+                return self._finish(x, True)
+
+        return self._finish(x, False)
@@ -0,0 +1,64 @@
+import dataclasses
+import typing
+
+import numpy as np
+
+from solvers.nonlinear_system.calculus import JacobianFunction, VectorFunction
+from solvers.solution_trace import SolutionTrace, Step
+
+
+@dataclasses.dataclass
+class NonlinearSystemStep(Step):
+    x: np.ndarray
+    residual_norm: float
+    step_norm: float
+    # whether the Jacobian was evaluated (and factorized) afresh for this step
+    jacobian_evaluated: bool
+
+
+class NonlinearSystemSolver:
+    """Base class of solvers for ``F(x) = 0`` with ``F`` mapping vectors of n unknowns to n residuals."""
+    # Bump in a subclass whenever a change alters its results or trace; invalidates cached solutions
+    VERSION = 1
+
+    def __init__(self, function: VectorFunction | None = None, jacobian: JacobianFunction | None = None):
+        self.function: VectorFunction = function
+        self.jacobian: JacobianFunction | None = jacobian
+        self.trace = SolutionTrace()
+
+    def cache_key(self) -> typing.Dict[str, typing.Any]:
+        """The configuration besides ``function`` that the results depend on; see ``MonadicEquationSolver.cache_key``."""
+        return {"jacobian": self.jacobian}
+
+    def iterate(self, *args, **kwargs) -> typing.Generator[NonlinearSystemStep, None, np.ndarray]:
+        """
+        Yield the steps of the method lazily; see ``MonadicEquationSolver.iterate``.
+        """
+        raise NotImplementedError("Subclasses must implement the iterate method.")
+
+    def _residual(self, x: np.ndarray) -> np.ndarray:
+        residual = np.asarray(self.function(x), dtype=float)
+        if residual.shape != x.shape:
+            raise ValueError(f"The function must map {x.shape[0]} unknowns to as many residuals, "
+                             f"got shape {residual.shape}.")
+        return residual
+
+    def _finish(self, result: np.ndarray, has_converged: bool) -> np.ndarray:
+        self.trace.final_result = result
+        self.trace.has_converged = has_converged
+        return result
+
+    def _run(self, steps: typing.Iterator[Step], raise_exception_if_no_convergence: bool) -> np.ndarray:
+        self.trace.clear()
+        for step in steps:
+            self.trace.steps.append(step)
+        if raise_exception_if_no_convergence and not self.trace.has_converged:
+            raise NonlinearSystemSolverNotConvergedException(self)
+        return self.trace.final_result
+
+
+class NonlinearSystemSolverNotConvergedException(Exception):
+    def __init__(self, solver: NonlinearSystemSolver):
+        super().__init__(
+            f"Method {solver.__class__.__name__} did not converge after {len(solver.trace.steps)} iterations."
+        )
@@ -0,0 +1,193 @@
+"""
+Memory accounting for traces and solves.
+
+``trace_memory`` (also ``SolutionTrace.memory_usage()``) walks the steps a trace holds and adds
+up their sizes by step type, arrays such as ``GaussStep.matrix_snapshot`` separately. Sizes
+are those ``sys.getsizeof`` reports, so they leave out allocator overhead and, on CPython, the
+attribute storage of the steps; they are exact for the arrays, which dominate where it matters.
+
+``profile_solve`` runs one solve under ``tracemalloc`` and reports what it really allocated:
+the peak and the memory still held once it returned (the trace and the result), and, by step
+type, the peak of the allocations made while computing a single step. The steps are timed by
+their arrival in the trace, so this works for every solver that records one, whether it
+appends steps itself or through ``iterate``.
+"""
+
+import dataclasses
+import sys
+import tracemalloc
+import typing
+
+import numpy as np
+
+from solvers.registry import reference_of
+from solvers.solution_trace import SolutionTrace, Step
+
+
+@dataclasses.dataclass
+class StepMemory:
+    """The steps of one type held by a trace."""
+    count: int = 0
+    # all bytes of the steps, their arrays included
+    nbytes: int = 0
+    # bytes of array data alone
+    array_nbytes: int = 0
+
+    @property
+    def bytes_per_step(self) -> float:
+        return self.nbytes / self.count if self.count else 0.0
+
+    @property
+    def array_bytes_per_step(self) -> float:
+        return self.array_nbytes / self.count if self.count else 0.0
+
+
+@dataclasses.dataclass
+class TraceMemory:
+    # by step type reference ("module:qualname", as in trace files)
+    steps: typing.Dict[str, StepMemory] = dataclasses.field(default_factory=dict)
+    final_result: int = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self.final_result + sum(usage.nbytes for usage in self.steps.values())
+
+
+@dataclasses.dataclass
+class StepAllocation:
+    """The steps of one type computed during a profiled solve."""
+    count: int = 0
+    # the most memory allocated at once while computing one of them, above the level before it
+    peak: int = 0
+
+
+@dataclasses.dataclass
+class MemoryProfile:
+    # bytes above the allocation level at the start of the solve
+    peak: int
+    # bytes still allocated when the solve returned
+    retained: int
+    steps: typing.Dict[str, StepAllocation]
+    trace: TraceMemory
+
+    @property
+    def step_count(self) -> int:
+        return sum(allocation.count for allocation in self.steps.values())
+
+
+def _step_type(step: Step) -> str:
+    return reference_of(type(step))
+
+
+def _size_of(value: typing.Any, seen: typing.Set[int]) -> typing.Tuple[int, int]:
+    """Bytes of ``value`` and everything it holds, and the part of them that is array data."""
+    if id(value) in seen:
+        return 0, 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, np.ndarray):
+        # arrays report their data only when they own it; a view keeps its base's data alive
+        return size + (value.nbytes if value.base is not None else 0), value.nbytes
+    array_size = 0
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        items = (getattr(value, field.name) for field in dataclasses.fields(value))
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = value
+    elif isinstance(value, dict):
+        items = (item for pair in value.items() for item in pair)
+    else:
+        items = ()
+    for item in items:
+        item_size, item_array_size = _size_of(item, seen)
+        size += item_size
+        array_size += item_array_size
+    return size, array_size
+
+
+def trace_memory(trace: SolutionTrace) -> TraceMemory:
+    """
+    The memory held by the steps and the final result of ``trace``. Steps streamed to a
+    ``TraceWriter`` live in its file and hold none.
+    """
+    usage = TraceMemory()
+    seen: typing.Set[int] = set()
+    if isinstance(trace.steps, list):
+        for step in trace.steps:
+            step_usage = usage.steps.setdefault(_step_type(step), StepMemory())
+            size, array_size = _size_of(step, seen)
+            step_usage.count += 1
+            step_usage.nbytes += size
+            step_usage.array_nbytes += array_size
+    if trace.final_result is not None:
+        usage.final_result = _size_of(trace.final_result, seen)[0]
+    return usage
+
+
+class _MeteredSteps:
+    """Stands in for the steps of a trace during a profiled solve, taking a reading at every step."""
+
+    def __init__(self, steps: typing.Any):
+        self.target = steps
+        self.allocations: typing.Dict[str, StepAllocation] = {}
+        self.peak = 0
+        self._level = tracemalloc.get_traced_memory()[0]
+
+    def append(self, step: Step):
+        current, peak = tracemalloc.get_traced_memory()
+        allocation = self.allocations.setdefault(_step_type(step), StepAllocation())
+        allocation.count += 1
+        allocation.peak = max(allocation.peak, peak - self._level)
+        self.peak = max(self.peak, peak)
+        self.target.append(step)
+        tracemalloc.reset_peak()
+        self._level = tracemalloc.get_traced_memory()[0]
+
+    def extend(self, steps: typing.Iterable[Step]):
+        for step in steps:
+            self.append(step)
+
+    def clear(self):
+        self.target.clear()
+
+    def __len__(self) -> int:
+        return len(self.target)
+
+    def __iter__(self) -> typing.Iterator[Step]:
+        return iter(self.target)
+
+    def __getitem__(self, index):
+        return self.target[index]
+
+
+def profile_solve(solver: typing.Any, *args, **kwargs) -> MemoryProfile:
+    """
+    Run ``solver.solve(*args, **kwargs)`` under ``tracemalloc`` and profile its memory. The
+    solver's previous trace is cleared first, so that the memory it frees does not hide what
+    the solve retains. When ``tracemalloc`` is already tracing, it is left running, but its
+    peak is reset along the way.
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    trace = solver.trace
+    trace.clear()
+    steps = trace.steps
+    try:
+        metered = _MeteredSteps(steps)
+        baseline = metered._level
+        tracemalloc.reset_peak()
+        trace.steps = metered
+        try:
+            solver.solve(*args, **kwargs)
+        finally:
+            trace.steps = steps
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        if started:
+            tracemalloc.stop()
+    return MemoryProfile(
+        peak=max(peak, metered.peak) - baseline,
+        retained=current - baseline,
+        steps=metered.allocations,
+        trace=trace_memory(trace)
+    )
@@ -0,0 +1,224 @@
+"""
+Registry of solvers and the classes that belong to them (step type, visualizer and
+alternative implementations).
+
+Classes are given as ``"module:attribute"`` references and only imported when first
+requested, so consulting the registry never loads solvers that are not used. Third-party
+packages can add solvers through the ``numerical_analysis.solvers`` entry-point group;
+each entry point names either a solver class (registered under the entry point name) or a
+callable that receives the registry and registers its solvers itself.
+"""
+
+import dataclasses
+import importlib
+import importlib.metadata
+import typing
+
+ENTRY_POINT_GROUP = "numerical_analysis.solvers"
+
+# Implementation kinds, fastest first. "scalar" is the solver class itself; a "vectorized"
+# implementation is a callable that solves a list of batch jobs in a single call.
+IMPLEMENTATION_KINDS = ("vectorized", "scalar")
+
+Reference: typing.TypeAlias = str | typing.Any
+
+
+def _resolve(reference: Reference) -> typing.Any:
+    if not isinstance(reference, str):
+        return reference
+    module_name, _, attribute_path = reference.partition(":")
+    value = importlib.import_module(module_name)
+    for attribute in attribute_path.split("."):
+        value = getattr(value, attribute)
+    return value
+
+
+def reference_of(cls: type) -> str:
+    """The ``"module:qualname"`` reference of a class, as the registry and trace files name it."""
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+@dataclasses.dataclass
+class SolverRegistration:
+    name: str
+    solver: Reference
+    category: str = "monadic"
+    step: Reference | None = None
+    visualizer: Reference | None = None
+    implementations: typing.Dict[str, Reference] = dataclasses.field(default_factory=dict)
+
+    def solver_class(self) -> type:
+        self.solver = _resolve(self.solver)
+        return self.solver
+
+    def step_class(self) -> type | None:
+        self.step = _resolve(self.step)
+        return self.step
+
+    def visualizer_class(self) -> type | None:
+        self.visualizer = _resolve(self.visualizer)
+        return self.visualizer
+
+    def implementation(self, kind: str) -> typing.Any:
+        if kind == "scalar" and kind not in self.implementations:
+            return self.solver_class()
+        if kind not in self.implementations:
+            raise ValueError(f"Solver {self.name} has no {kind} implementation.")
+        self.implementations[kind] = _resolve(self.implementations[kind])
+        return self.implementations[kind]
+
+    def fastest_implementation(
+            self,
+            kinds: typing.Iterable[str] = IMPLEMENTATION_KINDS
+    ) -> typing.Tuple[str, typing.Any]:
+        """Return ``(kind, implementation)`` for the first of ``kinds`` this solver provides."""
+        for kind in kinds:
+            if kind == "scalar" or kind in self.implementations:
+                return kind, self.implementation(kind)
+        raise ValueError(f"Solver {self.name} has none of the implementations {tuple(kinds)}.")
+
+
+class SolverRegistry:
+    def __init__(self):
+        self._by_name: typing.Dict[str, SolverRegistration] = {}
+        self._by_reference: typing.Dict[str, SolverRegistration] = {}
+        self._loaded_groups: typing.Set[str] = set()
+
+    def register(
+            self,
+            name: str,
+            solver: Reference,
+            category: str = "monadic",
+            step: Reference | None = None,
+            visualizer: Reference | None = None,
+            implementations: typing.Dict[str, Reference] | None = None,
+            replace: bool = False
+    ) -> SolverRegistration:
+        if name in self._by_name and not replace:
+            raise ValueError(f"A solver named {name!r} is already registered.")
+        if name in self._by_name:
+            self.unregister(name)
+        registration = SolverRegistration(name, solver, category, step, visualizer, dict(implementations or {}))
+        self._by_name[name] = registration
+        # a class registered under several names is looked up as its first registration
+        self._by_reference.setdefault(self._reference_key(registration), registration)
+        return registration
+
+    def unregister(self, name: str):
+        del self._by_name[name]
+        self._by_reference.clear()
+        for registration in self._by_name.values():
+            self._by_reference.setdefault(self._reference_key(registration), registration)
+
+    @staticmethod
+    def _reference_key(registration: SolverRegistration) -> str:
+        solver = registration.solver
+        return solver if isinstance(solver, str) else reference_of(solver)
+
+    def get(self, key: str | type | typing.Any) -> SolverRegistration:
+        """Look up a registration by solver name, solver class or solver instance."""
+        if isinstance(key, str):
+            if key not in self._by_name:
+                raise ValueError(f"Unknown solver: {key!r}")
+            return self._by_name[key]
+        cls = key if isinstance(key, type) else type(key)
+        # subclasses of a registered solver fall back to the registration of their base
+        for base in cls.__mro__:
+            registration = self._by_reference.get(reference_of(base))
+            if registration is not None:
+                return registration
+        raise ValueError(f"Unknown solver type: {cls.__name__}")
+
+    def names(self, category: str | None = None) -> typing.List[str]:
+        return [name for name, registration in self._by_name.items()
+                if category is None or registration.category == category]
+
+    def __contains__(self, key: str | type | typing.Any) -> bool:
+        try:
+            self.get(key)
+        except ValueError:
+            return False
+        return True
+
+    def __iter__(self) -> typing.Iterator[SolverRegistration]:
+        return iter(list(self._by_name.values()))
+
+    def load_plugins(self, group: str = ENTRY_POINT_GROUP):
+        """Register the solvers advertised under the entry-point ``group``; repeated calls are no-ops."""
+        if group in self._loaded_groups:
+            return
+        self._loaded_groups.add(group)
+        for entry_point in importlib.metadata.entry_points(group=group):
+            target = entry_point.load()
+            if isinstance(target, type):
+                self.register(entry_point.name, target)
+            else:
+                target(self)
+
+
+registry = SolverRegistry()
+registry.register(
+    "BisectionSolver", "solvers.monadic.bisection:BisectionSolver",
+    step="solvers.monadic.bisection:BisectionStep",
+    visualizer="visualizers.monadic.bisection_visualizer:BisectionVisualizer",
+)
+registry.register(
+    "NewtonSolver", "solvers.monadic.newton:NewtonSolver",
+    step="solvers.monadic.newton:NewtonStep",
+    visualizer="visualizers.monadic.newton_visualizer:NewtonVisualizer",
+)
+registry.register(
+    "NewtonDownhillSolver", "solvers.monadic.newton_downhill:NewtonDownhillSolver",
+    step="solvers.monadic.newton_downhill:NewtonDownhillStep",
+    visualizer="visualizers.monadic.newton_downhill_visualizer:NewtonDownhillVisualizer",
+)
+registry.register(
+    "AitkenSolver", "solvers.monadic.aitken:AitkenSolver",
+    step="solvers.monadic.aitken:AitkenStep",
+    visualizer="visualizers.monadic.aitken_visualizer:AitkenVisualizer",
+)
+registry.register(
+    "PortfolioSolver", "solvers.monadic.portfolio:PortfolioSolver",
+    step="solvers.monadic.portfolio:PortfolioStep",
+)
+registry.register(
+    "PolynomialSolver", "solvers.monadic.polynomial:PolynomialSolver",
+    step="solvers.monadic.polynomial:PolynomialStep",
+    implementations={"vectorized": "solvers.monadic.polynomial:solve_jobs"},
+)
+registry.register(
+    "ContinuationSolver", "solvers.monadic.continuation:ContinuationSolver", category="continuation",
+    step="solvers.monadic.continuation:ContinuationStep",
+)
+registry.register(
+    "GaussSolver", "solvers.linear_system.gauss:GaussSolver", category="linear_system",
+    step="solvers.linear_system.gauss:GaussStep",
+)
+registry.register(
+    "MixedPrecisionSolver", "solvers.linear_system.refinement:MixedPrecisionSolver", category="linear_system",
+    step="solvers.linear_system.refinement:RefinementStep",
+)
+registry.register(
+    "StructuredSolver", "solvers.linear_system.structured:StructuredSolver", category="linear_system",
+    step="solvers.linear_system.structured:StructureStep",
+)
+registry.register(
+    "OutOfCoreSolver", "solvers.linear_system.out_of_core:OutOfCoreSolver", category="linear_system",
+    step="solvers.linear_system.out_of_core:PanelStep",
+)
+registry.register(
+    "NewtonSystemSolver", "solvers.nonlinear_system.newton:NewtonSystemSolver", category="nonlinear_system",
+    step="solvers.nonlinear_system.nonlinear_system_solver:NonlinearSystemStep",
+)
+registry.register(
+    "BroydenSolver", "solvers.nonlinear_system.broyden:BroydenSolver", category="nonlinear_system",
+    step="solvers.nonlinear_system.nonlinear_system_solver:NonlinearSystemStep",
+)
+registry.register(
+    "AndersonSolver", "solvers.nonlinear_system.fixed_point:AndersonSolver", category="nonlinear_system",
+    step="solvers.nonlinear_system.fixed_point:FixedPointStep",
+)
+registry.register(
+    "ExtrapolationSolver", "solvers.nonlinear_system.fixed_point:ExtrapolationSolver", category="nonlinear_system",
+    step="solvers.nonlinear_system.fixed_point:FixedPointStep",
+)
@@ -1,6 +1,9 @@
 import dataclasses
 import typing
 
+if typing.TYPE_CHECKING:
+    from solvers.profiling import TraceMemory
+
 
 @dataclasses.dataclass
 class Step:
@@ -12,11 +15,14 @@ class SolutionTrace:
     steps: typing.List[Step] = dataclasses.field(default_factory=list)
     final_result: typing.Any = None
     has_converged: bool = False
+    # the solve was stopped by its time or evaluation budget (see solvers.budget)
+    budget_exhausted: bool = False
 
     def clear(self):
         self.steps.clear()
         self.final_result = None
         self.has_converged = False
+        self.budget_exhausted = False
 
     def print(self):
         print("Solution Trace:")
@@ -25,3 +31,20 @@ class SolutionTrace:
         print("Final Result:")
         print(self.final_result)
         print(f"Has Converged: {self.has_converged}")
+        if self.budget_exhausted:
+            print("Budget Exhausted")
+
+    def save(self, path: str):
+        """Write the trace in the compact binary format of ``solvers.trace_io``."""
+        from solvers.trace_io import save_trace
+        save_trace(self, path)
+
+    def memory_usage(self) -> "TraceMemory":
+        """The bytes held by the steps, by step type, and by the final result (see ``solvers.profiling``)."""
+        from solvers.profiling import trace_memory
+        return trace_memory(self)
+
+    @staticmethod
+    def load(path: str) -> "SolutionTrace":
+        from solvers.trace_io import load_trace
+        return load_trace(path)
@@ -0,0 +1,253 @@
+"""
+Convergence diagnostics computed from solution traces.
+
+``analyze`` turns any number of monadic traces into NaN-padded arrays of iterates and
+measures all of them at once: the empirical order of convergence and asymptotic error
+constant, the contraction of the last steps, and whether a trace oscillates, stagnates or
+diverges. All estimates use the differences ``d_k = |x_{k+1} - x_k|`` of successive iterates,
+so no exact root is needed::
+
+    q ~ log(d_{k+1} / d_k) / log(d_k / d_{k-1})        C ~ d_{k+1} / d_k ** q
+
+``cheapest_solvers`` uses the measured iterations and function evaluations to pick the solver
+that converges most reliably, and most cheaply, for each class of problems.
+"""
+
+import dataclasses
+import math
+import typing
+import warnings
+
+import numpy as np
+
+from solvers.registry import reference_of, registry
+from solvers.solution_trace import SolutionTrace
+
+DEFAULT_WINDOW = 4
+# differences below this many ulps of the iterate are round-off, not progress
+ROUNDOFF_ULPS = 64
+# a tail contracting by less than this per step makes no real progress
+STAGNATION_CONTRACTION = 0.9
+# a tail growing by more than this per step runs away
+DIVERGENCE_GROWTH = 1.1
+
+
+@dataclasses.dataclass(frozen=True)
+class StepMetrics:
+    """How to read a step type: the field holding the iterate and the function evaluations spent."""
+    iterate: str
+    # evaluations per step, or a function of the step columns named in ``columns`` giving them
+    evaluations: float | typing.Callable[[typing.Dict[str, np.ndarray]], np.ndarray]
+    # evaluations outside the recorded steps (endpoint checks, the final convergence test)
+    overhead: float = 0
+    columns: typing.Tuple[str, ...] = ()
+
+
+# step type reference ("module:qualname") -> metrics; numerical derivatives count as two evaluations
+STEP_METRICS: typing.Dict[str, StepMetrics] = {
+    "solvers.monadic.newton:NewtonStep": StepMetrics("guess", 3, overhead=3),
+    "solvers.monadic.newton_downhill:NewtonDownhillStep": StepMetrics(
+        # f and f' at x, then one evaluation for every halving of the damping factor
+        "x", lambda columns: 4 + np.log2(columns["damping_factor"]), overhead=1, columns=("damping_factor",)
+    ),
+    "solvers.monadic.aitken:AitkenStep": StepMetrics("x", 2, overhead=1),
+    "solvers.monadic.bisection:BisectionStep": StepMetrics("middle", 1, overhead=2),
+}
+
+
+@dataclasses.dataclass
+class TraceAnalysis:
+    """Diagnostics of a batch of traces, one array entry per trace; NaN where a value cannot be estimated."""
+    solver: np.ndarray
+    iterations: np.ndarray
+    evaluations: np.ndarray
+    has_converged: np.ndarray
+    order: np.ndarray
+    asymptotic_constant: np.ndarray
+    contraction: np.ndarray
+    oscillating: np.ndarray
+    stagnating: np.ndarray
+    diverging: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.solver)
+
+    def __getitem__(self, index: int) -> typing.Dict[str, typing.Any]:
+        values = {field.name: getattr(self, field.name)[index] for field in dataclasses.fields(self)}
+        return {name: value.item() if isinstance(value, np.generic) else value for name, value in values.items()}
+
+
+def _step_reference(trace: typing.Any) -> str | None:
+    if isinstance(trace, SolutionTrace):
+        return reference_of(type(trace.steps[0])) if trace.steps else None
+    # a TraceReader over a trace file
+    return trace.header["step_type"]
+
+
+def _solver_of_step(step_reference: str | None) -> str | None:
+    for registration in registry:
+        step = registration.step
+        if step is not None and (step if isinstance(step, str) else reference_of(step)) == step_reference:
+            return registration.name
+    return None
+
+
+def _columns(trace: typing.Any, names: typing.Iterable[str]) -> typing.Dict[str, np.ndarray]:
+    if isinstance(trace, SolutionTrace):
+        return {name: np.fromiter((getattr(step, name) for step in trace.steps), float, len(trace.steps))
+                for name in names}
+    return {name: np.asarray(trace.field(name), dtype=float) for name in names}
+
+
+def _tail(mask: np.ndarray, window: int) -> np.ndarray:
+    """Mark the last ``window`` true entries of every row of ``mask``."""
+    from_the_end = np.cumsum(mask[:, ::-1], axis=1)[:, ::-1]
+    return mask & (from_the_end <= window)
+
+
+def _masked_median(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    with warnings.catch_warnings():
+        # rows without any estimate give NaN, which is the intended answer
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nanmedian(np.where(mask, values, np.nan), axis=1)
+
+
+def _stack(traces: typing.Sequence[typing.Any], metrics: typing.Sequence[StepMetrics | None]) -> np.ndarray:
+    """Iterates of every trace (steps followed by the final result), NaN padded to a matrix."""
+    rows = []
+    for trace, trace_metrics in zip(traces, metrics):
+        iterates = _columns(trace, (trace_metrics.iterate,))[trace_metrics.iterate] if trace_metrics else ()
+        final_result = trace.final_result
+        rows.append(np.append(iterates, np.nan if final_result is None else float(final_result)))
+    iterates = np.full((len(rows), max(map(len, rows), default=0)), np.nan)
+    for index, row in enumerate(rows):
+        iterates[index, :len(row)] = row
+    return iterates
+
+
+def analyze(
+        traces: typing.Iterable[typing.Any],
+        solvers: typing.Sequence[str] | None = None,
+        window: int = DEFAULT_WINDOW
+) -> TraceAnalysis:
+    """
+    Measure the convergence of monadic traces (``SolutionTrace`` objects or ``TraceReader``
+    views of trace files). ``solvers`` names the registered solver of each trace; by default it
+    is looked up from the step type, which leaves traces without steps unattributed. The order,
+    constant and contraction are medians over the last ``window`` usable steps.
+    """
+    if window < 2:
+        raise ValueError(f"The window must span at least 2 steps, got {window}.")
+    traces = list(traces)
+    if solvers is not None and len(solvers) != len(traces):
+        raise ValueError(f"Got {len(solvers)} solver names for {len(traces)} traces.")
+
+    references = [_step_reference(trace) for trace in traces]
+    if solvers is None:
+        solvers = [_solver_of_step(reference) for reference in references]
+    for index, name in enumerate(solvers):
+        if references[index] is None and name is not None and registry.get(name).step is not None:
+            step = registry.get(name).step
+            references[index] = step if isinstance(step, str) else reference_of(step)
+    metrics = []
+    for reference in references:
+        if reference is not None and reference not in STEP_METRICS:
+            raise ValueError(f"No convergence metrics for step type {reference}.")
+        metrics.append(STEP_METRICS.get(reference))
+
+    iterations = np.array([len(trace.steps) if isinstance(trace, SolutionTrace) else len(trace)
+                           for trace in traces], dtype=int)
+    evaluations = np.full(len(traces), np.nan)
+    for index, (trace, trace_metrics) in enumerate(zip(traces, metrics)):
+        if trace_metrics is None:
+            continue
+        per_step = trace_metrics.evaluations
+        if callable(per_step):
+            per_step = per_step(_columns(trace, trace_metrics.columns))
+        evaluations[index] = np.sum(np.broadcast_to(per_step, iterations[index])) + trace_metrics.overhead
+
+    iterates = _stack(traces, metrics)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        signed = np.diff(iterates, axis=1)
+        differences = np.abs(signed)
+        floor = ROUNDOFF_ULPS * np.finfo(float).eps * np.maximum(1.0, np.abs(iterates[:, :-1]))
+        differences[~(differences > floor)] = np.nan
+        ratios = differences[:, 1:] / differences[:, :-1]
+        logs = np.log(ratios)
+
+        # consecutive ratios of a converging sequence give one order estimate each
+        orders = logs[:, 1:] / logs[:, :-1]
+        order_mask = _tail(np.isfinite(orders) & (ratios[:, :-1] < STAGNATION_CONTRACTION), window)
+        order = _masked_median(orders, order_mask)
+
+        constants = differences[:, 2:] / differences[:, 1:-1] ** order[:, np.newaxis]
+        asymptotic_constant = _masked_median(constants, order_mask & np.isfinite(constants))
+
+        ratio_mask = _tail(np.isfinite(logs), window)
+        contraction = np.exp(_masked_median(logs, ratio_mask))
+
+    signs = np.where(np.isfinite(differences), np.sign(signed), 0)
+    products = signs[:, 1:] * signs[:, :-1]
+    pair_mask = _tail(products != 0, window - 1)
+    oscillating = ((pair_mask.sum(axis=1) >= 2) & np.all(np.where(pair_mask, products < 0, True), axis=1)
+                   & (contraction >= STAGNATION_CONTRACTION))
+    diverging = contraction > DIVERGENCE_GROWTH
+    has_converged = np.array([bool(trace.has_converged) for trace in traces], dtype=bool)
+    stagnating = (~has_converged & ~oscillating & ~diverging
+                  & ~(contraction < STAGNATION_CONTRACTION))
+
+    return TraceAnalysis(
+        solver=np.array(solvers, dtype=object),
+        iterations=iterations,
+        evaluations=evaluations,
+        has_converged=has_converged,
+        order=order,
+        asymptotic_constant=asymptotic_constant,
+        contraction=contraction,
+        oscillating=oscillating,
+        stagnating=stagnating,
+        diverging=diverging,
+    )
+
+
+def cheapest_solvers(
+        analysis: TraceAnalysis,
+        problem_classes: typing.Sequence[typing.Hashable],
+        cost: str = "evaluations"
+) -> typing.Dict[typing.Hashable, str]:
+    """
+    Pick a solver for every problem class: the one converging on the largest share of its
+    traces of that class, and among those the one with the lowest mean ``cost``
+    (``"evaluations"`` or ``"iterations"``) over its converged traces.
+    """
+    if len(problem_classes) != len(analysis):
+        raise ValueError(f"Got {len(problem_classes)} problem classes for {len(analysis)} traces.")
+    if cost not in ("evaluations", "iterations"):
+        raise ValueError(f"Cost must be 'evaluations' or 'iterations', got {cost!r}.")
+    if any(solver is None for solver in analysis.solver):
+        raise ValueError("Every trace must be attributed to a solver; pass the solver names to analyze().")
+    if len(analysis) == 0:
+        return {}
+
+    class_numbers = {problem_class: number for number, problem_class in enumerate(dict.fromkeys(problem_classes))}
+    classes = list(class_numbers)
+    class_index = np.array([class_numbers[problem_class] for problem_class in problem_classes])
+    solvers, solver_index = np.unique(analysis.solver.astype(str), return_inverse=True)
+    cells = len(classes) * len(solvers)
+    key = class_index * len(solvers) + solver_index.ravel()
+    converged = analysis.has_converged.astype(float)
+    costs = np.nan_to_num(getattr(analysis, cost).astype(float), nan=math.inf)
+
+    runs = np.bincount(key, minlength=cells)
+    converged_runs = np.bincount(key, weights=converged, minlength=cells)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        success_rate = np.where(runs > 0, converged_runs / runs, -1.0).reshape(len(classes), len(solvers))
+        mean_cost = (np.bincount(key, weights=np.where(converged > 0, costs, 0.0), minlength=cells)
+                     / converged_runs).reshape(len(classes), len(solvers))
+    mean_cost = np.where(np.isnan(mean_cost), math.inf, mean_cost)
+    most_reliable = success_rate == success_rate.max(axis=1, keepdims=True)
+    candidate_cost = np.where(most_reliable, mean_cost, math.inf)
+    # where nothing converged, any of the most reliable (never converging) solvers will do
+    best = np.where(np.isfinite(candidate_cost).any(axis=1), np.argmin(candidate_cost, axis=1),
+                    np.argmax(success_rate, axis=1))
+    return {problem_class: str(solvers[best[index]]) for index, problem_class in enumerate(classes)}
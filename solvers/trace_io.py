@@ -0,0 +1,263 @@
+"""
+Compact binary storage for ``SolutionTrace`` steps.
+
+File layout::
+
+    b"NATRACE1" | uint32 header capacity | JSON header (space padded) | records | final result
+
+The JSON header names the step dataclass and describes each of its fields (scalar dtype,
+or dtype and shape for ``np.ndarray`` fields such as ``GaussStep.matrix_snapshot``). Records
+are fixed width, one per step, laid out as a NumPy structured dtype, so array fields are
+stored as raw C-order blocks exactly like the payload of a ``.npy`` file. The final result
+follows the records as a complete ``.npy`` block once the writer is closed.
+
+``TraceWriter`` streams steps to disk as a solver produces them, so memory use does not
+grow with the trace, and ``TraceReader`` memory-maps the records for random access.
+"""
+
+import dataclasses
+import importlib
+import json
+import os
+import struct
+import typing
+
+import numpy as np
+
+from solvers.registry import reference_of
+from solvers.solution_trace import SolutionTrace, Step
+
+MAGIC = b"NATRACE1"
+DEFAULT_STRING_WIDTH = 96
+_ALIGNMENT = 64
+_HEADER_SLACK = 256
+_CAPACITY = struct.Struct("<I")
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+# the kind of a field annotated with one of these types, whatever the type of its first value
+_ANNOTATED_KINDS = {bool: ("bool", "|b1"), int: ("int", "<i8"), float: ("float", "<f8"), complex: ("complex", "<c16")}
+
+
+def _field_schema(
+        name: str,
+        value: typing.Any,
+        string_width: int,
+        annotation: typing.Any = None
+) -> typing.Dict[str, typing.Any]:
+    """
+    The storage of a step field. Scalar fields follow the annotation of the step dataclass, so
+    that e.g. a ``float`` field whose first value happens to be an int still stores floats;
+    unannotated or loosely annotated fields follow their first value.
+    """
+    if not isinstance(value, np.ndarray) and annotation in _ANNOTATED_KINDS:
+        kind, dtype = _ANNOTATED_KINDS[annotation]
+        return {"name": name, "kind": kind, "dtype": dtype}
+    if isinstance(value, np.ndarray):
+        return {"name": name, "kind": "array", "dtype": value.dtype.str, "shape": list(value.shape)}
+    if isinstance(value, (bool, np.bool_)):
+        return {"name": name, "kind": "bool", "dtype": "|b1"}
+    if isinstance(value, (int, np.integer)):
+        return {"name": name, "kind": "int", "dtype": "<i8"}
+    if isinstance(value, (float, np.floating)):
+        return {"name": name, "kind": "float", "dtype": "<f8"}
+    if isinstance(value, (complex, np.complexfloating)):
+        return {"name": name, "kind": "complex", "dtype": "<c16"}
+    if isinstance(value, str):
+        return {"name": name, "kind": "str", "dtype": f"|S{string_width}"}
+    raise ValueError(f"Cannot store step field {name!r} of type {type(value).__name__}.")
+
+
+def _record_dtype(fields: typing.List[typing.Dict[str, typing.Any]]) -> np.dtype:
+    return np.dtype([(field["name"], field["dtype"], tuple(field.get("shape", ()))) for field in fields])
+
+
+def _resolve_step_type(reference: str) -> type:
+    module_name, _, qualname = reference.partition(":")
+    value = importlib.import_module(module_name)
+    for attribute in qualname.split("."):
+        value = getattr(value, attribute)
+    return value
+
+
+class TraceWriter:
+    """
+    Streams steps to a trace file. Use ``writer.trace`` as a solver's trace to write steps
+    while the solver runs; its final result, convergence flag and budget status are saved on ``close()``.
+    """
+
+    def __init__(self, path: str, string_width: int = DEFAULT_STRING_WIDTH):
+        self.path = path
+        self.string_width = string_width
+        self.trace = SolutionTrace(steps=self)
+        self._file = open(path, "w+b")
+        self._header: typing.Dict[str, typing.Any] = {"step_type": None, "fields": [], "count": None}
+        self._capacity = 0
+        self._record: np.ndarray | None = None
+        self._count = 0
+        self._write_header()
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _write_header(self):
+        encoded = json.dumps(self._header).encode()
+        if self._capacity == 0:
+            self._capacity = _align(len(MAGIC) + _CAPACITY.size + len(encoded) + _HEADER_SLACK) - len(MAGIC) - \
+                             _CAPACITY.size
+        if len(encoded) > self._capacity:
+            raise ValueError("Trace header does not fit into the reserved space.")
+        self._file.seek(0)
+        self._file.write(MAGIC + _CAPACITY.pack(self._capacity) + encoded.ljust(self._capacity))
+
+    @property
+    def data_offset(self) -> int:
+        return len(MAGIC) + _CAPACITY.size + self._capacity
+
+    def _start(self, step: Step):
+        step_type = type(step)
+        annotations = typing.get_type_hints(step_type)
+        fields = [_field_schema(field.name, getattr(step, field.name), self.string_width, annotations.get(field.name))
+                  for field in dataclasses.fields(step)]
+        self._header.update(step_type=reference_of(step_type), fields=fields)
+        self._capacity = 0
+        self._write_header()
+        self._record = np.zeros(1, dtype=_record_dtype(fields))
+
+    def append(self, step: Step):
+        if self._record is None:
+            self._start(step)
+        record = self._record[0]
+        for field in self._header["fields"]:
+            value = getattr(step, field["name"])
+            if field["kind"] == "str":
+                value = value.encode()[:self.string_width]
+            elif field["kind"] == "array" and np.shape(value) != tuple(field["shape"]):
+                raise ValueError(f"Field {field['name']!r} changed shape from {tuple(field['shape'])} "
+                                 f"to {np.shape(value)}.")
+            record[field["name"]] = value
+        self._file.seek(self.data_offset + self._count * self._record.itemsize)
+        self._file.write(self._record.tobytes())
+        self._count += 1
+
+    def extend(self, steps: typing.Iterable[Step]):
+        for step in steps:
+            self.append(step)
+
+    def clear(self):
+        self._count = 0
+        self._file.truncate(self.data_offset)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> typing.Iterator[Step]:
+        self._file.flush()
+        if self._count == 0:
+            return iter(())
+        return iter(TraceReader(self.path, count=self._count))
+
+    def close(self):
+        if self._file.closed:
+            return
+        end = self.data_offset + self._count * (self._record.itemsize if self._record is not None else 0)
+        self._file.seek(end)
+        self._file.truncate(end)
+        if self.trace.final_result is not None:
+            self._header["final_result_offset"] = end
+            np.save(self._file, np.asarray(self.trace.final_result), allow_pickle=False)
+        self._header.update(count=self._count, has_converged=self.trace.has_converged,
+                            budget_exhausted=self.trace.budget_exhausted)
+        self._write_header()
+        self._file.close()
+
+
+class TraceReader:
+    """Memory-mapped, random-access view of a trace file written by ``TraceWriter``."""
+
+    def __init__(self, path: str, count: int | None = None):
+        self.path = path
+        with open(path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a trace file.")
+            (capacity,) = _CAPACITY.unpack(file.read(_CAPACITY.size))
+            self.header: typing.Dict[str, typing.Any] = json.loads(file.read(capacity))
+            self.data_offset = len(MAGIC) + _CAPACITY.size + capacity
+
+            self.has_converged: bool = self.header.get("has_converged", False)
+            self.budget_exhausted: bool = self.header.get("budget_exhausted", False)
+            self.final_result: typing.Any = None
+            if self.header.get("final_result_offset") is not None:
+                file.seek(self.header["final_result_offset"])
+                final_result = np.load(file, allow_pickle=False)
+                self.final_result = final_result.item() if final_result.ndim == 0 else final_result
+
+        self.fields: typing.List[typing.Dict[str, typing.Any]] = self.header["fields"]
+        self.step_type: type | None = None
+        self.records: np.ndarray | None = None
+        if self.header["step_type"] is not None:
+            self.step_type = _resolve_step_type(self.header["step_type"])
+            dtype = _record_dtype(self.fields)
+            if count is None:
+                # a writer that did not close cleanly leaves no count; use every complete record
+                count = self.header["count"]
+                if count is None:
+                    count = (os.path.getsize(path) - self.data_offset) // dtype.itemsize
+            if count > 0:
+                self.records = np.memmap(path, dtype=dtype, mode="r", offset=self.data_offset, shape=(count,))
+
+    def __len__(self) -> int:
+        return 0 if self.records is None else len(self.records)
+
+    def _step_at(self, index: int) -> Step:
+        record = self.records[index]
+        values = {}
+        for field in self.fields:
+            value = record[field["name"]]
+            if field["kind"] == "array":
+                value = np.array(value)
+            elif field["kind"] == "str":
+                value = bytes(value).decode(errors="ignore")
+            else:
+                value = value.item()
+            values[field["name"]] = value
+        return self.step_type(**values)
+
+    def __getitem__(self, index: int | slice) -> Step | typing.List[Step]:
+        if isinstance(index, slice):
+            return [self._step_at(i) for i in range(*index.indices(len(self)))]
+        if not -len(self) <= index < len(self):
+            raise IndexError("trace step index out of range")
+        return self._step_at(index % len(self))
+
+    def __iter__(self) -> typing.Iterator[Step]:
+        for index in range(len(self)):
+            yield self._step_at(index)
+
+    def field(self, name: str) -> np.ndarray:
+        """Memory-mapped column of one step field across all steps."""
+        if self.records is None:
+            return np.empty(0)
+        return self.records[name]
+
+    def to_trace(self) -> SolutionTrace:
+        return SolutionTrace(steps=list(self), final_result=self.final_result, has_converged=self.has_converged,
+                             budget_exhausted=self.budget_exhausted)
+
+
+def save_trace(trace: SolutionTrace, path: str, string_width: int = DEFAULT_STRING_WIDTH):
+    with TraceWriter(path, string_width) as writer:
+        writer.extend(trace.steps)
+        writer.trace.final_result = trace.final_result
+        writer.trace.has_converged = trace.has_converged
+        writer.trace.budget_exhausted = trace.budget_exhausted
+
+
+def load_trace(path: str) -> SolutionTrace:
+    return TraceReader(path).to_trace()
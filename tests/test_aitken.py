@@ -70,6 +70,20 @@ class TestAitkenSolver(unittest.TestCase):
         self.assertEqual(first.z, 1.5)
         self.assertAlmostEqual(first.slope, 0.5, places=12)
 
+    def test_aitken_iterate_matches_solve(self):
+        solver = AitkenSolver(lambda x: -0.5 * x + 1)
+        root = solver.solve(guess=0.0, tolerance=1e-12, max_iterations=50)
+        other = AitkenSolver(lambda x: -0.5 * x + 1)
+        self.assertEqual(list(other.iterate(guess=0.0, tolerance=1e-12, max_iterations=50)), solver.trace.steps)
+        self.assertEqual(other.trace.final_result, root)
+
+    def test_aitken_solve_resets_trace(self):
+        solver = AitkenSolver(lambda x: -0.5 * x + 1)
+        solver.solve(guess=0.0, tolerance=1e-12, max_iterations=50)
+        count = len(solver.trace.steps)
+        solver.solve(guess=0.0, tolerance=1e-12, max_iterations=50)
+        self.assertEqual(len(solver.trace.steps), count)
+
 
 if __name__ == '__main__':
     unittest.main()
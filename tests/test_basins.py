@@ -0,0 +1,97 @@
+import unittest
+
+import numpy as np
+
+from solvers.monadic.basins import BasinMapper
+from solvers.monadic.newton import NewtonSolver
+from solvers.monadic.newton_downhill import NewtonDownhillSolver
+from visualizers.monadic.basin_visualizer import render_basins, root_colors
+
+
+def cubic(z):
+    return z * z * z - 1
+
+
+def cubic_derivative(z):
+    return 3 * z * z
+
+
+def real_cubic(x):
+    # one real root at -1.769, and a local minimum of |f| at 0.816 where Newton cycles
+    return x * x * x - 2 * x + 2
+
+
+class TestBasinMapper(unittest.TestCase):
+    def test_roots_of_unity(self):
+        mapper = BasinMapper(cubic, cubic_derivative)
+        basin_map = mapper.map_grid((-2, 2), (-2, 2), (64, 64))
+        self.assertEqual(basin_map.root_index.shape, (64, 64))
+        self.assertEqual(basin_map.extent, (-2, 2, -2, 2))
+        np.testing.assert_allclose(np.sort_complex(basin_map.roots),
+                                   np.sort_complex(np.exp(2j * np.pi * np.arange(3) / 3)), atol=1e-12)
+        self.assertTrue(basin_map.converged.all())
+        # the real axis lies in the basin of 1 to the right of the origin
+        one = np.argmin(np.abs(basin_map.roots - 1))
+        self.assertTrue(np.all(basin_map.root_index[32, 40:] == one))
+        # the basins of the complex roots mirror each other in the real axis
+        np.testing.assert_array_equal(basin_map.root_index == one, (basin_map.root_index == one)[::-1])
+
+    def test_chunking_does_not_change_the_map(self):
+        mapper = BasinMapper(cubic, cubic_derivative)
+        whole = mapper.map_grid((-1, 1), (-1, 1), (40, 50))
+        chunked = mapper.map_grid((-1, 1), (-1, 1), (40, 50), roots=whole.roots, chunk_size=333)
+        np.testing.assert_array_equal(whole.root_index, chunked.root_index)
+        np.testing.assert_array_equal(whole.iterations, chunked.iterations)
+
+    def test_agrees_with_single_runs(self):
+        starts = np.linspace(-3, 3, 61)
+        for method, solver_class in (("newton", NewtonSolver), ("newton_downhill", NewtonDownhillSolver)):
+            with self.subTest(method=method):
+                basin_map = BasinMapper(real_cubic, method=method).map(starts, tolerance=1e-12)
+                for start, root_index, iterations in zip(starts, basin_map.root_index, basin_map.iterations):
+                    solver = solver_class(real_cubic)
+                    root = solver.solve(float(start), 1e-12, max_iterations=BasinMapper.DEFAULT_MAX_ITERATIONS)
+                    self.assertEqual(iterations, len(solver.trace.steps))
+                    self.assertEqual(root_index >= 0, solver.trace.has_converged)
+                    if root_index >= 0:
+                        self.assertAlmostEqual(basin_map.roots[root_index], root, places=8)
+
+    def test_given_roots(self):
+        # the root at 1 is left out, so its basin counts as not converged
+        roots = np.exp(2j * np.pi * np.array([1, 2]) / 3)
+        basin_map = BasinMapper(cubic, cubic_derivative).map(np.array([[2.0, -1 + 1j], [-1 - 1j, 0.0]]), roots=roots)
+        np.testing.assert_array_equal(basin_map.root_index, [[-1, 0], [1, -1]])
+        np.testing.assert_array_equal(basin_map.roots, roots)
+        # a zero derivative stalls at once
+        self.assertEqual(basin_map.iterations[1, 1], 0)
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            BasinMapper(cubic, method="halley")
+        mapper = BasinMapper(cubic)
+        with self.assertRaises(ValueError):
+            mapper.map_grid((-1, 1), (-1, 1), (0, 10))
+        with self.assertRaises(ValueError):
+            mapper.map(np.zeros(3), chunk_size=0)
+        with self.assertRaises(ValueError):
+            mapper.map(np.zeros(3), max_iterations=0)
+
+
+class TestBasinRendering(unittest.TestCase):
+    def test_render(self):
+        basin_map = BasinMapper(cubic, cubic_derivative).map_grid((-2, 2), (-2, 2), (32, 48))
+        basin_map.root_index[0, 0] = -1
+        image = render_basins(basin_map)
+        self.assertEqual((image.shape, image.dtype), ((32, 48, 3), np.uint8))
+        np.testing.assert_array_equal(image[0, 0], [0, 0, 0])
+        # every basin has its own color
+        self.assertEqual(len({tuple(image[basin_map.root_index == index][0] > 0) for index in range(3)}), 3)
+
+    def test_root_colors(self):
+        np.testing.assert_allclose(root_colors(3), np.eye(3))
+        with self.assertRaises(ValueError):
+            render_basins(BasinMapper(cubic, cubic_derivative).map(np.array([1.0, -0.5 + 0.9j])), colors=np.eye(3)[:0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from batch import Job, read_jobs, run_batch, run_job
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory.name, name)
+
+    def test_read_jsonl_jobs(self):
+        with open(self.path("jobs.jsonl"), "w") as file:
+            file.write(json.dumps({"id": "a", "solver": "NewtonSolver", "expression": "x**2 - 2",
+                                   "kwargs": {"guess": 1.0}, "tolerance": 1e-12}) + "\n\n")
+            file.write(json.dumps({"solver": "AitkenSolver", "expression": "-0.5*x",
+                                   "options": {"is_fixed_point": False}}) + "\n")
+        jobs = list(read_jobs(self.path("jobs.jsonl")))
+        self.assertEqual(jobs[0], Job("a", "NewtonSolver", "x**2 - 2", {"guess": 1.0, "tolerance": 1e-12}))
+        self.assertEqual(jobs[1].id, "3")
+        self.assertEqual(jobs[1].options, {"is_fixed_point": False})
+
+    def test_read_csv_jobs(self):
+        with open(self.path("jobs.csv"), "w") as file:
+            file.write("id,solver,expression,interval,tolerance\n")
+            file.write('b,BisectionSolver,x**3 - x - 2,"[1, 2]",1e-10\n')
+        (job,) = read_jobs(self.path("jobs.csv"))
+        self.assertEqual(job, Job("b", "BisectionSolver", "x**3 - x - 2", {"interval": [1, 2], "tolerance": 1e-10}))
+
+    def test_run_job_reports_errors(self):
+        record = run_job(Job("1", "NoSuchSolver", "x", {}))
+        self.assertIn("NoSuchSolver", record["error"])
+        record = run_job(Job("2", "NewtonSolver", "open(x)", {"guess": 1.0, "tolerance": 1e-8}))
+        self.assertIn("ExpressionError", record["error"])
+
+    def test_run_batch_streams_all_results(self):
+        jobs = [Job(str(i), "NewtonSolver", f"x**2 - {i}", {"guess": 1.0, "tolerance": 1e-12}) for i in range(1, 6)]
+        jobs.append(Job("bisection", "BisectionSolver", "x**3 - x - 2", {"interval": [1, 2], "tolerance": 1e-10}))
+        jobs.append(Job("broken", "NewtonSolver", "x +", {}))
+        for workers in (1, 2):
+            output = self.path(f"results-{workers}.jsonl")
+            summary = run_batch(jobs, output, workers=workers, progress=None)
+            self.assertEqual((summary.total, summary.completed, summary.converged, summary.failed), (7, 7, 6, 1))
+            with open(output) as file:
+                records = {record["id"]: record for record in map(json.loads, file)}
+            self.assertEqual(len(records), 7)
+            self.assertTrue(math.isclose(records["4"]["result"], 2.0, abs_tol=1e-12))
+            self.assertTrue(math.isclose(records["bisection"]["result"], 1.5213797, abs_tol=1e-7))
+            self.assertIsNotNone(records["broken"]["error"])
+
+    def test_run_batch_csv_output(self):
+        output = self.path("results.csv")
+        run_batch([Job("1", "NewtonSolver", "x - 3", {"guess": 0.0, "tolerance": 1e-12})], output, progress=None)
+        with open(output) as file:
+            header, row = file.read().splitlines()
+        self.assertTrue(header.startswith("id,solver,expression,result"))
+        self.assertTrue(row.startswith("1,NewtonSolver,x - 3,3.0"))
+
+    def test_batch_does_not_import_matplotlib(self):
+        code = "import sys, batch; print('matplotlib' in sys.modules or 'visualizers' in sys.modules)"
+        output = subprocess.check_output([sys.executable, "-c", code], cwd=REPOSITORY_ROOT, text=True)
+        self.assertEqual(output.strip(), "False")
+
+
+if __name__ == '__main__':
+    unittest.main()
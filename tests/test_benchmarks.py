@@ -0,0 +1,66 @@
+import json
+import os
+import tempfile
+import unittest
+
+from benchmarks import compare, run
+from benchmarks.workloads import Benchmark, all_benchmarks
+
+
+def _results(**medians):
+    return {"metadata": {}, "benchmarks": {name: {"median": median} for name, median in medians.items()}}
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_workloads_cover_every_group(self):
+        benchmarks = all_benchmarks()
+        self.assertEqual({benchmark.group for benchmark in benchmarks}, {"monadic", "linear_system", "visualizer"})
+        self.assertEqual(len({benchmark.name for benchmark in benchmarks}), len(benchmarks))
+        gauss_sizes = [benchmark.params["n"] for benchmark in benchmarks if benchmark.group == "linear_system"]
+        self.assertEqual((min(gauss_sizes), max(gauss_sizes)), (10, 2000))
+
+    def test_tiled_gauss_scales_over_thread_counts(self):
+        threads = [benchmark.params["threads"] for benchmark in all_benchmarks()
+                   if benchmark.name.startswith("linear_system.gauss_tiled.n500.")]
+        self.assertEqual(threads[0], 1)
+        self.assertTrue(all(count <= (os.cpu_count() or 1) for count in threads))
+
+    def test_select_skips_slow_unless_asked(self):
+        benchmarks = all_benchmarks()
+        names = [benchmark.name for benchmark in run.select(benchmarks, ["linear_system.*"])]
+        self.assertIn("linear_system.gauss.n500", names)
+        self.assertNotIn("linear_system.gauss.n2000", names)
+        self.assertIn("linear_system.gauss.n2000",
+                      [benchmark.name for benchmark in run.select(benchmarks, ["linear_system.*"], True)])
+
+    def test_run_records_timings_and_errors(self):
+        def broken():
+            raise RuntimeError("boom")
+
+        benchmarks = run.select(all_benchmarks(), ["monadic.newton.easy.cheap"]) + [Benchmark("broken", "test", broken)]
+        results = run.run_benchmarks(benchmarks, repeat=2, progress=None)
+        timing = results["benchmarks"]["monadic.newton.easy.cheap"]
+        self.assertLessEqual(timing["min"], timing["median"])
+        self.assertGreaterEqual(timing["number"], 1)
+        self.assertEqual(results["benchmarks"]["broken"]["error"], "RuntimeError: boom")
+        self.assertIn("numpy", results["metadata"])
+
+    def test_compare_flags_regressions(self):
+        report = compare.compare(_results(a=1.0, b=1.0, c=1.0, d=1.0), _results(a=1.5, b=1.05, c=0.5, e=1.0), 0.1)
+        self.assertEqual([comparison.name for comparison in report.regressions], ["a"])
+        self.assertEqual([comparison.name for comparison in report.unchanged], ["b"])
+        self.assertEqual([comparison.name for comparison in report.improvements], ["c"])
+        self.assertEqual(report.missing, ["d", "e"])
+
+    def test_compare_exit_code(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [os.path.join(directory, name) for name in ("baseline.json", "current.json")]
+            for path, median in zip(paths, (1.0, 2.0)):
+                with open(path, "w") as file:
+                    json.dump(_results(a=median), file)
+            self.assertEqual(compare.main([paths[0], paths[1]]), 1)
+            self.assertEqual(compare.main([paths[0], paths[0]]), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
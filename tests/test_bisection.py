@@ -49,6 +49,23 @@ class TestBisectionSolver(unittest.TestCase):
         root = solver.solve(interval, tolerance=1e-8)
         self.assertTrue(math.isclose(root, 0.0, abs_tol=1e-8))
 
+    def test_bisection_right_endpoint_trace(self):
+        solver = BisectionSolver(function=lambda x: x - 1)
+        solver.solve(Interval(-2.0, 1.0), tolerance=1e-8)
+        self.assertEqual(solver.trace.final_result, 1.0)
+
+    def test_bisection_iterate_validates_eagerly(self):
+        solver = BisectionSolver(function=lambda x: x ** 2 + 1)
+        with self.assertRaises(ValueError):
+            solver.iterate(Interval(-1.0, 1.0), tolerance=1e-8)
+
+    def test_bisection_iterate_interleaves(self):
+        first = BisectionSolver(function=lambda x: x - 0.3).iterate(Interval(0.0, 1.0), tolerance=1e-6)
+        second = BisectionSolver(function=lambda x: x - 0.7).iterate(Interval(0.0, 1.0), tolerance=1e-6)
+        for a, b in zip(first, second):
+            self.assertEqual(a.iteration, b.iteration)
+            self.assertTrue(math.isclose(a.left + b.right, 1.0, abs_tol=1e-12))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,199 @@
+import itertools
+import math
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from solvers.budget import Budget, BudgetExhausted
+from solvers.cache import SolveCache
+from solvers.linear_system.gauss import GaussSolver
+from solvers.linear_system.out_of_core import OutOfCoreSolver
+from solvers.linear_system.refinement import MixedPrecisionSolver
+from solvers.linear_system.structured import StructuredSolver
+from solvers.monadic.bisection import BisectionSolver
+from solvers.monadic.continuation import ContinuationSolver
+from solvers.monadic.interval import Interval
+from solvers.monadic.monadic_equation_solver import MonadicEquationSolverNotConvergedException
+from solvers.monadic.newton import NewtonSolver
+from solvers.monadic.newton_downhill import NewtonDownhillSolver
+from solvers.monadic.polynomial import PolynomialSolver
+from solvers.monadic.portfolio import PortfolioSolver
+from solvers.trace_io import load_trace, save_trace
+
+
+class _RecordingFunction:
+    def __init__(self, function, delay: float = 0.0):
+        self.function = function
+        self.delay = delay
+        self.points = []
+
+    def __call__(self, x, *args):
+        if self.delay:
+            time.sleep(self.delay)
+        self.points.append(x)
+        return self.function(x, *args)
+
+
+class TestBudget(unittest.TestCase):
+    def test_rejects_non_positive_limits(self):
+        with self.assertRaises(ValueError):
+            Budget(seconds=0)
+        with self.assertRaises(ValueError):
+            Budget(evaluations=0)
+
+    def test_unlimited_budget_changes_nothing(self):
+        function = lambda x: x * x - 2
+        plain = NewtonDownhillSolver(function)
+        budgeted = NewtonDownhillSolver(function)
+        self.assertEqual(plain.solve(1.0, 1e-12), budgeted.solve(1.0, 1e-12, budget=Budget()))
+        self.assertEqual(len(plain.trace.steps), len(budgeted.trace.steps))
+        self.assertTrue(budgeted.trace.has_converged)
+        self.assertFalse(budgeted.trace.budget_exhausted)
+        # the solver gets its own function back
+        self.assertIs(budgeted.function, function)
+
+    def test_evaluation_budget_returns_best_point_so_far(self):
+        function = _RecordingFunction(math.atan)
+        solver = NewtonDownhillSolver(function)
+        result = solver.solve(10.0, 1e-12, budget=Budget(evaluations=7))
+        self.assertTrue(solver.trace.budget_exhausted)
+        self.assertFalse(solver.trace.has_converged)
+        self.assertEqual(solver.trace.final_result, result)
+        self.assertEqual(len(function.points), 7)
+        self.assertEqual(result, min(function.points, key=lambda x: abs(math.atan(x))))
+
+    def test_budget_stops_inside_the_damping_loop(self):
+        # from 10, the full Newton step of atan overshoots badly and is halved many times
+        function = _RecordingFunction(math.atan)
+        unlimited = NewtonDownhillSolver(function)
+        unlimited.solve(10.0, 1e-12)
+        evaluations = len(function.points)
+        function.points.clear()
+        solver = NewtonDownhillSolver(function)
+        solver.solve(10.0, 1e-12, budget=Budget(evaluations=4))
+        self.assertTrue(solver.trace.budget_exhausted)
+        self.assertLess(len(function.points), evaluations)
+        self.assertLessEqual(len(solver.trace.steps), 1)
+
+    def test_only_solve_takes_a_budget(self):
+        # iterate yields unmetered steps; a budget there would be silently ignored
+        for solver in (NewtonSolver(math.atan), NewtonDownhillSolver(math.atan)):
+            with self.assertRaises(TypeError):
+                solver.iterate(10.0, 1e-14, budget=Budget(evaluations=1))
+
+    def test_exhausted_budget_raises_when_asked(self):
+        solver = NewtonSolver(lambda x: x * x - 2)
+        with self.assertRaisesRegex(MonadicEquationSolverNotConvergedException, "exhausted its budget"):
+            solver.solve(100.0, 1e-12, raise_exception_if_no_convergence=True, budget=Budget(evaluations=3))
+        self.assertTrue(solver.trace.budget_exhausted)
+
+    def test_time_limit(self):
+        function = _RecordingFunction(lambda x: x * x - 2, delay=0.01)
+        solver = BisectionSolver(function)
+        start = time.monotonic()
+        result = solver.solve(Interval(0, 2), tolerance=1e-15, budget=Budget(seconds=0.05))
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertTrue(solver.trace.budget_exhausted)
+        self.assertEqual(result, min(function.points, key=lambda x: abs(x * x - 2)))
+
+    def test_portfolio_methods_share_the_budget(self):
+        function = _RecordingFunction(lambda x: math.cos(x) - x)
+        solver = PortfolioSolver(function)
+        result = solver.solve(guess=3.0, interval=Interval(0, 3), budget=Budget(evaluations=5))
+        self.assertTrue(solver.trace.budget_exhausted)
+        self.assertLessEqual(len(set(function.points)), 5)
+        self.assertEqual(result, min(function.points, key=lambda x: abs(math.cos(x) - x)))
+
+    def test_continuation_returns_the_reached_grid_points(self):
+        parameters = np.linspace(1, 100, 200)
+        solver = ContinuationSolver(lambda x, p: x * x - p)
+        roots = solver.solve(1.0, parameters, budget=Budget(evaluations=100))
+        self.assertTrue(solver.trace.budget_exhausted)
+        self.assertEqual(roots.shape, (200,))
+        reached = ~np.isnan(roots)
+        self.assertTrue(reached[0])
+        self.assertFalse(reached[-1])
+        np.testing.assert_allclose(roots[reached], np.sqrt(parameters[reached]), atol=1e-10)
+
+    def test_polynomial_returns_the_roots_found(self):
+        solver = PolynomialSolver(np.poly(np.arange(1, 21)))
+        roots = solver.solve(method="newton", budget=Budget(evaluations=5))
+        self.assertTrue(solver.trace.budget_exhausted)
+        self.assertFalse(solver.trace.has_converged)
+        self.assertLess(len(roots), 20)
+
+    def test_trace_file_keeps_the_status(self):
+        solver = NewtonSolver(math.atan)
+        solver.solve(10.0, 1e-12, budget=Budget(evaluations=3))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trace.bin")
+            save_trace(solver.trace, path)
+            self.assertTrue(load_trace(path).budget_exhausted)
+
+    def test_cache_does_not_store_exhausted_solves(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with SolveCache(os.path.join(directory, "cache.sqlite")) as cache:
+                solver = NewtonSolver(lambda x: x * x - 2)
+                cache.solve(solver, guess=100.0, tolerance=1e-12, budget=Budget(evaluations=3))
+                self.assertTrue(solver.trace.budget_exhausted)
+                self.assertEqual(len(cache), 0)
+                # a solve that finishes within its budget is stored like any other
+                cache.solve(solver, guess=100.0, tolerance=1e-12, budget=Budget(evaluations=1000))
+                self.assertTrue(solver.trace.has_converged)
+                self.assertEqual(len(cache), 1)
+
+
+class TestLinearSystemDeadline(unittest.TestCase):
+    def setUp(self):
+        generator = np.random.default_rng(3)
+        self.coefficients = generator.standard_normal((300, 300)) + 300 * np.eye(300)
+        self.bias = generator.standard_normal(300)
+
+    def test_evaluation_budget_is_rejected(self):
+        with self.assertRaises(ValueError):
+            GaussSolver().solve(self.coefficients, self.bias, budget=Budget(evaluations=10))
+
+    def test_gauss_raises_when_out_of_time(self):
+        for solver in (GaussSolver(), GaussSolver(workers=2, tile_size=16)):
+            with self.assertRaises(BudgetExhausted):
+                solver.solve(self.coefficients, self.bias, record_snapshots=False, budget=Budget(seconds=1e-9))
+            self.assertTrue(solver.trace.budget_exhausted)
+            self.assertFalse(solver.trace.has_converged)
+
+    def test_generous_deadline_changes_nothing(self):
+        solver = GaussSolver()
+        result = solver.solve(self.coefficients, self.bias, record_snapshots=False, budget=Budget(seconds=60))
+        np.testing.assert_allclose(self.coefficients @ result[:, 0], self.bias, atol=1e-10)
+        self.assertFalse(solver.trace.budget_exhausted)
+
+    def test_refinement_returns_its_best_iterate(self):
+        solver = MixedPrecisionSolver()
+        with self.assertRaises(BudgetExhausted):
+            solver.solve(self.coefficients, self.bias, budget=Budget(seconds=1e-9))
+        self.assertTrue(solver.trace.budget_exhausted)
+
+        # a clock advancing one second per reading: the limit passes at the check after the second residual
+        with mock.patch("solvers.budget.time.monotonic", side_effect=itertools.count()):
+            result = solver.solve(self.coefficients, self.bias, budget=Budget(seconds=2.5))
+        self.assertTrue(solver.trace.budget_exhausted)
+        self.assertFalse(solver.trace.has_converged)
+        self.assertEqual(len(solver.trace.steps), 1)
+        residual = np.max(np.abs(self.bias - self.coefficients @ result))
+        # the corrected iterate, whose residual was computed before the clock ran out
+        self.assertLess(residual, solver.trace.steps[0].residual_norm)
+
+    def test_structured_and_out_of_core_raise_when_out_of_time(self):
+        symmetric = self.coefficients + self.coefficients.T
+        for solver, coefficients in ((StructuredSolver(block_size=16), symmetric),
+                                     (OutOfCoreSolver(memory_budget=300 * 8 * 64), self.coefficients)):
+            with self.assertRaises(BudgetExhausted):
+                solver.solve(coefficients, self.bias, budget=Budget(seconds=1e-9))
+            self.assertTrue(solver.trace.budget_exhausted)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import math
+import os
+import tempfile
+import unittest
+
+from batch import Job, run_batch
+from solvers.cache import SolveCache, fingerprint
+from solvers.monadic.aitken import AitkenSolver
+from solvers.monadic.bisection import BisectionSolver
+from solvers.monadic.continuation import ContinuationSolver
+from solvers.monadic.expression import Expression
+from solvers.monadic.interval import Interval
+from solvers.monadic.monadic_equation_solver import MonadicEquationSolverNotConvergedException
+from solvers.monadic.newton import NewtonSolver
+from solvers.monadic.portfolio import PortfolioSolver
+from solvers.nonlinear_system.fixed_point import ExtrapolationSolver
+
+
+class _CountingFunction:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, x):
+        self.calls += 1
+        return x * x - 2
+
+
+class TestSolveCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "cache.sqlite")
+        self.cache = SolveCache(self.path)
+
+    def tearDown(self):
+        self.cache.close()
+        self.directory.cleanup()
+
+    def test_fingerprint_is_stable_and_discriminating(self):
+        base = fingerprint(NewtonSolver(Expression("x**2 - 2")), {"guess": 1.0, "tolerance": 1e-12})
+        self.assertEqual(base, fingerprint(NewtonSolver(Expression("x ** 2-2")), {"tolerance": 1e-12, "guess": 1.0}))
+        self.assertNotEqual(base, fingerprint(NewtonSolver(Expression("x**2 - 3")), {"guess": 1.0, "tolerance": 1e-12}))
+        self.assertNotEqual(base, fingerprint(NewtonSolver(Expression("x**2 - 2")), {"guess": 2.0, "tolerance": 1e-12}))
+        self.assertNotEqual(base, fingerprint(AitkenSolver(Expression("x**2 - 2")), {"guess": 1.0, "tolerance": 1e-12}))
+        self.assertEqual(fingerprint(NewtonSolver(lambda x: x - 1), {}), fingerprint(NewtonSolver(lambda x: x - 1), {}))
+        self.assertNotEqual(fingerprint(NewtonSolver(lambda x: x - 1), {}),
+                            fingerprint(NewtonSolver(lambda x: x - 2), {}))
+
+    def test_solver_configuration_is_part_of_the_key(self):
+        function = lambda x: math.cos(x) - x
+        bisection = PortfolioSolver(function, methods=("BisectionSolver",))
+        newton = PortfolioSolver(function, methods=("NewtonSolver",))
+        arguments = dict(guess=0.5, interval=Interval(0, 1), tolerance=1e-3)
+        expected = newton.solve(**arguments)
+        self.assertNotEqual(self.cache.solve(bisection, **arguments), expected)
+        self.assertEqual(self.cache.solve(newton, **arguments), expected)
+        self.assertEqual(self.cache.hits, 0)
+        self.assertNotEqual(fingerprint(ContinuationSolver(function), {}),
+                            fingerprint(ContinuationSolver(function, vectorized=True), {}))
+        self.assertNotEqual(fingerprint(ExtrapolationSolver(function), {}),
+                            fingerprint(ExtrapolationSolver(function, method="vector_epsilon"), {}))
+
+    def test_hit_restores_trace_without_solving(self):
+        solver = NewtonSolver(Expression("x**2 - 2"))
+        root = self.cache.solve(solver, include_steps=True, guess=1.0, tolerance=1e-12)
+        steps = list(solver.trace.steps)
+
+        other = NewtonSolver(Expression("x**2 - 2"))
+        cached_root = self.cache.solve(other, guess=1.0, tolerance=1e-12)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertEqual(cached_root, root)
+        self.assertTrue(other.trace.has_converged)
+        self.assertEqual(other.trace.steps, steps)
+
+    def test_cache_persists_across_instances(self):
+        self.cache.solve(BisectionSolver(Expression("x**3 - x - 2")), interval=Interval(1, 2), tolerance=1e-10)
+        self.cache.close()
+        self.cache = SolveCache(self.path)
+        solver = BisectionSolver(Expression("x**3 - x - 2"))
+        self.assertTrue(self.cache.lookup(solver, interval=Interval(1, 2), tolerance=1e-10))
+        self.assertTrue(math.isclose(solver.trace.final_result, 1.5213797, abs_tol=1e-7))
+        self.assertEqual(solver.trace.steps, [])
+
+    def test_unstable_functions_are_not_cached(self):
+        function = _CountingFunction()
+        self.cache.solve(NewtonSolver(function), guess=1.0, tolerance=1e-12)
+        self.cache.solve(NewtonSolver(function), guess=1.0, tolerance=1e-12)
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.hits, 0)
+
+    def test_rebinding_a_global_changes_the_key(self):
+        global _OFFSET
+        _OFFSET = 2
+        try:
+            function = lambda x: x * x - _OFFSET
+            self.assertAlmostEqual(self.cache.solve(NewtonSolver(function), guess=1.0, tolerance=1e-12), math.sqrt(2))
+            _OFFSET = 9
+            self.assertAlmostEqual(self.cache.solve(NewtonSolver(function), guess=1.0, tolerance=1e-12), 3.0)
+            self.assertEqual(self.cache.hits, 0)
+            # a global that cannot be fingerprinted keeps the solve out of the cache
+            _OFFSET = _CountingFunction()
+            self.cache.solve(NewtonSolver(lambda x: _OFFSET(x)), guess=1.0, tolerance=1e-12)
+            self.assertEqual(len(self.cache), 2)
+        finally:
+            del _OFFSET
+
+    def test_version_change_invalidates(self):
+        class PatchedNewtonSolver(NewtonSolver):
+            VERSION = NewtonSolver.VERSION
+
+        solver = PatchedNewtonSolver(Expression("x - 1"))
+        self.cache.solve(solver, guess=0.0, tolerance=1e-12)
+        PatchedNewtonSolver.VERSION += 1
+        self.assertFalse(self.cache.lookup(PatchedNewtonSolver(Expression("x - 1")), guess=0.0, tolerance=1e-12))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_not_converged_hit_still_raises(self):
+        kwargs = dict(guess=10.0, tolerance=1e-12, max_iterations=1, raise_exception_if_no_convergence=True)
+        for _ in range(2):
+            with self.assertRaises(MonadicEquationSolverNotConvergedException):
+                self.cache.solve(NewtonSolver(Expression("x**2 - 2")), **kwargs)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_lru_eviction_by_size(self):
+        self.cache.max_bytes = 1000
+        for i in range(20):
+            self.cache.solve(NewtonSolver(Expression(f"x - {i}")), guess=0.0, tolerance=1e-12)
+            # keep the first problem hot
+            self.cache.lookup(NewtonSolver(Expression("x - 0")), guess=0.0, tolerance=1e-12)
+        self.assertLessEqual(self.cache.total_bytes(), 1000)
+        self.assertLess(len(self.cache), 20)
+        self.assertTrue(self.cache.lookup(NewtonSolver(Expression("x - 0")), guess=0.0, tolerance=1e-12))
+        self.assertTrue(self.cache.lookup(NewtonSolver(Expression("x - 19")), guess=0.0, tolerance=1e-12))
+        self.assertFalse(self.cache.lookup(NewtonSolver(Expression("x - 1")), guess=0.0, tolerance=1e-12))
+
+    def test_batch_reuses_cache(self):
+        jobs = [Job("a", "NewtonSolver", "x**2 - 2", {"guess": 1.0, "tolerance": 1e-12}),
+                Job("b", "BisectionSolver", "x - 0.25", {"interval": [0, 1], "tolerance": 1e-10})]
+        output = os.path.join(self.directory.name, "results.jsonl")
+        run_batch(jobs, output, progress=None, cache_path=self.path)
+        summary = run_batch(jobs, output, progress=None, cache_path=self.path)
+        with open(output) as file:
+            self.assertEqual(file.read().count('"cached": true'), 2)
+        self.assertEqual(summary.converged, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import math
+import unittest
+
+import numpy as np
+
+from solvers.monadic import calculus
+from solvers.monadic.newton import NewtonSolver
+
+
+class TestAdaptiveDerivative(unittest.TestCase):
+    def test_badly_scaled_functions(self):
+        cases = [
+            (np.sin, 1.0, math.cos(1.0)),
+            (lambda x: np.exp(1000 * x), 1e-3, 1000 * math.e),
+            (lambda x: x ** 3, 1e8, 3e16),
+            (lambda x: np.sin(1e5 * x), 5e-6, 1e5 * math.cos(0.5)),
+            (lambda x: 1e-20 * np.sin(x), 2.0, 1e-20 * math.cos(2.0)),
+            (np.log, 1e-3, 1e3),
+        ]
+        for function, x, expected in cases:
+            for side in (0, 1, -1):
+                with self.subTest(x=x, side=side):
+                    estimate = calculus.differentiate(function, x, side=side, vectorized=True)
+                    self.assertTrue(math.isclose(estimate.value, expected, rel_tol=1e-8))
+                    # the error estimate is an upper bound, and not a wildly pessimistic one
+                    self.assertLessEqual(abs(estimate.value - expected), estimate.error)
+                    self.assertLess(estimate.error, 1e-6 * abs(expected))
+
+    def test_fixed_step_is_truncated(self):
+        function = lambda x: math.sin(1e5 * x)
+        fixed = calculus.get_derivative_of(function)(5e-6)
+        adaptive = calculus.get_derivative_of(function, step_size=None)(5e-6)
+        expected = 1e5 * math.cos(0.5)
+        self.assertGreater(abs(fixed - expected), 0.1 * expected)
+        self.assertTrue(math.isclose(adaptive, expected, rel_tol=1e-10))
+
+    def test_one_sided_reuses_the_function_value(self):
+        calls = []
+
+        def function(x):
+            calls.append(x)
+            return np.sqrt(x)
+
+        estimate = calculus.differentiate(function, 4.0, value=2.0, side=1)
+        self.assertTrue(math.isclose(estimate.value, 0.25, rel_tol=1e-9))
+        self.assertNotIn(4.0, calls)
+        self.assertTrue(all(x > 4.0 for x in calls))
+        self.assertEqual(len(calls), calculus.RICHARDSON_STEPS)
+
+    def test_vectorized_evaluates_once(self):
+        calls = []
+
+        def function(x):
+            calls.append(x.shape)
+            return np.sin(x)
+
+        x = np.linspace(0, 3, 7)
+        estimate = calculus.differentiate(function, x, vectorized=True)
+        np.testing.assert_allclose(estimate.value, np.cos(x), atol=1e-12)
+        self.assertEqual(estimate.error.shape, x.shape)
+        self.assertEqual(calls, [(7, 2 * calculus.RICHARDSON_STEPS)])
+
+    def test_scalar_function_near_its_domain_boundary(self):
+        # the largest steps reach below zero, where math raises instead of returning NaN
+        for function, x, expected in ((math.log, 0.1, 10.0), (math.sqrt, 0.05, 1 / (2 * math.sqrt(0.05)))):
+            with self.subTest(function=function.__name__):
+                estimate = calculus.differentiate(function, x)
+                self.assertTrue(math.isclose(estimate.value, expected, rel_tol=1e-9))
+        root = NewtonSolver(lambda x: math.log(x) - 1).solve(0.2, 1e-12, step_size=None)
+        self.assertAlmostEqual(root, math.e, places=12)
+
+    def test_scale(self):
+        # all default steps straddle the branch point of sqrt at 0
+        estimate = calculus.differentiate(np.sqrt, 1e-6, scale=1e-6, vectorized=True)
+        self.assertTrue(math.isclose(estimate.value, 500, rel_tol=1e-9))
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            calculus.differentiate(np.sin, 1.0, side=2)
+        with self.assertRaises(ValueError):
+            calculus.differentiate(np.sin, 1.0, scale=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import math
+import unittest
+
+import numpy as np
+
+from solvers.monadic.continuation import ContinuationSolver
+from solvers.monadic.newton import NewtonSolver
+
+
+class TestContinuationSolver(unittest.TestCase):
+    def test_follows_both_branches(self):
+        parameters = np.linspace(1, 100, 500)
+        solver = ContinuationSolver(lambda x, p: x * x - p)
+        roots = solver.solve([1.0, -1.0], parameters)
+        self.assertTrue(solver.trace.has_converged)
+        self.assertEqual(roots.shape, (500, 2))
+        np.testing.assert_allclose(roots, np.column_stack([np.sqrt(parameters), -np.sqrt(parameters)]),
+                                   atol=1e-10)
+
+    def test_vectorized_function_gives_same_roots(self):
+        parameters = np.linspace(0, 2, 50)
+        function = lambda x, p: np.cos(x) - p * x
+        scalar = ContinuationSolver(lambda x, p: math.cos(x) - p * x).solve([0.7, 8.0], parameters)
+        vectorized = ContinuationSolver(function, vectorized=True).solve([0.7, 8.0], parameters)
+        np.testing.assert_array_equal(scalar, vectorized)
+
+    def test_warm_start_saves_iterations(self):
+        parameters = np.linspace(2, 3, 200)
+        solver = ContinuationSolver(lambda x, p: x ** 3 - p)
+        roots = solver.solve(1.0, parameters)
+        self.assertEqual(roots.shape, (200,))
+        np.testing.assert_allclose(roots, np.cbrt(parameters), atol=1e-12)
+        warm = sum(step.corrector_iterations for step in solver.trace.steps)
+        cold = 0
+        for parameter in parameters:
+            newton = NewtonSolver(lambda x: x ** 3 - parameter)
+            newton.solve(guess=1.0, tolerance=1e-12)
+            cold += len(newton.trace.steps)
+        self.assertLess(warm, cold / 2)
+
+    def test_shrinks_step_on_failure(self):
+        # a coarse grid along a strongly curved branch
+        parameters = np.linspace(0.3, 0.99, 5)
+        solver = ContinuationSolver(lambda x, p: math.atan(x) - p * x)
+        roots = solver.solve(4.5, parameters)
+        self.assertTrue(solver.trace.has_converged)
+        self.assertTrue(any(not step.accepted for step in solver.trace.steps))
+        # a rejected corrector reports the Newton steps it took, not the limit
+        rejected = [step.corrector_iterations for step in solver.trace.steps if not step.accepted]
+        self.assertLess(max(rejected), ContinuationSolver.DEFAULT_MAX_CORRECTOR_ITERATIONS)
+        lengths = [step.step_length for step in solver.trace.steps[1:]]
+        self.assertLess(min(lengths), parameters[1] - parameters[0])
+        expected = NewtonSolver(lambda x: math.atan(x) - 0.99 * x).solve(guess=0.2, tolerance=1e-12)
+        self.assertAlmostEqual(roots[-1], expected, places=10)
+
+    def test_cold_start_from_a_far_guess(self):
+        # the first Newton steps from 10 contract slowly, which is no branch jump at the first parameter
+        solver = ContinuationSolver(lambda x, p: x ** 3 - p)
+        roots = solver.solve(10.0, [2, 3])
+        self.assertTrue(solver.trace.has_converged)
+        np.testing.assert_allclose(roots, np.cbrt([2, 3]), rtol=1e-12)
+
+    def test_stops_at_fold(self):
+        # the roots of x^2 + p = 0 disappear at p = 0
+        solver = ContinuationSolver(lambda x, p: x * x + p)
+        roots = solver.solve(1.0, np.linspace(-1, 1, 5))
+        self.assertFalse(solver.trace.has_converged)
+        self.assertAlmostEqual(roots[1], math.sqrt(0.5))
+        self.assertTrue(np.all(np.isnan(roots[2:])))
+
+    def test_invalid_input(self):
+        solver = ContinuationSolver(lambda x, p: x - p)
+        with self.assertRaises(ValueError):
+            solver.solve(0.0, [0.0, 1.0, 0.5])
+        with self.assertRaises(ValueError):
+            solver.solve(0.0, [])
+        with self.assertRaises(ValueError):
+            solver.solve([[0.0]], [0.0, 1.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
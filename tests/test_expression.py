@@ -0,0 +1,74 @@
+import copy
+import math
+import pickle
+import unittest
+
+import numpy as np
+
+from solvers.monadic.expression import Expression, ExpressionError
+from solvers.monadic.newton import NewtonSolver
+
+
+class TestExpression(unittest.TestCase):
+    def test_scalar_and_vectorized_agree(self):
+        expression = Expression("math.sin(x) * np.exp(-x) + x ** 2")
+        xs = np.linspace(-2.0, 2.0, 9)
+        expected = [math.sin(x) * math.exp(-x) + x ** 2 for x in xs]
+        self.assertTrue(np.allclose(expression.vectorized(xs), expected))
+        self.assertTrue(math.isclose(expression(0.5), math.sin(0.5) * math.exp(-0.5) + 0.25))
+
+    def test_aliases_are_normalized(self):
+        self.assertEqual(str(Expression("np.arctan(x) + math.fabs(x)")), "atan(x) + abs(x)")
+        self.assertEqual(Expression("np.sqrt(x)"), Expression("sqrt(x)"))
+
+    def test_constant_expression_vectorizes_to_input_shape(self):
+        expression = Expression("2 * pi")
+        self.assertTrue(expression.is_constant)
+        self.assertEqual(expression.vectorized(np.zeros((3, 2))).shape, (3, 2))
+
+    def test_derivative_matches_central_difference(self):
+        sources = ["x ** 3 - 2 * x", "sin(x) * exp(-x)", "log(x) / x", "x ** x", "2 ** x", "sqrt(1 + x ** 2)",
+                   "atan(x) + tanh(x)", "hypot(x, 2)", "atan2(x, 1 + x ** 2)", "1 / (x - 3) ** 2"]
+        h = 1e-6
+        for source in sources:
+            expression = Expression(source)
+            derivative = expression.derivative()
+            for x in (0.7, 1.3, 2.1):
+                expected = (expression(x + h) - expression(x - h)) / (2 * h)
+                self.assertTrue(math.isclose(derivative(x), expected, rel_tol=1e-6, abs_tol=1e-8),
+                                f"d/dx {source} at {x}: {derivative(x)} != {expected}")
+
+    def test_derivative_is_simplified(self):
+        self.assertEqual(str(Expression("x ** 2 - 2").derivative()), "2 * x")
+        self.assertEqual(str(Expression("5").derivative()), "0")
+
+    def test_rejects_code_outside_whitelist(self):
+        for source in ["__import__('os')", "open(x)", "x.real", "lambda: 1", "'x'", "[x]", "x if x else 1",
+                       "np.random.rand()", "sin(x, 1)"]:
+            with self.assertRaises(ExpressionError, msg=source):
+                Expression(source)
+
+    def test_caret_hints_at_power_operator(self):
+        with self.assertRaisesRegex(ExpressionError, r"\*\*"):
+            Expression("x ^ 2")
+
+    def test_syntax_error_is_expression_error(self):
+        with self.assertRaises(ValueError):
+            Expression("x +")
+
+    def test_pickle_and_deepcopy_round_trip(self):
+        expression = Expression("x ** 2 - 2")
+        self.assertEqual(pickle.loads(pickle.dumps(expression))(3.0), 7.0)
+        self.assertEqual(copy.deepcopy(expression)(3.0), 7.0)
+
+    def test_newton_with_symbolic_derivative(self):
+        expression = Expression("x ** 2 - 2")
+        solver = NewtonSolver(expression)
+        root = solver.solve(guess=1.0, tolerance=1e-12, derivative=expression.derivative())
+        self.assertTrue(math.isclose(root, math.sqrt(2), abs_tol=1e-12))
+        self.assertTrue(solver.trace.has_converged)
+        self.assertEqual(solver.trace.steps[0].derivative_value, 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from solvers.monadic.aitken import AitkenSolver
+from solvers.nonlinear_system.fixed_point import AndersonSolver, ExtrapolationSolver
+from solvers.nonlinear_system.nonlinear_system_solver import NonlinearSystemSolverNotConvergedException
+
+
+def linear_contraction(size: int, seed: int = 0):
+    """``x -> A x + b`` with the eigenvalues of the symmetric A spread over [0, 0.99]."""
+    rng = np.random.default_rng(seed)
+    basis, _ = np.linalg.qr(rng.standard_normal((size, size)))
+    matrix = basis @ np.diag(np.linspace(0, 0.99, size)) @ basis.T
+    bias = rng.standard_normal(size)
+    return (lambda x: matrix @ x + bias), np.linalg.solve(np.eye(size) - matrix, bias)
+
+
+def coupled_cosines(x: np.ndarray) -> np.ndarray:
+    return 0.5 * np.cos(x) + 0.225 * (np.roll(x, 1) + np.roll(x, -1))
+
+
+class TestAndersonSolver(unittest.TestCase):
+    def test_far_fewer_iterations_than_plain_iteration(self):
+        function, expected = linear_contraction(300)
+        solver = AndersonSolver(function, is_fixed_point=True)
+        result = solver.solve(np.zeros(300), 1e-10, raise_exception_if_no_convergence=True)
+        np.testing.assert_allclose(result, expected, atol=1e-7)
+        accelerated = len(solver.trace.steps)
+
+        # history=0 is plain iteration
+        solver.solve(np.zeros(300), 1e-10, raise_exception_if_no_convergence=True, max_iterations=10000, history=0)
+        self.assertLess(5 * accelerated, len(solver.trace.steps))
+
+    def test_trace_records_residual_norms(self):
+        solver = AndersonSolver(coupled_cosines, is_fixed_point=True)
+        result = solver.solve(np.zeros(200), 1e-12, history=3)
+        self.assertTrue(solver.trace.has_converged)
+        self.assertLess(np.max(np.abs(coupled_cosines(result) - result)), 1e-12)
+        steps = solver.trace.steps
+        self.assertEqual([step.history_size for step in steps[:5]], [0, 1, 2, 3, 3])
+        self.assertAlmostEqual(steps[0].residual_norm, 0.5)
+        self.assertLess(steps[-1].residual_norm, steps[0].residual_norm)
+
+    def test_root_finding_form(self):
+        # F(x) = 0 is solved through g(x) = x + F(x), like AitkenSolver does
+        solver = AndersonSolver(lambda x: coupled_cosines(x) - x)
+        result = solver.solve(np.zeros(50), 1e-12)
+        self.assertLess(np.max(np.abs(coupled_cosines(result) - result)), 1e-12)
+
+    def test_not_converged(self):
+        solver = AndersonSolver(lambda x: 2 * x + 1, is_fixed_point=True)
+        with self.assertRaises(NonlinearSystemSolverNotConvergedException):
+            solver.solve(np.zeros(3), 1e-12, raise_exception_if_no_convergence=True, max_iterations=3, history=0)
+
+    def test_invalid_input(self):
+        solver = AndersonSolver(coupled_cosines, is_fixed_point=True)
+        with self.assertRaises(ValueError):
+            solver.iterate(np.zeros((2, 2)), 1e-12)
+        with self.assertRaises(ValueError):
+            solver.iterate(np.zeros(2), 1e-12, history=-1)
+        with self.assertRaises(ValueError):
+            solver.iterate(np.zeros(2), 1e-12, mixing=0)
+        with self.assertRaises(ValueError):
+            AndersonSolver(lambda x: x[:1], is_fixed_point=True).solve(np.zeros(2), 1e-12)
+
+
+class TestExtrapolationSolver(unittest.TestCase):
+    def test_reduces_to_aitken_in_one_dimension(self):
+        aitken = AitkenSolver(np.cos, is_fixed_point=True)
+        aitken.solve(1.0, 1e-14)
+        expected = [step.x for step in aitken.trace.steps[:3]]
+        for method in ExtrapolationSolver.METHODS:
+            with self.subTest(method=method):
+                solver = ExtrapolationSolver(np.cos, is_fixed_point=True, method=method)
+                solver.solve(np.array([1.0]), 1e-14, cycle_length=2)
+                np.testing.assert_allclose([step.x[0] for step in solver.trace.steps[:3]], expected, rtol=1e-12)
+
+    def test_exact_for_few_distinct_eigenvalues(self):
+        # the error of x -> A x + b lies in the span of 3 eigenvectors, so one cycle finds the limit
+        rng = np.random.default_rng(1)
+        basis, _ = np.linalg.qr(rng.standard_normal((100, 100)))
+        matrix = basis @ np.diag(np.repeat([0.9, 0.5, -0.8], [30, 30, 40])) @ basis.T
+        bias = rng.standard_normal(100)
+        expected = np.linalg.solve(np.eye(100) - matrix, bias)
+        for method in ExtrapolationSolver.METHODS:
+            with self.subTest(method=method):
+                solver = ExtrapolationSolver(lambda x: matrix @ x + bias, is_fixed_point=True, method=method)
+                result = solver.solve(np.zeros(100), 1e-9, cycle_length=6)
+                self.assertEqual(len(solver.trace.steps), 1)
+                np.testing.assert_allclose(result, expected, atol=1e-8)
+
+    def test_mpe_on_linear_contraction(self):
+        function, expected = linear_contraction(300)
+        solver = ExtrapolationSolver(function, is_fixed_point=True)
+        result = solver.solve(np.zeros(300), 1e-10, raise_exception_if_no_convergence=True)
+        np.testing.assert_allclose(result, expected, atol=1e-7)
+        # a few hundred evaluations of the map, against about 2000 for plain iteration
+        self.assertLess(len(solver.trace.steps) * ExtrapolationSolver.DEFAULT_CYCLE_LENGTH, 400)
+
+    def test_never_worse_than_plain_iteration_near_unit_spectral_radius(self):
+        # a non-normal map with spectral radius 0.99, on which unguarded MPE diverges
+        rng = np.random.default_rng(0)
+        matrix = rng.standard_normal((200, 200))
+        matrix *= 0.99 / np.max(np.abs(np.linalg.eigvals(matrix)))
+        bias = rng.standard_normal(200)
+        expected = np.linalg.solve(np.eye(200) - matrix, bias)
+        for method in ExtrapolationSolver.METHODS:
+            with self.subTest(method=method):
+                solver = ExtrapolationSolver(lambda x: matrix @ x + bias, is_fixed_point=True, method=method)
+                result = solver.solve(np.zeros(200), 1e-10, raise_exception_if_no_convergence=True)
+                np.testing.assert_allclose(result, expected, atol=1e-7)
+                residuals = [step.residual_norm for step in solver.trace.steps]
+                self.assertEqual(max(residuals), residuals[0])
+
+    def test_failed_least_squares_falls_back_to_the_last_iterate(self):
+        solver = ExtrapolationSolver(coupled_cosines, is_fixed_point=True)
+        with mock.patch("numpy.linalg.lstsq", side_effect=np.linalg.LinAlgError("SVD did not converge")):
+            result = solver.solve(np.zeros(20), 1e-12, raise_exception_if_no_convergence=True)
+        self.assertLess(np.max(np.abs(coupled_cosines(result) - result)), 1e-12)
+
+    def test_nonlinear_map(self):
+        for method in ExtrapolationSolver.METHODS:
+            with self.subTest(method=method):
+                solver = ExtrapolationSolver(coupled_cosines, is_fixed_point=True, method=method)
+                result = solver.solve(np.zeros(200), 1e-12, raise_exception_if_no_convergence=True)
+                self.assertLess(np.max(np.abs(coupled_cosines(result) - result)), 1e-12)
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            ExtrapolationSolver(coupled_cosines, method="rre")
+        with self.assertRaises(ValueError):
+            ExtrapolationSolver(coupled_cosines, is_fixed_point=True).iterate(np.zeros(2), 1e-12, cycle_length=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import tracemalloc
+import unittest
+
+import numpy as np
+
+from solvers.linear_system.gauss import GaussSolver
+
+
+class TestGaussSolver(unittest.TestCase):
+    def setUp(self):
+        self.coefficients = np.array([[10, -19, -2], [-20, 40, 1], [1, 4, 5]])
+        self.bias = np.array([3, 4, 5])
+
+    def test_solves_system(self):
+        solver = GaussSolver()
+        result = solver.solve(self.coefficients, self.bias)
+        np.testing.assert_allclose(self.coefficients @ result[:, 0], self.bias, atol=1e-10)
+        self.assertTrue(solver.trace.has_converged)
+        self.assertEqual(solver.trace.steps[0].description, "Initial Augmented Matrix")
+
+    def test_determinant(self):
+        solver = GaussSolver()
+        solver.solve(self.coefficients, self.bias)
+        self.assertAlmostEqual(solver.determinant, np.linalg.det(self.coefficients))
+        solver.solve(np.eye(3, 2), np.array([1.0, 2.0, 0.0]))
+        self.assertIsNone(solver.determinant)
+
+    def test_inverse(self):
+        solver = GaussSolver()
+        inverse = solver.inverse(self.coefficients)
+        np.testing.assert_allclose(self.coefficients @ inverse, np.eye(3), atol=1e-12)
+        self.assertAlmostEqual(solver.determinant, np.linalg.det(self.coefficients))
+        with self.assertRaises(ValueError):
+            solver.inverse(np.ones((2, 3)))
+
+    def test_single_precision(self):
+        solver = GaussSolver()
+        result = solver.solve(self.coefficients, self.bias, dtype=np.float32)
+        self.assertEqual(result.dtype, np.float32)
+        self.assertTrue(all(step.matrix_snapshot.dtype == np.float32 for step in solver.trace.steps))
+        np.testing.assert_allclose(result, solver.solve(self.coefficients, self.bias), rtol=1e-4)
+
+    def test_pivoting_is_recorded_as_row_swaps(self):
+        solver = GaussSolver()
+        solver.solve(self.coefficients, self.bias)
+        swap = solver.trace.steps[1]
+        self.assertEqual(swap.description, "Pivoting: Swapped Row 0 and Row 1")
+        np.testing.assert_array_equal(swap.matrix_snapshot[0], [-20, 40, 1, 4])
+        self.assertEqual(sorted(solver.permutation), [0, 1, 2])
+
+    def test_in_place(self):
+        expected = GaussSolver().solve(self.coefficients, self.bias)
+        coefficients, bias = self.coefficients.astype(float), self.bias.astype(float)
+        out = np.empty((3, 1))
+        solver = GaussSolver()
+        result = solver.solve(coefficients, bias, overwrite=True, out=out, record_snapshots=False)
+        self.assertIs(result, out)
+        np.testing.assert_allclose(out, expected)
+        self.assertEqual(solver.trace.steps, [])
+        # the buffers hold U and, below its diagonal, the multipliers of L, in pivot order
+        lu = coefficients[solver.permutation]
+        unit_lower = np.tril(lu, -1) + np.eye(3)
+        np.testing.assert_allclose(unit_lower @ np.triu(lu), self.coefficients[solver.permutation], atol=1e-12)
+
+    def test_in_place_allocates_no_matrix(self):
+        size = 200
+        generator = np.random.default_rng(0)
+        coefficients = generator.standard_normal((size, size))
+        bias = generator.standard_normal(size)
+        out = np.empty((size, 1))
+        solver = GaussSolver()
+        tracemalloc.start()
+        try:
+            solver.solve(coefficients, bias, overwrite=True, out=out, record_snapshots=False)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, coefficients.nbytes / 10)
+
+    def test_tiled_matches_serial_for_any_worker_count(self):
+        generator = np.random.default_rng(1)
+        coefficients = generator.standard_normal((90, 90))
+        bias = generator.standard_normal((90, 2))
+        serial = GaussSolver(workers=1, tile_size=16)
+        expected = serial.solve(coefficients, bias)
+        np.testing.assert_allclose(coefficients @ expected, bias, atol=1e-10)
+        self.assertAlmostEqual(serial.determinant / np.linalg.det(coefficients), 1)
+        for workers in (2, 4):
+            solver = GaussSolver(workers=workers, tile_size=16)
+            np.testing.assert_array_equal(solver.solve(coefficients, bias), expected)
+            np.testing.assert_array_equal(solver.permutation, serial.permutation)
+        # the initial matrix and one snapshot per panel of 16 columns
+        self.assertEqual(len(serial.trace.steps), 1 + 6)
+        np.testing.assert_allclose(np.tril(serial.trace.steps[-1].matrix_snapshot[:, :90], -1), 0)
+
+    def test_tiled_matches_default_to_rounding(self):
+        generator = np.random.default_rng(1)
+        coefficients = generator.standard_normal((90, 90))
+        bias = generator.standard_normal((90, 2))
+        default = GaussSolver()
+        expected = default.solve(coefficients, bias)
+        for workers in (1, 2, 4):
+            for tile_size in (8, 16, 128):
+                with self.subTest(workers=workers, tile_size=tile_size):
+                    solver = GaussSolver(workers=workers, tile_size=tile_size)
+                    np.testing.assert_allclose(solver.solve(coefficients, bias), expected, rtol=1e-10, atol=1e-12)
+                    np.testing.assert_array_equal(solver.permutation, default.permutation)
+                    self.assertAlmostEqual(solver.determinant / default.determinant, 1, places=10)
+
+    def test_condition_estimate(self):
+        hilbert = 1 / (np.arange(1, 7)[:, None] + np.arange(6))
+        generator = np.random.default_rng(2)
+        random = generator.standard_normal((40, 40))
+        for coefficients in (self.coefficients.astype(float), hilbert, random):
+            for solver in (GaussSolver(), GaussSolver(workers=2, tile_size=16)):
+                with self.subTest(size=len(coefficients), workers=solver.workers):
+                    solver.solve(coefficients, np.ones(len(coefficients)))
+                    estimate = solver.condition_estimate()
+                    exact = np.linalg.cond(coefficients, 1)
+                    self.assertLessEqual(estimate, exact * (1 + 1e-6))
+                    self.assertGreater(estimate, exact / 10)
+        solver = GaussSolver()
+        solver.inverse(hilbert)
+        self.assertGreater(solver.condition_estimate(), 1e6)
+        # the caller may reuse overwritten buffers, so no estimate is taken from them
+        coefficients = hilbert.copy()
+        solver.solve(coefficients, np.ones(6), overwrite=True)
+        with self.assertRaises(ValueError):
+            solver.condition_estimate()
+        solver.solve(np.eye(3, 2), np.array([1.0, 2.0, 0.0]))
+        with self.assertRaises(ValueError):
+            solver.condition_estimate()
+
+    def test_tiled_invalid_input(self):
+        with self.assertRaises(ValueError):
+            GaussSolver(workers=0)
+        with self.assertRaises(ValueError):
+            GaussSolver(workers=2).solve(np.eye(3, 2), np.ones(3))
+        with self.assertRaises(ValueError):
+            GaussSolver(workers=2).solve(np.eye(2), np.ones(2), overwrite=True)
+        with self.assertRaises(ValueError):
+            GaussSolver(workers=2).solve(np.ones((2, 2)), np.ones(2))
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            GaussSolver().solve(self.coefficients, self.bias, dtype=np.int64)
+        with self.assertRaises(ValueError):
+            GaussSolver().solve(np.ones((2, 2)), np.ones(2))
+        with self.assertRaises(ValueError):
+            # integer buffers cannot hold the elimination
+            GaussSolver().solve(self.coefficients, self.bias, overwrite=True)
+        with self.assertRaises(ValueError):
+            GaussSolver().solve(self.coefficients, self.bias, out=np.empty(3))
+
+
+if __name__ == '__main__':
+    unittest.main()
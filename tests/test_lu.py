@@ -0,0 +1,73 @@
+import unittest
+
+import numpy as np
+
+from solvers.linear_system.lu import LUFactorization
+
+
+class TestLUFactorization(unittest.TestCase):
+    def setUp(self):
+        generator = np.random.default_rng(0)
+        self.coefficients = generator.standard_normal((30, 30))
+        self.bias = generator.standard_normal((30, 4))
+
+    def test_factors_reproduce_matrix(self):
+        factorization = LUFactorization(self.coefficients)
+        lower = np.tril(factorization.lu, -1) + np.eye(30)
+        upper = np.triu(factorization.lu)
+        np.testing.assert_allclose(lower @ upper, self.coefficients[factorization.permutation], atol=1e-12)
+        self.assertTrue(np.all(np.abs(lower) <= 1))
+
+    def test_solve(self):
+        factorization = LUFactorization(self.coefficients)
+        np.testing.assert_allclose(self.coefficients @ factorization.solve(self.bias), self.bias, atol=1e-10)
+        vector = factorization.solve(self.bias[:, 0])
+        self.assertEqual(vector.shape, (30,))
+        np.testing.assert_allclose(self.coefficients @ vector, self.bias[:, 0], atol=1e-10)
+
+    def test_transposed_solve(self):
+        result = LUFactorization(self.coefficients).solve(self.bias, transposed=True)
+        np.testing.assert_allclose(self.coefficients.T @ result, self.bias, atol=1e-10)
+
+    def test_pivoting_handles_zero_diagonal(self):
+        coefficients = np.array([[0.0, 1.0], [1.0, 0.0]])
+        np.testing.assert_array_equal(LUFactorization(coefficients).solve(np.array([2.0, 3.0])), [3.0, 2.0])
+
+    def test_determinant(self):
+        self.assertAlmostEqual(LUFactorization(self.coefficients).determinant() / np.linalg.det(self.coefficients), 1)
+        # one row swap flips the sign
+        self.assertEqual(LUFactorization(np.array([[0.0, 2.0], [3.0, 0.0]])).determinant(), -6.0)
+
+    def test_inverse(self):
+        inverse = LUFactorization(self.coefficients).inverse()
+        np.testing.assert_allclose(inverse @ self.coefficients, np.eye(30), atol=1e-10)
+
+    def test_condition_estimate(self):
+        estimate = LUFactorization(self.coefficients).condition_estimate()
+        exact = np.linalg.cond(self.coefficients, 1)
+        self.assertLessEqual(estimate, exact * (1 + 1e-10))
+        self.assertGreater(estimate, exact / 3)
+        hilbert = 1 / (np.arange(8)[:, np.newaxis] + np.arange(8) + 1)
+        self.assertGreater(LUFactorization(hilbert).condition_estimate(), 1e9)
+        self.assertAlmostEqual(LUFactorization(np.diag([1.0, 10.0])).condition_estimate(), 10)
+
+    def test_single_precision(self):
+        factorization = LUFactorization(self.coefficients, dtype=np.float32)
+        self.assertEqual(factorization.dtype, np.float32)
+        result = factorization.solve(self.bias)
+        self.assertEqual(result.dtype, np.float32)
+        np.testing.assert_allclose(self.coefficients @ result, self.bias, atol=1e-3)
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            LUFactorization(np.array([[1.0, 2.0], [2.0, 4.0]]))
+        with self.assertRaises(ValueError):
+            LUFactorization(np.ones((2, 3)))
+        with self.assertRaises(ValueError):
+            LUFactorization(np.eye(3)).solve(np.ones(2))
+        with self.assertRaises(ValueError):
+            LUFactorization(np.eye(3), dtype=int)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -20,6 +20,15 @@ class TestNewtonSolver(unittest.TestCase):
         self.assertTrue(math.isclose(root, expected, rel_tol=0, abs_tol=1e-10))
         self.assertTrue(solver.trace.has_converged)
 
+    def test_adaptive_derivative_of_badly_scaled_function(self):
+        function = lambda x: math.sin(1e5 * x) - 0.5
+        fixed = NewtonSolver(function)
+        fixed.solve(guess=1e-6, tolerance=1e-13)
+        adaptive = NewtonSolver(function)
+        root = adaptive.solve(guess=1e-6, tolerance=1e-13, step_size=None)
+        self.assertTrue(math.isclose(root, math.asin(0.5) / 1e5, rel_tol=1e-9))
+        self.assertLess(len(adaptive.trace.steps), len(fixed.trace.steps))
+
     def test_newton_converges_to_cuberoot_of_8(self):
         solver = NewtonSolver(lambda x: x**3 - 8)
         root = solver.solve(guess=3.0, tolerance=1e-12, max_iterations=50)
@@ -46,5 +55,24 @@ class TestNewtonSolver(unittest.TestCase):
         # derivative should be close to 2 for f(x)=x^2-2 at x=1
         self.assertTrue(math.isclose(first.derivative_value, 2.0, rel_tol=1e-3))
 
+    def test_newton_iterate_yields_solve_steps(self):
+        solver = NewtonSolver(lambda x: x * x - 2)
+        root = solver.solve(guess=1.0, tolerance=1e-12)
+        steps = list(solver.trace.steps)
+
+        other = NewtonSolver(lambda x: x * x - 2)
+        self.assertEqual(list(other.iterate(guess=1.0, tolerance=1e-12)), steps)
+        self.assertEqual(other.trace.final_result, root)
+        self.assertTrue(other.trace.has_converged)
+        self.assertEqual(other.trace.steps, [])
+
+    def test_newton_iterate_can_stop_early(self):
+        solver = NewtonSolver(lambda x: x * x - 2)
+        for step in solver.iterate(guess=100.0, tolerance=1e-12):
+            if abs(step.function_value) < 1:
+                break
+        self.assertLess(abs(step.function_value), 1)
+        self.assertIsNone(solver.trace.final_result)
+
 if __name__ == '__main__':
     unittest.main()
@@ -94,6 +94,14 @@ class TestNewtonDownhillSolver(unittest.TestCase):
         self.assertTrue(math.isclose(root, target, rel_tol=1e-12, abs_tol=1e-9))
         self.assertTrue(solver.trace.has_converged)
 
+    def test_iterate_matches_solve(self):
+        solver = NewtonDownhillSolver(lambda x: x ** 3 - x - 1)
+        root = solver.solve(guess=0.6, tolerance=1e-12, max_iterations=50)
+        other = NewtonDownhillSolver(lambda x: x ** 3 - x - 1)
+        self.assertEqual(list(other.iterate(guess=0.6, tolerance=1e-12, max_iterations=50)), solver.trace.steps)
+        self.assertEqual(other.trace.final_result, root)
+        self.assertTrue(other.trace.has_converged)
+
 
 if __name__ == '__main__':
     unittest.main()
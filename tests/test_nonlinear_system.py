@@ -0,0 +1,83 @@
+import unittest
+
+import numpy as np
+
+from solvers.nonlinear_system.broyden import BroydenSolver
+from solvers.nonlinear_system.calculus import get_jacobian_of
+from solvers.nonlinear_system.newton import NewtonSystemSolver
+from solvers.nonlinear_system.nonlinear_system_solver import NonlinearSystemSolverNotConvergedException
+
+
+def broyden_tridiagonal(x: np.ndarray) -> np.ndarray:
+    # works on a vector or, column by column, on an (n, k) array of points
+    residual = (3 - 2 * x) * x + 1
+    residual[1:] -= x[:-1]
+    residual[:-1] -= 2 * x[1:]
+    return residual
+
+
+def broyden_tridiagonal_jacobian(x: np.ndarray) -> np.ndarray:
+    return np.diag(3 - 4 * x) - np.eye(len(x), k=-1) - 2 * np.eye(len(x), k=1)
+
+
+def circle_and_line(x: np.ndarray) -> np.ndarray:
+    return np.array([x[0] ** 2 + x[1] ** 2 - 4, x[0] - x[1]])
+
+
+class TestJacobian(unittest.TestCase):
+    def test_finite_differences(self):
+        x = np.linspace(-1, 1, 12)
+        expected = broyden_tridiagonal_jacobian(x)
+        np.testing.assert_allclose(get_jacobian_of(broyden_tridiagonal)(x), expected, atol=1e-6)
+        np.testing.assert_allclose(get_jacobian_of(broyden_tridiagonal, vectorized=True)(x), expected, atol=1e-6)
+
+
+class TestNonlinearSystemSolvers(unittest.TestCase):
+    def test_newton_small_system(self):
+        solver = NewtonSystemSolver(circle_and_line)
+        root = solver.solve(np.array([1.0, 0.5]), tolerance=1e-12)
+        np.testing.assert_allclose(root, [np.sqrt(2), np.sqrt(2)], atol=1e-10)
+        self.assertTrue(solver.trace.has_converged)
+        norms = [step.residual_norm for step in solver.trace.steps]
+        self.assertLess(norms[-1], norms[0])
+
+    def test_newton_reuses_factorizations(self):
+        solver = NewtonSystemSolver(broyden_tridiagonal)
+        root = solver.solve(-np.ones(100), tolerance=1e-10)
+        self.assertLess(np.max(np.abs(broyden_tridiagonal(root))), 1e-9)
+        evaluated = [step.jacobian_evaluated for step in solver.trace.steps]
+        self.assertTrue(evaluated[0])
+        self.assertLess(sum(evaluated), len(evaluated))
+
+        classic = NewtonSystemSolver(broyden_tridiagonal)
+        classic.solve(-np.ones(100), tolerance=1e-10, max_jacobian_age=1)
+        self.assertTrue(all(step.jacobian_evaluated for step in classic.trace.steps))
+        np.testing.assert_allclose(classic.trace.final_result, root, atol=1e-9)
+
+    def test_analytic_and_vectorized_jacobians(self):
+        analytic = NewtonSystemSolver(broyden_tridiagonal, jacobian=broyden_tridiagonal_jacobian)
+        vectorized = NewtonSystemSolver(broyden_tridiagonal)
+        np.testing.assert_allclose(analytic.solve(-np.ones(50), tolerance=1e-12),
+                                   vectorized.solve(-np.ones(50), tolerance=1e-12, vectorized=True), atol=1e-10)
+
+    def test_broyden_evaluates_jacobian_once(self):
+        solver = BroydenSolver(broyden_tridiagonal)
+        root = solver.solve(-np.ones(200), tolerance=1e-10)
+        self.assertTrue(solver.trace.has_converged)
+        self.assertLess(np.max(np.abs(broyden_tridiagonal(root))), 1e-9)
+        self.assertEqual(sum(step.jacobian_evaluated for step in solver.trace.steps), 1)
+
+    def test_singular_jacobian_stops(self):
+        solver = NewtonSystemSolver(lambda x: x ** 2 + 1)
+        with self.assertRaises(NonlinearSystemSolverNotConvergedException):
+            solver.solve(np.zeros(3), tolerance=1e-12, raise_exception_if_no_convergence=True)
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            NewtonSystemSolver(circle_and_line).solve(np.ones((2, 2)), tolerance=1e-12)
+        with self.assertRaises(ValueError):
+            NewtonSystemSolver(lambda x: x[:1]).solve(np.ones(2), tolerance=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()
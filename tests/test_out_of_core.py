@@ -0,0 +1,79 @@
+import os
+import tempfile
+import tracemalloc
+import unittest
+
+import numpy as np
+
+from solvers.linear_system.gauss import GaussSolver
+from solvers.linear_system.out_of_core import OutOfCoreSolver
+
+MEMORY_CAP = 256 * 1024
+
+
+class TestOutOfCoreSolver(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.size = 500
+        generator = np.random.default_rng(0)
+        self.coefficients = np.memmap(os.path.join(self.directory, "coefficients.dat"), dtype=np.float64,
+                                      mode="w+", shape=(self.size, self.size))
+        for start in range(0, self.size, 100):
+            self.coefficients[start:start + 100] = generator.standard_normal((100, self.size))
+        self.coefficients.flush()
+        self.bias = generator.standard_normal((self.size, 2))
+
+    def test_matrix_larger_than_memory_cap(self):
+        self.assertGreater(self.coefficients.nbytes, 5 * MEMORY_CAP)
+        out = np.memmap(os.path.join(self.directory, "solution.dat"), dtype=np.float64, mode="w+",
+                        shape=self.bias.shape)
+        solver = OutOfCoreSolver(memory_budget=MEMORY_CAP, workspace=self.directory)
+        tracemalloc.start()
+        try:
+            result = solver.solve(self.coefficients, self.bias, out=out)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLessEqual(peak, MEMORY_CAP)
+        self.assertIs(result, out)
+        np.testing.assert_allclose(result, np.linalg.solve(self.coefficients, self.bias), atol=1e-10)
+        self.assertEqual(len(solver.trace.steps), -(-self.size // solver.panel_width(self.size, 2)))
+        # the temporary factors are gone, the input is untouched
+        self.assertEqual(sorted(os.listdir(self.directory)), ["coefficients.dat", "solution.dat"])
+
+    def test_overwrite(self):
+        expected = np.linalg.solve(self.coefficients, self.bias[:, 0])
+        original = np.array(self.coefficients)
+        solver = OutOfCoreSolver(memory_budget=MEMORY_CAP)
+        result = solver.solve(self.coefficients, self.bias[:, 0], overwrite=True)
+        np.testing.assert_allclose(result, expected, atol=1e-10)
+        self.assertFalse(np.array_equal(self.coefficients, original))
+
+    def test_single_panel(self):
+        coefficients = np.array([[0.0, 2.0], [3.0, 1.0]])
+        np.testing.assert_allclose(OutOfCoreSolver().solve(coefficients, np.array([2.0, 4.0])), [1.0, 1.0])
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            OutOfCoreSolver(memory_budget=100).solve(self.coefficients, self.bias)
+        with self.assertRaises(ValueError):
+            OutOfCoreSolver().solve(np.array([[1.0, 2.0], [2.0, 4.0]]), np.ones(2))
+        with self.assertRaises(ValueError):
+            OutOfCoreSolver().solve(np.eye(2), np.ones(2), out=np.empty(3))
+        with self.assertRaises(ValueError):
+            OutOfCoreSolver().solve(np.eye(2, dtype=int), np.ones(2), overwrite=True)
+
+    def test_gauss_skips_snapshots_of_memory_mapped_matrices(self):
+        small = np.memmap(os.path.join(self.directory, "small.dat"), dtype=np.float64, mode="w+", shape=(3, 3))
+        small[:] = np.eye(3)
+        solver = GaussSolver()
+        solver.solve(small, np.ones(3))
+        self.assertEqual(solver.trace.steps, [])
+        solver.solve(np.eye(3), np.ones(3))
+        self.assertEqual(len(solver.trace.steps), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+import os
+import pickle
+import subprocess
+import sys
+import textwrap
+import unittest
+from unittest import mock
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from solvers.budget import Budget
+from solvers.linear_system.gauss import GaussSolver
+from solvers.linear_system.parallel import OUT_OF_TIME, ArrayDescriptor, ParallelLinearSolver, _mapped, _solve_views
+
+
+class TestParallelLinearSolver(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.solver = ParallelLinearSolver(workers=2, chunk_size=3)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.solver.close()
+
+    def setUp(self):
+        generator = np.random.default_rng(0)
+        self.coefficients = generator.standard_normal((10, 40, 40))
+        self.bias = generator.standard_normal((10, 40))
+
+    def test_solves_private_arrays(self):
+        result = self.solver.solve(self.coefficients, self.bias)
+        np.testing.assert_allclose(result, np.linalg.solve(self.coefficients, self.bias[..., np.newaxis])[..., 0],
+                                   atol=1e-10)
+        self.assertEqual(self.solver.errors, {})
+        # the staged copies are freed again
+        self.assertEqual(self.solver._blocks, {})
+
+    def test_deadline_leaves_unsolved_systems_as_nan(self):
+        result = self.solver.solve(self.coefficients, self.bias, budget=Budget(seconds=1e-9))
+        self.assertTrue(self.solver.budget_exhausted)
+        self.assertEqual(self.solver.errors, dict.fromkeys(range(10), OUT_OF_TIME))
+        self.assertTrue(np.isnan(result).all())
+
+        self.solver.solve(self.coefficients, self.bias, budget=Budget(seconds=60))
+        self.assertFalse(self.solver.budget_exhausted)
+        self.assertEqual(self.solver.errors, {})
+
+    def test_solves_in_shared_memory(self):
+        coefficients = self.solver.empty(self.coefficients.shape)
+        coefficients[...] = self.coefficients
+        bias = self.solver.empty((10, 40, 2))
+        bias[...] = np.stack([self.bias, -self.bias], axis=2)
+        out = self.solver.empty(bias.shape)
+        self.assertIs(self.solver.solve(coefficients, bias, out=out), out)
+        np.testing.assert_allclose(coefficients @ out, bias, atol=1e-10)
+        self.assertEqual(len(self.solver._blocks), 3)
+        names = list(self.solver._blocks)
+        for array in (coefficients, bias, out):
+            self.solver.release(array)
+        self.assertEqual(self.solver._blocks, {})
+        for name in names:
+            with self.assertRaises(FileNotFoundError):
+                SharedMemory(name=name)
+        # the memory stays valid while the arrays live
+        self.assertTrue(np.all(np.isfinite(out)))
+
+    def test_released_arrays_close_their_blocks_once_gone(self):
+        solver = ParallelLinearSolver(workers=1)
+        array = solver.empty((4, 4))
+        (block, _), = solver._blocks.values()
+        view = array[1:]
+        solver.close()
+        # unlinked, but still mapped by the array and its view
+        self.assertIsNotNone(block.buf)
+        del array
+        view[...] = 1
+        self.assertIsNotNone(block.buf)
+        del view
+        self.assertIsNone(block.buf)
+
+    def test_arrays_alive_at_close_leave_no_errors(self):
+        script = textwrap.dedent("""
+            import numpy as np
+            from solvers.linear_system.parallel import ParallelLinearSolver
+
+            def main():
+                with ParallelLinearSolver(workers=1) as solver:
+                    coefficients = solver.empty((2, 3, 3))
+                    coefficients[...] = np.eye(3)
+                    bias = solver.empty((2, 3))
+                    bias[...] = 1
+                    out = solver.solve(coefficients, bias)
+                return coefficients, out
+
+            kept = main()
+            main()
+        """)
+        completed = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=60,
+                                   cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.assertEqual(completed.returncode, 0, completed.stderr)
+        self.assertEqual(completed.stderr, "")
+
+    def test_one_solver_per_chunk(self):
+        coefficients = np.broadcast_to(np.eye(4), (5, 4, 4))
+        out = np.empty((5, 4))
+        with mock.patch("solvers.linear_system.parallel.GaussSolver", wraps=GaussSolver) as solver_type:
+            self.assertEqual(_solve_views(coefficients, np.ones((5, 4)), out, 0, 5, tile_size=2), {})
+        solver_type.assert_called_once()
+        np.testing.assert_array_equal(out, 1)
+
+    def test_mapped_views_do_not_outlive_an_exception(self):
+        def fail(array: np.ndarray):
+            view = array[1:]
+            raise KeyError(view.shape)
+
+        descriptor = self.solver._describe(self.solver.empty((3,)))
+        with self.assertRaises(KeyError):
+            with _mapped(descriptor) as views:
+                fail(*views)
+        self.solver._free(descriptor.name)
+
+    def test_singular_system_is_reported(self):
+        self.coefficients[4] = 0
+        result = self.solver.solve(self.coefficients, self.bias)
+        self.assertEqual(list(self.solver.errors), [4])
+        self.assertTrue(np.all(np.isnan(result[4])))
+        self.assertTrue(np.all(np.isfinite(np.delete(result, 4, axis=0))))
+
+    def test_workers_get_descriptors_only(self):
+        descriptor = ArrayDescriptor("psm_name", self.coefficients.shape, "<f8", 128)
+        self.assertLess(len(pickle.dumps(descriptor)), 300)
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            self.solver.solve(self.coefficients[0], self.bias[0])
+        with self.assertRaises(ValueError):
+            self.solver.solve(self.coefficients, self.bias[:5])
+        with self.assertRaises(ValueError):
+            self.solver.solve(self.coefficients, self.bias, out=np.empty((10, 40), dtype=np.float32))
+        with self.assertRaises(ValueError):
+            self.solver.release(np.empty(3))
+        with self.assertRaises(ValueError):
+            ParallelLinearSolver(workers=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from batch import Job, run_batch
+from solvers.monadic.expression import Expression
+from solvers.monadic.newton import NewtonSolver
+from solvers.monadic.polynomial import Polynomial, PolynomialSolver, horner, roots
+
+
+class TestPolynomial(unittest.TestCase):
+    def test_horner_matches_polyval(self):
+        coefficients = [2.0, -3.0, 0.0, 5.0]
+        x = np.linspace(-2, 2, 9)
+        value, derivative = horner(coefficients, x)
+        np.testing.assert_allclose(value, np.polyval(coefficients, x))
+        np.testing.assert_allclose(derivative, np.polyval(np.polyder(coefficients), x))
+        self.assertEqual(Polynomial(coefficients).evaluate(2.0), (9.0, 12.0))
+
+    def test_horner_broadcasts_over_polynomials(self):
+        coefficients = np.array([[1.0, 0.0, -1.0], [1.0, 2.0, 1.0]])
+        points = np.array([[0.0, 1.0, 2.0], [-1.0, 0.0, 1.0]])
+        value, _ = horner(coefficients[:, np.newaxis, :], points)
+        np.testing.assert_array_equal(value, [[-1.0, 0.0, 3.0], [0.0, 1.0, 4.0]])
+
+    def test_from_expression(self):
+        polynomial = Polynomial.from_expression(Expression("(x - 1) * (x + 2) ** 2 / 2 - pi"))
+        np.testing.assert_allclose(polynomial.coefficients, [0.5, 1.5, 0.0, -2.0 - np.pi])
+        for source in ("sin(x)", "x ** 0.5", "1 / x", "x ** x"):
+            with self.assertRaises(ValueError):
+                Polynomial.from_expression(Expression(source))
+
+    def test_works_as_unary_function(self):
+        polynomial = Polynomial([1.0, 0.0, -2.0])
+        root = NewtonSolver(polynomial).solve(guess=1.0, tolerance=1e-12, derivative=polynomial.derivative())
+        self.assertAlmostEqual(root, np.sqrt(2), places=12)
+
+
+class TestPolynomialSolver(unittest.TestCase):
+    def test_newton_with_deflation_finds_complex_roots(self):
+        solver = PolynomialSolver(Expression("(x - 1) * (x - 2) * (x**2 + 1)"))
+        found = solver.solve(tolerance=1e-12, method="newton")
+        np.testing.assert_allclose(found, [-1j, 1j, 1, 2], atol=1e-12)
+        self.assertTrue(solver.trace.has_converged)
+        self.assertEqual({step.root_index for step in solver.trace.steps}, {0, 1, 2, 3})
+
+    def test_real_roots_are_real(self):
+        found = PolynomialSolver([1.0, 1.0, -5.0, 3.0]).solve(tolerance=1e-12)
+        self.assertEqual(found.dtype, float)
+        # (x - 1)^2 (x + 3): the double root converges only linearly, but still converges
+        np.testing.assert_allclose(found, [-3.0, 1.0, 1.0], atol=1e-6)
+
+    def test_tiny_real_roots_survive(self):
+        for coefficients, expected in (([1.0, -3e-9], [3e-9]), ([1e-3, -1e-12], [1e-9]), ([1.0, 0.0, -1e-18], [-1e-9, 1e-9])):
+            with self.subTest(coefficients=coefficients):
+                for method in ("companion", "newton"):
+                    found = PolynomialSolver(coefficients).solve(tolerance=1e-30, method=method)
+                    self.assertEqual(found.dtype, float)
+                    np.testing.assert_allclose(found, expected, rtol=1e-6)
+                np.testing.assert_allclose(roots(coefficients), expected, rtol=1e-6)
+
+    def test_methods_agree(self):
+        coefficients = np.random.default_rng(1).standard_normal(9)
+        newton = PolynomialSolver(coefficients).solve(method="newton")
+        companion = PolynomialSolver(coefficients).solve(method="companion")
+        np.testing.assert_allclose(newton, companion, atol=1e-9)
+        np.testing.assert_allclose(companion, np.sort_complex(np.roots(coefficients)), atol=1e-9)
+
+    def test_high_degree_uses_companion_matrix(self):
+        solver = PolynomialSolver(np.poly(np.arange(1, 21)))
+        found = solver.solve()
+        self.assertEqual(solver.trace.steps, [])
+        np.testing.assert_allclose(found[:3], [1.0, 2.0, 3.0], atol=1e-6)
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            PolynomialSolver([3.0]).solve()
+        with self.assertRaises(ValueError):
+            PolynomialSolver([1.0, 2.0]).solve(method="laguerre")
+        with self.assertRaises(ValueError):
+            Polynomial([0.0, 0.0])
+
+
+class TestBatchedRoots(unittest.TestCase):
+    def test_stack_of_polynomials(self):
+        coefficients = np.random.default_rng(2).standard_normal((500, 7))
+        found = roots(coefficients)
+        self.assertEqual(found.shape, (500, 6))
+        expected = np.array([np.sort_complex(np.roots(row)) for row in coefficients])
+        np.testing.assert_allclose(found, expected, atol=1e-8)
+
+    def test_batch_jobs_are_vectorized(self):
+        jobs = [Job("a", "PolynomialSolver", "x**2 - 4"), Job("b", "PolynomialSolver", "x**2 + 1"),
+                Job("c", "PolynomialSolver", "x**3 - x"), Job("d", "PolynomialSolver", "sin(x)")]
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "results.jsonl")
+            summary = run_batch(jobs, output, progress=None)
+            with open(output) as file:
+                records = {record["id"]: record for record in map(json.loads, file)}
+        self.assertEqual((summary.converged, summary.failed), (3, 1))
+        self.assertEqual(records["a"]["result"], [-2.0, 2.0])
+        self.assertEqual(records["b"]["result"], ["-1j", "1j"])
+        np.testing.assert_allclose(records["c"]["result"], [-1.0, 0.0, 1.0], atol=1e-12)
+        self.assertIn("Not a polynomial", records["d"]["error"])
+
+
+if __name__ == '__main__':
+    unittest.main()
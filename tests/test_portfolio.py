@@ -0,0 +1,87 @@
+import math
+import unittest
+
+from solvers.monadic.interval import Interval
+from solvers.monadic.monadic_equation_solver import MonadicEquationSolverNotConvergedException
+from solvers.monadic.portfolio import PortfolioSolver
+
+
+class _CountingFunction:
+    def __init__(self, function):
+        self.function = function
+        self.calls = 0
+
+    def __call__(self, x):
+        self.calls += 1
+        return self.function(x)
+
+
+class TestPortfolioSolver(unittest.TestCase):
+    def test_fastest_method_wins(self):
+        solver = PortfolioSolver(lambda x: x * x - 2)
+        root = solver.solve(guess=1.0, tolerance=1e-12)
+        self.assertAlmostEqual(root, math.sqrt(2), places=12)
+        self.assertEqual(solver.winner, "NewtonSolver")
+        self.assertTrue(solver.trace.has_converged)
+        # bisection needs an interval, so it did not take part
+        self.assertEqual({step.method for step in solver.trace.steps},
+                         {"NewtonSolver", "AitkenSolver", "NewtonDownhillSolver"})
+
+    def test_bracketing_rescues_divergent_newton(self):
+        # Newton runs away from 1.5 on atan
+        solver = PortfolioSolver(math.atan, methods=("NewtonSolver", "BisectionSolver"))
+        root = solver.solve(guess=1.5, interval=Interval(-1.0, 2.0), tolerance=1e-12)
+        self.assertEqual(solver.winner, "BisectionSolver")
+        self.assertAlmostEqual(root, 0.0, places=10)
+
+    def test_methods_take_turns_and_share_evaluations(self):
+        function = _CountingFunction(lambda x: x ** 3 - x - 2)
+        solver = PortfolioSolver(function)
+        solver.solve(interval=Interval(1.0, 2.0), tolerance=1e-12)
+        methods = [step.method for step in solver.trace.steps]
+        self.assertEqual(methods[:4], ["NewtonSolver", "AitkenSolver", "NewtonDownhillSolver", "BisectionSolver"])
+        self.assertEqual([step.iteration for step in solver.trace.steps], list(range(len(methods))))
+        self.assertGreater(solver.cache_hits, 0)
+        self.assertEqual(function.calls, solver.evaluations)
+
+    def test_concurrent_race(self):
+        solver = PortfolioSolver(lambda x: x ** 3 - x - 2, methods=("NewtonSolver", "BisectionSolver"),
+                                 concurrent=True)
+        root = solver.solve(interval=Interval(1.0, 2.0), tolerance=1e-12)
+        self.assertIn(solver.winner, ("NewtonSolver", "BisectionSolver"))
+        self.assertAlmostEqual(root, 1.5213797068045676, places=10)
+        self.assertTrue(solver.trace.has_converged)
+
+    def test_failing_method_is_dropped(self):
+        # the endpoints do not bracket a root, so only Newton runs
+        solver = PortfolioSolver(lambda x: x * x - 2, methods=("BisectionSolver", "NewtonSolver"))
+        solver.solve(guess=1.0, interval=Interval(-1.0, 1.0), tolerance=1e-12)
+        self.assertEqual(solver.winner, "NewtonSolver")
+        self.assertIsInstance(solver.errors["BisectionSolver"], ValueError)
+        with self.assertRaises(ValueError):
+            PortfolioSolver(lambda x: x * x - 2, methods=("BisectionSolver",)).solve(
+                interval=Interval(-1.0, 1.0), tolerance=1e-12)
+
+    def test_no_convergence_keeps_best_result(self):
+        solver = PortfolioSolver(lambda x: x * x + 1, methods=("NewtonSolver", "AitkenSolver"))
+        with self.assertRaises(MonadicEquationSolverNotConvergedException):
+            solver.solve(guess=0.5, tolerance=1e-12, max_iterations=8, raise_exception_if_no_convergence=True)
+        self.assertIsNone(solver.winner)
+        self.assertFalse(solver.trace.has_converged)
+        self.assertIsNotNone(solver.trace.final_result)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            PortfolioSolver(lambda x: x, methods=("GaussSolver",))
+        with self.assertRaises(ValueError):
+            PortfolioSolver(lambda x: x).iterate(tolerance=1e-12)
+
+    def test_iterate_can_stop_early(self):
+        solver = PortfolioSolver(lambda x: x * x - 2)
+        steps = solver.iterate(guess=1.0, tolerance=1e-12)
+        self.assertNotEqual(next(steps).method, "BisectionSolver")
+        steps.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+import math
+import os
+import tempfile
+import tracemalloc
+import unittest
+
+import numpy as np
+
+from solvers.linear_system.gauss import GaussSolver
+from solvers.linear_system.out_of_core import OutOfCoreSolver
+from solvers.linear_system.refinement import MixedPrecisionSolver
+from solvers.linear_system.structured import StructuredSolver
+from solvers.monadic.aitken import AitkenSolver
+from solvers.monadic.bisection import BisectionSolver
+from solvers.monadic.continuation import ContinuationSolver
+from solvers.monadic.interval import Interval
+from solvers.monadic.newton import NewtonSolver
+from solvers.monadic.newton_downhill import NewtonDownhillSolver
+from solvers.monadic.polynomial import PolynomialSolver
+from solvers.monadic.portfolio import PortfolioSolver
+from solvers.profiling import profile_solve
+from solvers.trace_io import TraceWriter
+
+# Bytes per step a trace holds besides array data, as SolutionTrace.memory_usage() measured them
+# on CPython 3.11 for the workloads below. A test fails once a step grows beyond its baseline;
+# HEADROOM only absorbs the object sizes of other interpreter versions, not an added field.
+STEP_BASELINES = {
+    "solvers.monadic.bisection:BisectionStep": 132,
+    "solvers.monadic.newton:NewtonStep": 156,
+    "solvers.monadic.aitken:AitkenStep": 180,
+    "solvers.monadic.newton_downhill:NewtonDownhillStep": 156,
+    "solvers.monadic.polynomial:PolynomialStep": 178,
+    "solvers.monadic.portfolio:PortfolioStep": 147,
+    "solvers.monadic.continuation:ContinuationStep": 261,
+    "solvers.linear_system.gauss:GaussStep": 307,
+    "solvers.linear_system.refinement:RefinementStep": 132,
+    "solvers.linear_system.structured:StructureStep": 248,
+    "solvers.linear_system.out_of_core:PanelStep": 188,
+}
+# bytes per step a solve retains on top of its snapshots, as tracemalloc measured them; for gauss
+# they include the 40 x 40 eliminated matrix the solver keeps for condition_estimate()
+RETAINED_BASELINES = {
+    "bisection": 232,
+    "gauss": 950,
+}
+HEADROOM = 1.1
+
+
+def _system(size: int = 40) -> tuple:
+    generator = np.random.default_rng(0)
+    return generator.standard_normal((size, size)) + size * np.eye(size), generator.standard_normal(size)
+
+
+def _workloads() -> dict:
+    coefficients, bias = _system()
+    return {
+        "bisection": (BisectionSolver(lambda x: x * x - 2), (Interval(0, 2), 1e-15)),
+        "newton": (NewtonSolver(math.atan), (1.0, 1e-12)),
+        "aitken": (AitkenSolver(lambda x: math.cos(x) - x), (1.0, 1e-12)),
+        "newton_downhill": (NewtonDownhillSolver(math.atan), (10.0, 1e-12)),
+        "polynomial": (PolynomialSolver(np.poly(np.arange(1, 8))), ()),
+        "portfolio": (PortfolioSolver(lambda x: math.cos(x) - x), (1.0,)),
+        "continuation": (ContinuationSolver(lambda x, p: x * x - p), ([1.0, -1.0], np.linspace(1, 100, 100))),
+        "gauss": (GaussSolver(), (coefficients, bias)),
+        "gauss_tiled": (GaussSolver(workers=2, tile_size=8), (coefficients, bias)),
+        "refinement": (MixedPrecisionSolver(), (coefficients, bias)),
+        "structured": (StructuredSolver(), (coefficients + coefficients.T, bias)),
+        "out_of_core": (OutOfCoreSolver(memory_budget=40 * 8 * 4 * 8), (coefficients, bias)),
+    }
+
+
+class TestMemoryUsage(unittest.TestCase):
+    def test_bytes_per_step_within_baselines(self):
+        for name, (solver, arguments) in _workloads().items():
+            with self.subTest(name):
+                solver.solve(*arguments)
+                usage = solver.trace.memory_usage()
+                self.assertTrue(usage.steps)
+                for step_type, step_usage in usage.steps.items():
+                    self.assertEqual(step_usage.count, len(solver.trace.steps))
+                    per_step = (step_usage.nbytes - step_usage.array_nbytes) / step_usage.count
+                    self.assertLessEqual(per_step, STEP_BASELINES[step_type] * HEADROOM, step_type)
+
+    def test_bytes_per_snapshot_within_baseline(self):
+        coefficients, bias = _system(30)
+        # a snapshot holds the augmented matrix once, in the precision of the elimination
+        for solver in (GaussSolver(), GaussSolver(workers=2, tile_size=8)):
+            for dtype in (np.float64, np.float32):
+                with self.subTest(workers=solver.workers, dtype=dtype):
+                    solver.solve(coefficients, bias, dtype=dtype)
+                    usage = solver.trace.memory_usage().steps["solvers.linear_system.gauss:GaussStep"]
+                    self.assertLessEqual(usage.array_bytes_per_step, 30 * 31 * np.dtype(dtype).itemsize)
+        solver = GaussSolver()
+        solver.solve(coefficients, bias, record_snapshots=False)
+        usage = solver.trace.memory_usage()
+        self.assertEqual(usage.steps, {})
+        self.assertGreaterEqual(usage.final_result, solver.trace.final_result.nbytes)
+
+    def test_final_result_held_by_a_step_counts_once(self):
+        solver = BisectionSolver(lambda x: x * x - 2)
+        solver.solve(Interval(0, 2), 1e-12)
+        usage = solver.trace.memory_usage()
+        self.assertEqual(usage.nbytes, usage.steps["solvers.monadic.bisection:BisectionStep"].nbytes)
+
+    def test_streamed_steps_hold_no_memory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with TraceWriter(os.path.join(directory, "trace.bin")) as writer:
+                solver = NewtonSolver(math.atan)
+                solver.trace = writer.trace
+                solver.solve(1.0, 1e-12)
+                self.assertEqual(writer.trace.memory_usage().steps, {})
+
+
+class TestProfileSolve(unittest.TestCase):
+    def test_retained_bytes_per_step_within_baselines(self):
+        workloads = _workloads()
+        for name in RETAINED_BASELINES:
+            solver, arguments = workloads[name]
+            with self.subTest(name):
+                profile = profile_solve(solver, *arguments)
+                arrays = sum(usage.array_nbytes for usage in profile.trace.steps.values())
+                per_step = (profile.retained - arrays) / profile.step_count
+                self.assertLessEqual(per_step, RETAINED_BASELINES[name] * HEADROOM)
+
+    def test_attributes_steps_by_type(self):
+        solver, arguments = _workloads()["gauss"]
+        steps = solver.trace.steps
+        profile = profile_solve(solver, *arguments)
+        self.assertIs(solver.trace.steps, steps)
+        self.assertEqual(list(profile.steps), ["solvers.linear_system.gauss:GaussStep"])
+        self.assertEqual(profile.step_count, len(steps))
+        snapshot = steps[0].matrix_snapshot.nbytes
+        # computing a step takes at least its snapshot, and the solve at least all of them
+        self.assertGreaterEqual(profile.steps["solvers.linear_system.gauss:GaussStep"].peak, snapshot)
+        self.assertGreaterEqual(profile.peak, profile.retained)
+        self.assertGreaterEqual(profile.retained, len(steps) * snapshot)
+
+    def test_leaves_running_tracemalloc_on(self):
+        tracemalloc.start()
+        try:
+            profile = profile_solve(NewtonSolver(math.atan), 1.0, 1e-12)
+            self.assertTrue(tracemalloc.is_tracing())
+        finally:
+            tracemalloc.stop()
+        self.assertGreater(profile.retained, 0)
+        self.assertFalse(tracemalloc.is_tracing())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+import numpy as np
+
+from solvers.linear_system.refinement import MixedPrecisionSolver
+
+
+def _hilbert(size: int) -> np.ndarray:
+    return 1 / (np.arange(size)[:, np.newaxis] + np.arange(size) + 1)
+
+
+class TestMixedPrecisionSolver(unittest.TestCase):
+    def test_reaches_double_precision(self):
+        generator = np.random.default_rng(0)
+        coefficients = generator.standard_normal((100, 100))
+        bias = generator.standard_normal((100, 2))
+        solver = MixedPrecisionSolver()
+        result = solver.solve(coefficients, bias)
+        self.assertEqual(result.dtype, np.float64)
+        self.assertTrue(solver.trace.has_converged)
+        self.assertFalse(solver.used_fallback)
+        # a float32 solve alone is only accurate to about 1e-5
+        np.testing.assert_allclose(result, np.linalg.solve(coefficients, bias), atol=1e-12)
+        norms = [step.residual_norm for step in solver.trace.steps]
+        self.assertEqual(norms, sorted(norms, reverse=True))
+
+    def test_ill_conditioned_matrix_falls_back(self):
+        coefficients = _hilbert(8)
+        solver = MixedPrecisionSolver()
+        result = solver.solve(coefficients, coefficients @ np.ones(8))
+        self.assertTrue(solver.used_fallback)
+        np.testing.assert_allclose(result, np.ones(8), atol=1e-5)
+
+    def test_vector_bias(self):
+        solver = MixedPrecisionSolver()
+        result = solver.solve(np.array([[4.0, 1.0], [1.0, 3.0]]), np.array([1.0, 2.0]))
+        self.assertEqual(result.shape, (2,))
+        np.testing.assert_allclose(result, [1 / 11, 7 / 11], atol=1e-15)
+
+
+if __name__ == '__main__':
+    unittest.main()
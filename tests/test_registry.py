@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from batch import Job, run_batch
+from solvers.monadic.bisection import BisectionSolver
+from solvers.monadic.bisection import BisectionStep
+from solvers.monadic.newton import NewtonSolver
+from solvers.registry import SolverRegistry, reference_of, registry
+
+
+class _CustomNewtonSolver(NewtonSolver):
+    pass
+
+
+class TestSolverRegistry(unittest.TestCase):
+    def test_builtin_lookup_by_name_class_and_instance(self):
+        registration = registry.get("BisectionSolver")
+        self.assertIs(registration.solver_class(), BisectionSolver)
+        self.assertIs(registration.step_class(), BisectionStep)
+        self.assertIs(registry.get(BisectionSolver), registration)
+        self.assertIs(registry.get(BisectionSolver(lambda x: x)), registration)
+
+    def test_reference_of(self):
+        self.assertEqual(reference_of(BisectionStep), "solvers.monadic.bisection:BisectionStep")
+        self.assertEqual(reference_of(_CustomNewtonSolver), f"{__name__}:_CustomNewtonSolver")
+
+    def test_subclass_falls_back_to_base_registration(self):
+        self.assertIs(registry.get(_CustomNewtonSolver), registry.get("NewtonSolver"))
+
+    def test_unknown_solver_raises(self):
+        with self.assertRaises(ValueError):
+            registry.get("NoSuchSolver")
+        with self.assertRaises(ValueError):
+            registry.get(object())
+        self.assertNotIn("NoSuchSolver", registry)
+
+    def test_names_by_category(self):
+        self.assertEqual(registry.names("monadic"),
+                         ["BisectionSolver", "NewtonSolver", "NewtonDownhillSolver", "AitkenSolver",
+                          "PortfolioSolver", "PolynomialSolver"])
+        self.assertIn("GaussSolver", registry.names("linear_system"))
+
+    def test_duplicate_registration_requires_replace(self):
+        solvers = SolverRegistry()
+        solvers.register("Solver", NewtonSolver)
+        with self.assertRaises(ValueError):
+            solvers.register("Solver", BisectionSolver)
+        solvers.register("Solver", BisectionSolver, replace=True)
+        self.assertIs(solvers.get(BisectionSolver).solver_class(), BisectionSolver)
+        self.assertNotIn(NewtonSolver, solvers)
+
+    def test_fastest_implementation(self):
+        solvers = SolverRegistry()
+        scalar_only = solvers.register("Scalar", NewtonSolver)
+        self.assertEqual(scalar_only.fastest_implementation(), ("scalar", NewtonSolver))
+        vectorized = solvers.register("Vectorized", BisectionSolver, implementations={"vectorized": len})
+        self.assertEqual(vectorized.fastest_implementation(), ("vectorized", len))
+        self.assertEqual(vectorized.fastest_implementation(("scalar",)), ("scalar", BisectionSolver))
+
+    def test_load_plugins_from_entry_points(self):
+        def register_plugins(target: SolverRegistry):
+            target.register("HookSolver", "solvers.monadic.newton:NewtonSolver")
+
+        class EntryPoint:
+            def __init__(self, name, value):
+                self.name, self.value = name, value
+
+            def load(self):
+                return self.value
+
+        solvers = SolverRegistry()
+        entry_points = [EntryPoint("ClassSolver", BisectionSolver), EntryPoint("hook", register_plugins)]
+        with mock.patch("importlib.metadata.entry_points", return_value=entry_points) as patched:
+            solvers.load_plugins()
+            solvers.load_plugins()
+        patched.assert_called_once()
+        self.assertIs(solvers.get("ClassSolver").solver_class(), BisectionSolver)
+        self.assertIs(solvers.get("HookSolver").solver_class(), NewtonSolver)
+        self.assertEqual(solvers.get(NewtonSolver).name, "HookSolver")
+
+    def test_batch_uses_vectorized_implementation(self):
+        calls = []
+
+        def solve_all(jobs):
+            calls.append([job.id for job in jobs])
+            return [dict(id=job.id, solver=job.solver, expression=job.expression, result=0.0, has_converged=True,
+                         iterations=1, elapsed=0.0, error=None) for job in jobs]
+
+        registry.register("VectorizedTestSolver", NewtonSolver, implementations={"vectorized": solve_all})
+        self.addCleanup(registry.unregister, "VectorizedTestSolver")
+        jobs = [Job(str(i), "VectorizedTestSolver", "x", {}) for i in range(3)]
+        jobs.append(Job("scalar", "NewtonSolver", "x - 1", {"guess": 0.0, "tolerance": 1e-12}))
+        with tempfile.TemporaryDirectory() as directory:
+            summary = run_batch(jobs, os.path.join(directory, "results.jsonl"), progress=None)
+        self.assertEqual(calls, [["0", "1", "2"]])
+        self.assertEqual((summary.completed, summary.converged), (4, 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generous upper bound for importing the solver packages in a fresh interpreter;
+# eager matplotlib imports alone take several times longer than this.
+IMPORT_TIME_BUDGET_SECONDS = 0.15
+
+
+def _run(code: str) -> dict:
+    output = subprocess.check_output([sys.executable, "-c", code], cwd=REPOSITORY_ROOT, text=True)
+    return json.loads(output)
+
+
+class TestStartup(unittest.TestCase):
+    def test_package_import_is_lazy(self):
+        loaded = _run(
+            "import json, sys\n"
+            "import solvers.monadic, solvers.linear_system, solvers.nonlinear_system\n"
+            "print(json.dumps(sorted(m for m in sys.modules if m.startswith(('solvers', 'matplotlib', 'numpy')))))"
+        )
+        self.assertEqual(loaded, ["solvers", "solvers.linear_system", "solvers.monadic", "solvers.nonlinear_system"])
+
+    def test_importing_one_solver_loads_only_its_dependencies(self):
+        loaded = _run(
+            "import json, sys\n"
+            "from solvers.monadic import NewtonSolver\n"
+            "print(json.dumps(sorted(m for m in sys.modules if m.startswith(('solvers', 'matplotlib', 'visualizers')))))"
+        )
+        self.assertIn("solvers.monadic.newton", loaded)
+        for module in ("solvers.monadic.bisection", "solvers.monadic.aitken", "solvers.monadic.expression"):
+            self.assertNotIn(module, loaded)
+        self.assertFalse(any(module.startswith(("matplotlib", "visualizers")) for module in loaded))
+
+    def test_visualizer_package_does_not_import_matplotlib(self):
+        loaded = _run(
+            "import json, sys\n"
+            "from visualizers.monadic.monadic_equation_visualizer import MonadicEquationVisualizer\n"
+            "print(json.dumps('matplotlib' in sys.modules))"
+        )
+        self.assertFalse(loaded)
+
+    def test_lazy_exports_resolve(self):
+        import solvers.monadic
+        from solvers.monadic.newton import NewtonSolver
+        self.assertIs(solvers.monadic.NewtonSolver, NewtonSolver)
+        self.assertIn("BisectionSolver", dir(solvers.monadic))
+        with self.assertRaises(AttributeError):
+            getattr(solvers.monadic, "NoSuchSolver")
+
+    def test_import_time_budget(self):
+        timing = _run(
+            "import json, time\n"
+            "start = time.perf_counter()\n"
+            "import solvers.monadic, solvers.linear_system\n"
+            "from solvers.monadic import NewtonSolver, BisectionSolver, AitkenSolver, NewtonDownhillSolver\n"
+            "print(json.dumps(time.perf_counter() - start))"
+        )
+        self.assertLess(timing, IMPORT_TIME_BUDGET_SECONDS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+
+import numpy as np
+
+from solvers.linear_system.structured import StructuredSolver, _symmetric_factorization, detect_structure
+
+
+class TestStructuredSolver(unittest.TestCase):
+    def setUp(self):
+        generator = np.random.default_rng(0)
+        self.size = 150
+        self.matrix = generator.standard_normal((self.size, self.size))
+        self.bias = generator.standard_normal((self.size, 3))
+
+    def assert_solves(self, coefficients, expected_structure, expected_kernel):
+        solver = StructuredSolver(block_size=32)
+        result = solver.solve(coefficients, self.bias)
+        self.assertEqual(solver.structure, expected_structure)
+        self.assertEqual(solver.kernel, expected_kernel)
+        self.assertEqual(solver.trace.steps[-1].kernel, expected_kernel)
+        self.assertTrue(solver.trace.has_converged)
+        np.testing.assert_allclose(coefficients @ result, self.bias, atol=1e-9)
+        return solver
+
+    def test_diagonal(self):
+        self.assert_solves(np.diag(np.arange(1.0, self.size + 1)), "diagonal", "diagonal_scale")
+
+    def test_triangular(self):
+        upper = np.triu(self.matrix) + self.size * np.eye(self.size)
+        self.assert_solves(upper, "upper_triangular", "back_substitution")
+        self.assert_solves(upper.T, "lower_triangular", "forward_substitution")
+
+    def test_positive_definite(self):
+        # B^T B is symmetric only up to round-off
+        coefficients = self.matrix.T @ self.matrix + np.eye(self.size)
+        solver = self.assert_solves(coefficients, "symmetric", "cholesky")
+        self.assertEqual([step.kernel for step in solver.trace.steps], ["detected", "cholesky"])
+
+    def test_symmetric_indefinite(self):
+        signs = np.where(np.arange(self.size) % 2, 1.0, -1.0)
+        coefficients = self.matrix + self.matrix.T + np.diag(signs * 3 * self.size)
+        solver = self.assert_solves(coefficients, "symmetric", "ldl")
+        self.assertEqual([step.kernel for step in solver.trace.steps], ["detected", "cholesky", "ldl"])
+
+    def test_unstable_symmetric_falls_back_to_lu(self):
+        # a zero pivot: L D L^T does not exist without pivoting
+        coefficients = np.array([[0.0, 1.0], [1.0, 0.0]])
+        solver = StructuredSolver()
+        np.testing.assert_allclose(solver.solve(coefficients, np.array([2.0, 3.0])), [3.0, 2.0])
+        self.assertEqual([step.kernel for step in solver.trace.steps], ["detected", "cholesky", "ldl", "lu"])
+
+    def test_general(self):
+        self.assert_solves(self.matrix, "general", "lu")
+
+    def test_hermitian(self):
+        complex_matrix = self.matrix[:40, :40] + 1j * self.matrix[40:80, 40:80]
+        coefficients = complex_matrix.conj().T @ complex_matrix + np.eye(40)
+        solver = StructuredSolver()
+        result = solver.solve(coefficients, self.bias[:40, 0])
+        self.assertEqual(solver.kernel, "cholesky")
+        np.testing.assert_allclose(coefficients @ result, self.bias[:40, 0], atol=1e-10)
+
+    def test_blocked_factorizations_match_numpy(self):
+        coefficients = self.matrix.T @ self.matrix + np.eye(self.size)
+        lower, diagonal = _symmetric_factorization(coefficients, 16, cholesky=True)
+        np.testing.assert_allclose(lower, np.linalg.cholesky(coefficients), atol=1e-10)
+        np.testing.assert_array_equal(diagonal, 1)
+        lower, diagonal = _symmetric_factorization(coefficients, 16, cholesky=False)
+        np.testing.assert_allclose(lower * diagonal @ lower.T, coefficients, atol=1e-10)
+        np.testing.assert_array_equal(np.diagonal(lower), 1)
+
+    def test_detect_structure(self):
+        self.assertEqual(detect_structure(np.eye(3)), "diagonal")
+        self.assertEqual(detect_structure(np.array([[1.0, 2.0], [2.0, 1.0]])), "symmetric")
+        self.assertEqual(detect_structure(np.array([[1.0, 2.0], [2.1, 1.0]])), "general")
+        self.assertEqual(detect_structure(np.zeros((0, 0))), "diagonal")
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            StructuredSolver().solve(np.ones((2, 3)), np.ones(2))
+        with self.assertRaises(ValueError):
+            StructuredSolver().solve(np.diag([1.0, 0.0]), np.ones(2))
+        with self.assertRaises(ValueError):
+            StructuredSolver().solve(np.eye(2), np.ones(3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import copy
+import math
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from solvers.monadic.aitken import AitkenSolver
+from solvers.monadic.bisection import BisectionSolver
+from solvers.monadic.interval import Interval
+from solvers.monadic.newton import NewtonSolver, NewtonStep
+from solvers.monadic.newton_downhill import NewtonDownhillSolver
+from solvers.solution_trace import SolutionTrace
+from solvers.trace_analysis import analyze, cheapest_solvers
+from solvers.trace_io import TraceReader
+
+
+def _trace(solver, **kwargs) -> SolutionTrace:
+    solver.solve(**kwargs)
+    return copy.deepcopy(solver.trace)
+
+
+class TestTraceAnalysis(unittest.TestCase):
+    def test_newton_is_quadratic(self):
+        analysis = analyze([_trace(NewtonSolver(lambda x: x * x - 2), guess=1.0, tolerance=1e-12)])
+        self.assertAlmostEqual(analysis.order[0], 2.0, places=2)
+        # |f''(r) / (2 f'(r))| = 1 / (2 sqrt(2))
+        self.assertAlmostEqual(analysis.asymptotic_constant[0], 1 / (2 * math.sqrt(2)), places=2)
+        self.assertEqual(analysis.solver[0], "NewtonSolver")
+        self.assertEqual(analysis.evaluations[0], 3 * analysis.iterations[0] + 3)
+
+    def test_linear_convergence(self):
+        bisection = _trace(BisectionSolver(lambda x: x ** 3 - x - 2), interval=Interval(1.0, 2.0), tolerance=1e-10)
+        # a double root slows Newton down to linear convergence with rate 1/2
+        double_root = _trace(NewtonSolver(lambda x: x * x), guess=1.0, tolerance=1e-12)
+        analysis = analyze([bisection, double_root])
+        np.testing.assert_allclose(analysis.order, [1.0, 1.0], atol=1e-6)
+        np.testing.assert_allclose(analysis.contraction, [0.5, 0.5], atol=1e-6)
+        self.assertEqual(analysis.evaluations[0], analysis.iterations[0] + 2)
+
+    def test_detects_failures(self):
+        traces = [
+            _trace(NewtonSolver(math.atan), guess=1.5, tolerance=1e-12, max_iterations=10),
+            # Newton cycles between 0 and 1 forever
+            _trace(NewtonSolver(lambda x: x ** 3 - 2 * x + 2), guess=0.0, tolerance=1e-12, max_iterations=20),
+            SolutionTrace(steps=[NewtonStep(k, 1.0 + 1e-3 * k, 1.0, 1.0) for k in range(10)], final_result=1.01),
+            _trace(AitkenSolver(lambda x: math.cos(x) - x), guess=1.0, tolerance=1e-12),
+        ]
+        analysis = analyze(traces)
+        np.testing.assert_array_equal(analysis.diverging, [True, False, False, False])
+        np.testing.assert_array_equal(analysis.oscillating, [True, True, False, False])
+        np.testing.assert_array_equal(analysis.stagnating, [False, False, True, False])
+        self.assertTrue(np.isnan(analysis.order[1]))
+
+    def test_bulk_traces_of_different_lengths(self):
+        traces = [_trace(NewtonSolver(lambda x, a=a: x * x - a), guess=1.0, tolerance=1e-12)
+                  for a in np.linspace(2, 1000, 200)]
+        traces.append(SolutionTrace(final_result=1.0, has_converged=True))
+        analysis = analyze(traces, solvers=["NewtonSolver"] * len(traces))
+        self.assertEqual(len(analysis), 201)
+        # the numerical derivative blurs the very last steps a little
+        self.assertTrue(np.all(np.abs(analysis.order[:200] - 2) < 0.2))
+        self.assertEqual(analysis.evaluations[200], 3)
+        self.assertTrue(np.isnan(analysis.order[200]))
+
+    def test_trace_files(self):
+        trace = _trace(NewtonDownhillSolver(lambda x: x ** 3 - x - 1), guess=0.6, tolerance=1e-12)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trace.bin")
+            trace.save(path)
+            from_file, in_memory = analyze([TraceReader(path), trace])
+        self.assertEqual(from_file, in_memory)
+
+    def test_cheapest_solvers(self):
+        problems = {
+            "smooth": dict(function=lambda x: x ** 3 - x - 2, guess=1.5, interval=Interval(1.0, 2.0)),
+            "steep": dict(function=math.atan, guess=1.5, interval=Interval(-1.0, 2.0)),
+        }
+        traces, classes = [], []
+        for problem_class, problem in problems.items():
+            traces.append(_trace(NewtonSolver(problem["function"]), guess=problem["guess"], tolerance=1e-12))
+            traces.append(_trace(BisectionSolver(problem["function"]), interval=problem["interval"], tolerance=1e-12))
+            classes += [problem_class] * 2
+        analysis = analyze(traces)
+        # Newton is cheaper where it converges, but only bisection is reliable for atan from 1.5
+        self.assertEqual(cheapest_solvers(analysis, classes), {"smooth": "NewtonSolver", "steep": "BisectionSolver"})
+        with self.assertRaises(ValueError):
+            cheapest_solvers(analysis, classes, cost="time")
+
+
+if __name__ == '__main__':
+    unittest.main()
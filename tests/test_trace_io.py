@@ -0,0 +1,134 @@
+import math
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from solvers.linear_system.gauss import GaussSolver
+from solvers.monadic.aitken import AitkenSolver
+from solvers.monadic.bisection import BisectionSolver
+from solvers.monadic.interval import Interval
+from solvers.monadic.newton import NewtonSolver
+from solvers.monadic.newton_downhill import NewtonDownhillSolver
+from solvers.monadic.portfolio import PortfolioSolver
+from solvers.solution_trace import SolutionTrace
+from solvers.trace_io import TraceReader, TraceWriter, load_trace
+
+
+class TestTraceIO(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "trace.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_scalar_trace_round_trip(self):
+        solver = NewtonSolver(lambda x: x * x - 2)
+        solver.solve(guess=1.0, tolerance=1e-12)
+        solver.trace.save(self.path)
+        loaded = SolutionTrace.load(self.path)
+        self.assertEqual(loaded, solver.trace)
+
+    def test_monadic_traces_round_trip(self):
+        function = lambda x: math.cos(x) - x
+        solvers = [(NewtonSolver(function), dict(guess=1.0, tolerance=1e-12)),
+                   (BisectionSolver(function), dict(interval=Interval(0.0, 1.0), tolerance=1e-10)),
+                   (AitkenSolver(function), dict(guess=1.0, tolerance=1e-12)),
+                   (NewtonDownhillSolver(function), dict(guess=1.0, tolerance=1e-12)),
+                   (PortfolioSolver(function), dict(guess=1.0, interval=Interval(0.0, 1.0)))]
+        for solver, arguments in solvers:
+            with self.subTest(type(solver).__name__):
+                solver.solve(**arguments)
+                solver.trace.save(self.path)
+                self.assertEqual(SolutionTrace.load(self.path), solver.trace)
+        methods = {step.method for step in solver.trace.steps}
+        self.assertGreater(len(methods), 1)
+
+    def test_float_field_starting_with_an_int_keeps_its_fractions(self):
+        with TraceWriter(self.path) as writer:
+            solver = NewtonSolver(lambda x: x * x - 2)
+            solver.trace = writer.trace
+            solver.solve(guess=1, tolerance=1e-12)
+        guesses = [step.guess for step in load_trace(self.path).steps]
+        self.assertEqual(guesses[0], 1.0)
+        self.assertAlmostEqual(guesses[-1], 2 ** 0.5)
+        self.assertIsInstance(guesses[0], float)
+
+    def test_records_are_fixed_width(self):
+        solver = BisectionSolver(lambda x: x ** 3 - x - 2)
+        solver.solve(Interval(1.0, 2.0), tolerance=1e-10)
+        solver.trace.save(self.path)
+        reader = TraceReader(self.path)
+        # four float64 fields plus the int64 iteration
+        self.assertEqual(reader.records.dtype.itemsize, 5 * 8)
+        # only the .npy block of the final result follows the records
+        self.assertLess(os.path.getsize(self.path) - reader.data_offset - 5 * 8 * len(reader), 256)
+
+    def test_matrix_snapshots_random_access(self):
+        coefficients = np.array([[10, -19, -2], [-20, 40, 1], [1, 4, 5]])
+        solver = GaussSolver()
+        solver.solve(coefficients, np.array([3, 4, 5]))
+        solver.trace.save(self.path)
+
+        reader = TraceReader(self.path)
+        self.assertIsInstance(reader.records, np.memmap)
+        self.assertEqual(len(reader), len(solver.trace.steps))
+        for k in (2, 0, -1):
+            expected, step = solver.trace.steps[k], reader[k]
+            self.assertEqual((step.iteration, step.description), (expected.iteration, expected.description))
+            np.testing.assert_array_equal(step.matrix_snapshot, expected.matrix_snapshot)
+        self.assertEqual(reader.field("matrix_snapshot").shape, (len(reader), 3, 4))
+        np.testing.assert_array_equal(reader.final_result, solver.trace.final_result)
+        self.assertTrue(reader.has_converged)
+        with self.assertRaises(IndexError):
+            reader[len(reader)]
+
+    def test_solver_streams_steps_while_running(self):
+        with TraceWriter(self.path) as writer:
+            solver = NewtonSolver(lambda x: x * x - 2)
+            solver.trace = writer.trace
+            root = solver.solve(guess=1.0, tolerance=1e-12)
+            self.assertGreater(len(writer), 0)
+            self.assertEqual([step.iteration for step in writer], list(range(len(writer))))
+        loaded = load_trace(self.path)
+        self.assertEqual(loaded.final_result, root)
+        self.assertTrue(loaded.has_converged)
+        self.assertEqual(len(loaded.steps), len(writer))
+
+    def test_clear_truncates_stream(self):
+        with TraceWriter(self.path) as writer:
+            solver = NewtonSolver(lambda x: x * x - 2)
+            solver.trace = writer.trace
+            solver.solve(guess=100.0, tolerance=1e-12)
+            solver.solve(guess=1.0, tolerance=1e-12, max_iterations=2)
+        self.assertEqual(len(TraceReader(self.path)), 2)
+
+    def test_unclosed_writer_is_readable(self):
+        writer = TraceWriter(self.path)
+        solver = NewtonSolver(lambda x: x * x - 2)
+        solver.trace = writer.trace
+        solver.solve(guess=1.0, tolerance=1e-12)
+        writer._file.flush()
+        reader = TraceReader(self.path)
+        self.assertEqual(len(reader), len(writer))
+        self.assertIsNone(reader.final_result)
+        writer.close()
+
+    def test_empty_trace(self):
+        SolutionTrace(final_result=1.5, has_converged=True).save(self.path)
+        loaded = load_trace(self.path)
+        self.assertEqual(loaded, SolutionTrace(final_result=1.5, has_converged=True))
+
+    def test_long_strings_are_truncated(self):
+        solver = GaussSolver()
+        solver.solve(np.eye(2), np.ones(2))
+        solver.trace.steps[0].description = "x" * 500
+        with TraceWriter(self.path, string_width=16) as writer:
+            writer.extend(solver.trace.steps)
+        self.assertEqual(TraceReader(self.path)[0].description, "x" * 16)
+
+
+if __name__ == '__main__':
+    unittest.main()
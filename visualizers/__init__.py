@@ -1,10 +1,32 @@
-import matplotlib.pyplot as plt
-from matplotlib.ticker import FuncFormatter
-
-# Set the font parameters for LaTeX-style rendering
-plt.rcParams["mathtext.fontset"] = "cm"
-plt.rcParams["font.family"] = "serif"
-# Use full LaTeX for all text (requires a LaTeX installation). If unavailable, comment out the next line.
-# plt.rcParams["text.usetex"] = True
-# LaTeX-style tick labels
-latex_formatter = FuncFormatter(lambda v, pos: rf"${v:g}$")
+import typing
+
+_is_configured = False
+
+
+def configure_matplotlib():
+    """
+    Apply the shared plotting style. Called by visualizers before they draw, so that
+    merely importing this package does not pull in matplotlib.
+    """
+    global _is_configured
+    if _is_configured:
+        return
+    import matplotlib.pyplot as plt
+
+    # Set the font parameters for LaTeX-style rendering
+    plt.rcParams["mathtext.fontset"] = "cm"
+    plt.rcParams["font.family"] = "serif"
+    # Use full LaTeX for all text (requires a LaTeX installation). If unavailable, comment out the next line.
+    # plt.rcParams["text.usetex"] = True
+    _is_configured = True
+
+
+def __getattr__(name: str) -> typing.Any:
+    if name == "latex_formatter":
+        from matplotlib.ticker import FuncFormatter
+
+        global latex_formatter
+        # LaTeX-style tick labels
+        latex_formatter = FuncFormatter(lambda v, pos: rf"${v:g}$")
+        return latex_formatter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -12,7 +12,7 @@ class AitkenVisualizer(MonadicEquationVisualizer):
     # Override default interval for Aitken as per original file (1500ms vs 1000ms base)
     DEFAULT_INTERVAL_MS = 1500
 
-    def animate(
+    def create_animation(
             self,
             sample_num: int = MonadicEquationVisualizer.DEFAULT_SAMPLE_NUM,
             figure_size: Tuple[int, int] = MonadicEquationVisualizer.DEFAULT_FIGURE_SIZE,
@@ -152,4 +152,4 @@ class AitkenVisualizer(MonadicEquationVisualizer):
         )
 
         plt.tight_layout()
-        plt.show()
+        return animation
@@ -0,0 +1,87 @@
+import typing
+
+import numpy as np
+
+import visualizers
+from solvers.monadic.basins import BasinMap
+
+DEFAULT_FIGURE_SIZE = (9, 9)
+DEFAULT_TICK_SIZE = 12
+DEFAULT_LABEL_SIZE = 16
+DEFAULT_TITLE_SIZE = 20
+# the slowest converging points are shaded down to this brightness
+MIN_BRIGHTNESS = 0.25
+RENDER_CHUNK_SIZE = 2 ** 18
+
+
+def root_colors(count: int) -> np.ndarray:
+    """``count`` RGB colors of evenly spaced hues, as floats in [0, 1]."""
+    hue = np.arange(count) / max(count, 1)
+    # HSV to RGB at full saturation and value
+    channels = (np.array([5, 3, 1])[np.newaxis, :] + 6 * hue[:, np.newaxis]) % 6
+    return 1 - np.clip(np.minimum(channels, 4 - channels), 0, 1)
+
+
+def render_basins(basin_map: BasinMap, colors: np.ndarray | None = None) -> np.ndarray:
+    """
+    An RGB image (``uint8``, the shape of the map plus 3 channels) of a basin map: each root
+    gets a color, darkened the more iterations a point needed to reach it; points that did not
+    converge are black. Rendering needs NumPy only and goes through the map in chunks, so it
+    takes little memory beyond the image itself.
+    """
+    colors = root_colors(len(basin_map.roots)) if colors is None else np.asarray(colors, dtype=float)
+    if len(colors) < len(basin_map.roots):
+        raise ValueError(f"{len(basin_map.roots)} roots need as many colors, got {len(colors)}.")
+    # a black entry at the end serves root index -1
+    palette = np.vstack([colors[:len(basin_map.roots)], np.zeros((1, 3))]).astype(np.float32)
+    # brightness by iteration count
+    shades = 1 - (1 - MIN_BRIGHTNESS) * (np.log1p(np.arange(basin_map.max_iterations + 1, dtype=np.float32))
+                                         / np.log1p(basin_map.max_iterations))
+    image = np.empty(basin_map.root_index.shape + (3,), dtype=np.uint8)
+    root_index, iterations = basin_map.root_index.reshape(-1), basin_map.iterations.reshape(-1)
+    pixels = image.reshape(-1, 3)
+    for first in range(0, len(root_index), RENDER_CHUNK_SIZE):
+        chunk = slice(first, first + RENDER_CHUNK_SIZE)
+        pixels[chunk] = np.round(255 * palette[root_index[chunk]] * shades[iterations[chunk], np.newaxis])
+    return image
+
+
+def save_basins(basin_map: BasinMap, path: str, colors: np.ndarray | None = None):
+    """Write the rendered map to an image file, one pixel per starting point."""
+    import matplotlib.pyplot as plt
+
+    image = render_basins(basin_map, colors)
+    plt.imsave(path, image if image.ndim == 3 else image[np.newaxis])
+
+
+def plot_basins(
+        basin_map: BasinMap,
+        title: str = "Basins of Attraction",
+        colors: np.ndarray | None = None,
+        figure_size: typing.Tuple[int, int] = DEFAULT_FIGURE_SIZE,
+        tick_size: int = DEFAULT_TICK_SIZE,
+        label_size: int = DEFAULT_LABEL_SIZE,
+        title_size: int = DEFAULT_TITLE_SIZE
+):
+    """
+    A figure of the map with the roots marked: a complex grid in the complex plane, a 1D map
+    of real starting points as a strip over the real axis.
+    """
+    import matplotlib.pyplot as plt
+
+    visualizers.configure_matplotlib()
+    image = render_basins(basin_map, colors)
+    figure, axes = plt.subplots(figsize=figure_size)
+    figure.suptitle(title, fontsize=title_size)
+    roots = np.asarray(basin_map.roots)
+    if basin_map.extent is not None:
+        axes.imshow(image, extent=basin_map.extent, interpolation="nearest")
+        axes.plot(roots.real, roots.imag, "w+", markersize=12, markeredgewidth=2)
+        axes.set_xlabel(r"$\mathrm{Re}\,z$", fontsize=label_size)
+        axes.set_ylabel(r"$\mathrm{Im}\,z$", fontsize=label_size)
+    else:
+        axes.imshow(image.reshape(1, -1, 3), aspect="auto", interpolation="nearest")
+        axes.set_yticks([])
+        axes.set_xlabel("index of the starting point", fontsize=label_size)
+    axes.tick_params(labelsize=tick_size)
+    return figure
@@ -13,7 +13,7 @@ class BisectionVisualizer(MonadicEquationVisualizer):
     # We can override defaults here if necessary, or just rely on the Base class.
     # We do not need __init__ as it is inherited.
 
-    def animate(
+    def create_animation(
             self,
             sample_num: int = MonadicEquationVisualizer.DEFAULT_SAMPLE_NUM,
             figure_size: Tuple[int, int] = MonadicEquationVisualizer.DEFAULT_FIGURE_SIZE,
@@ -132,4 +132,4 @@ class BisectionVisualizer(MonadicEquationVisualizer):
                                   interval=interval_ms, blit=False, repeat=False)
 
         plt.tight_layout()
-        plt.show()
+        return animation
@@ -1,12 +1,15 @@
 import copy as cp
 from typing import Tuple, Any
 
+import visualizers
+from solvers.registry import registry
+
 
 class MonadicEquationVisualizer:
     """
     Base class for visualizing iterative root-finding methods (Monadic Equation Solvers).
-    Implements a Factory Pattern in __new__ to automatically dispatch to the correct
-    visualizer subclass based on the provided solver instance.
+    Implements a Factory Pattern in __new__ to automatically dispatch to the visualizer
+    subclass registered for the provided solver instance in ``solvers.registry``.
     """
     DEFAULT_SAMPLE_NUM = 256
     DEFAULT_FIGURE_SIZE = (16, 9)
@@ -18,33 +21,18 @@ class MonadicEquationVisualizer:
     def __new__(cls, solver: Any):
         """
         Factory method: If instantiated directly, return an instance of the 
-        appropriate subclass based on the solver's type.
+        visualizer subclass registered for the solver's type.
         """
         if cls is MonadicEquationVisualizer:
-            solver_type = type(solver).__name__
-
-            # Local imports are used here to prevent circular import errors 
-            # (since subclasses import this base class).
-            # We assume these files are in the same package (relative import).
-
-            if solver_type == 'BisectionSolver':
-                from .bisection_visualizer import BisectionVisualizer
-                return super().__new__(BisectionVisualizer)
-
-            elif solver_type == 'NewtonSolver':
-                from .newton_visualizer import NewtonVisualizer
-                return super().__new__(NewtonVisualizer)
-
-            elif solver_type == 'NewtonDownhillSolver':
-                from .newton_downhill_visualizer import NewtonDownhillVisualizer
-                return super().__new__(NewtonDownhillVisualizer)
-
-            elif solver_type == 'AitkenSolver':
-                from .aitken_visualizer import AitkenVisualizer
-                return super().__new__(AitkenVisualizer)
-
-            else:
-                raise ValueError(f"No compatible visualizer found for solver type: {solver_type}")
+            # The registry imports the visualizer module on first use, which also
+            # prevents circular import errors (since subclasses import this base class).
+            try:
+                visualizer_class = registry.get(solver).visualizer_class()
+            except ValueError:
+                visualizer_class = None
+            if visualizer_class is None:
+                raise ValueError(f"No compatible visualizer found for solver type: {type(solver).__name__}")
+            return super().__new__(visualizer_class)
 
         # If cls is already a subclass (e.g. NewtonVisualizer(solver)), 
         # just create the object normally.
@@ -58,8 +46,9 @@ class MonadicEquationVisualizer:
         # Note: When __new__ returns a subclass instance, Python automatically 
         # calls this __init__ method on that instance.
         self.solver = cp.deepcopy(solver)
+        visualizers.configure_matplotlib()
 
-    def animate(
+    def create_animation(
             self,
             sample_num: int = DEFAULT_SAMPLE_NUM,
             figure_size: Tuple[int, int] = DEFAULT_FIGURE_SIZE,
@@ -69,6 +58,16 @@ class MonadicEquationVisualizer:
             interval_ms: int = DEFAULT_INTERVAL_MS
     ):
         """
-        Abstract method to generate the animation.
+        Abstract method to generate the animation without showing it.
+        """
+        raise NotImplementedError("Subclasses must implement the create_animation method.")
+
+    def animate(self, *args, **kwargs):
         """
-        raise NotImplementedError("Subclasses must implement the animate method.")
+        Generate the animation (arguments as for create_animation) and show it in a window.
+        """
+        import matplotlib.pyplot as plt
+
+        animation = self.create_animation(*args, **kwargs)
+        plt.show()
+        return animation
@@ -11,7 +11,7 @@ from visualizers.monadic.monadic_equation_visualizer import MonadicEquationVisua
 class NewtonDownhillVisualizer(MonadicEquationVisualizer):
 
     @override
-    def animate(
+    def create_animation(
             self,
             sample_num: int = MonadicEquationVisualizer.DEFAULT_SAMPLE_NUM,
             figure_size: Tuple[int, int] = MonadicEquationVisualizer.DEFAULT_FIGURE_SIZE,
@@ -169,4 +169,4 @@ class NewtonDownhillVisualizer(MonadicEquationVisualizer):
         )
 
         plt.tight_layout()
-        plt.show()
\ No newline at end of file
+        return animation